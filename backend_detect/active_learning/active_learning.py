@@ -1,70 +1,356 @@
 import os
+import sys
 import time
+import queue
 import shutil
+import threading
 import cv2
 import argparse
+import torch
+from collections import deque
+from contextlib import nullcontext
 from ultralytics import YOLO
+from ultralytics.data.utils import IMG_FORMATS
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # 未安装 watchdog 时退化为轮询
+    FileSystemEventHandler, Observer = object, None
+
+
+class IngestQueue:
+    """
+    目标目录的到达队列：文件系统事件（watchdog/inotify）或轮询线程把新图片路径放入队列，
+    检测循环按 (max_batch, max_wait_ms) 从中取出动态微批次。
+
+    只有确认已写完的文件才会入队：inotify 的 close_write、rename 事件直接入队；轮询发现的文件、
+    启动前已存在的文件以及不支持 closed 事件的平台上新建的文件，要在相邻两次检查中大小和修改时间都不变才入队。
+
+    :param source_dir: 监听的图片目录
+    :param poll_interval: 轮询/写完检查的间隔（秒）
+    """
+
+    def __init__(self, source_dir, poll_interval=0.05):
+        self.source_dir = source_dir
+        self.poll_interval = poll_interval
+        self._queue = queue.Queue()
+        self._pending = set()  # 已入队但尚未处理完的文件，用于事件去重
+        self._candidates = {}  # 等待写完的文件 -> 上次检查时的 (大小, 修改时间)
+        self._lock = threading.Lock()
+        self._observer = None
+        self._stopped = threading.Event()
+
+    def put(self, path):
+        if path.rpartition('.')[-1].lower() not in IMG_FORMATS:
+            return
+        with self._lock:
+            if path in self._pending:
+                return
+            self._pending.add(path)
+        self._queue.put(path)
+
+    def done(self, paths):
+        with self._lock:
+            self._pending.difference_update(paths)
+
+    def watch(self, path):
+        """登记可能仍在写入的文件，大小和修改时间稳定后入队"""
+        if path.rpartition('.')[-1].lower() not in IMG_FORMATS:
+            return
+        with self._lock:
+            if path not in self._pending:
+                self._candidates.setdefault(path, None)
+
+    def retry(self, path):
+        """处理失败（如读取失败）的文件重新等待写完后入队"""
+        self.done([path])
+        self.watch(path)
+
+    def _check(self):
+        """把相邻两次检查中大小和修改时间都不变的候选文件入队"""
+        with self._lock:
+            candidates = list(self._candidates.items())
+        for path, previous in candidates:
+            try:
+                st = os.stat(path)
+            except OSError:  # 已被删除或移走
+                with self._lock:
+                    self._candidates.pop(path, None)
+                continue
+            fingerprint = (st.st_size, st.st_mtime_ns)
+            with self._lock:
+                stable = previous == fingerprint
+                if stable:
+                    del self._candidates[path]
+                else:
+                    self._candidates[path] = fingerprint
+            if stable:
+                self.put(path)
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def scan(self):
+        for entry in sorted(os.scandir(self.source_dir), key=lambda e: e.name):
+            if entry.is_file():
+                self.watch(entry.path)
+
+    def start(self):
+        self.scan()  # 启动前已存在的图片
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(_TargetHandler(self), self.source_dir, recursive=False)
+            self._observer.start()
+            print("使用 watchdog 监听目标目录")
+        else:
+            print(f"未安装 watchdog，使用 {self.poll_interval * 1e3:.0f}ms 轮询监听目标目录")
+        threading.Thread(target=self._poll, daemon=True).start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+
+    def _poll(self):
+        while not self._stopped.wait(self.poll_interval):
+            if self._observer is None:
+                self.scan()
+            self._check()
+
+    def next_batch(self, max_batch=32, max_wait_ms=20, timeout=None):
+        """
+        阻塞直到至少有一张图片到达，然后在 max_wait_ms 内继续收集，最多 max_batch 张。
+        timeout 秒内没有图片到达时返回空列表。
+        """
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.perf_counter() + max_wait_ms / 1e3
+        while len(batch) < max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        existing = [p for p in batch if os.path.isfile(p)]
+        self.done(set(batch) - set(existing))
+        return existing
+
+
+class _TargetHandler(FileSystemEventHandler):
+    def __init__(self, ingest):
+        super().__init__()
+        self.ingest = ingest
+
+    def on_closed(self, event):  # inotify IN_CLOSE_WRITE，文件已写完
+        if not event.is_directory:
+            self.ingest.put(event.src_path)
+
+    def on_created(self, event):  # 不支持 closed 事件的平台（Windows/macOS），等大小和修改时间稳定后入队
+        if not event.is_directory and not sys.platform.startswith('linux'):
+            self.ingest.watch(event.src_path)
+
+    def on_moved(self, event):  # 原子写入：先写临时文件再 rename 进来
+        if not event.is_directory:
+            self.ingest.put(event.dest_path)
 
-def main(model_path):
-    model = YOLO(model_path)
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class LowConfFeed:
+    """
+    低置信度事件的进程内发布/订阅。检测线程调用 publish，订阅者（如 WebSocket 服务端）通过回调接收事件。
+    最近 maxlen 条事件保存在环形缓冲区中，断线重连的客户端可以从某个序号之后补发。
+
+    :param maxlen: 环形缓冲区保存的事件数
+    """
+
+    def __init__(self, maxlen=512):
+        self.epoch = int(time.time() * 1e3)  # 进程重启后序号从 1 重新开始，客户端据此判断序号是否仍然有效
+        self.seq = 0
+        self._events = deque(maxlen=maxlen)
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def publish(self, **event):
+        with self._lock:
+            self.seq += 1
+            event = {'seq': self.seq, 'ts': time.time(), **event}
+            self._events.append(event)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:  # 回调在发布线程中执行，不能阻塞
+            callback(event)
+        return event
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def since(self, seq=0):
+        """返回缓冲区中序号大于 seq 的事件"""
+        with self._lock:
+            return [e for e in self._events if e['seq'] > seq]
+
+
+LOW_CONF_THRESHOLD = 0.6
+READ_RETRIES = 3  # 图片读取失败的最大尝试次数
+
+
+def verdict(result, low_conf=LOW_CONF_THRESHOLD):
+    """
+    根据单张图片的检测结果给出复检结论。
+
+    :param result: ultralytics Results 对象，或单张图片的 Boxes（BatchResults.boxes(i)）
+    :param low_conf: 低置信度阈值，任一检测框低于该值即判为 LOW_CONF
+    :return: 'PASS'（无缺陷）、'LOW_CONF'（需人工标注）或 'FAIL'（确认缺陷）
+    """
+    boxes = result.boxes if hasattr(result, 'boxes') else result
+    if boxes is None or len(boxes) == 0:
+        return 'PASS'
+    if (boxes.conf < low_conf).any():
+        return 'LOW_CONF'
+    return 'FAIL'
+
+
+def detect_loop(get_model, max_batch=32, max_wait_ms=20, device=None, stop_event=None, feed=None, work_dir=None,
+                on_batch=None, streams=0):
+    """
+    监听 target 目录并按微批次检测，直到 stop_event 被设置。
+
+    :param get_model: 返回上下文管理器的函数，进入时得到当前 YOLO 模型；每个批次调用一次，便于服务端热切换模型，
+                      服务端借此在推理期间持有模型锁，避免与其他调用方共用 predictor 时互相改写参数
+    :param max_batch: 微批次最大图片数
+    :param max_wait_ms: 凑批最长等待时间（毫秒）
+    :param device: 推理设备，None 表示有 GPU 时用 0 号 GPU，否则用 CPU
+    :param stop_event: threading.Event，None 表示一直运行
+    :param feed: LowConfFeed，不为 None 时低置信度图片直接写入 raw 目录并发布事件，
+                 否则写入 tmp 目录，等待前端调用 /api/transfer-images 转移
+    :param work_dir: target、target_error 与 low_conf_images 所在目录，None 表示本文件所在目录。
+                     读取失败的图片会重新等待写完后重试，连续失败 READ_RETRIES 次后移到 target_error，不会直接删除
+    :param on_batch: 每个批次处理完（含删除原图）后调用 on_batch([(文件名, 结论), ...], 队列深度)，用于压测统计
+    :param streams: CPU 推理流数量，0 表示不启用。启用后微批次按每流一张图片依次送入推理，
+                    ONNX Runtime/OpenVINO 模型的各个推理流绑定在不同的核上并发执行，
+                    同时下一组图片的解码与预处理和当前推理重叠进行；PyTorch 权重会忽略该参数
+    """
+    BASE_DIR = work_dir or os.path.dirname(os.path.abspath(__file__))
+    device = device or ('0' if torch.cuda.is_available() else 'cpu')
+    if streams:
+        print(f"CPU 推理模式：{streams} 个推理流")
 
     source_dir = os.path.join(BASE_DIR, 'target')
-    low_conf_raw_dir = os.path.join(BASE_DIR, 'low_conf_images', 'tmp')
+    low_conf_raw_dir = os.path.join(BASE_DIR, 'low_conf_images', 'tmp' if feed is None else 'raw')
     low_conf_marked_dir = os.path.join(BASE_DIR, 'low_conf_images', 'marked')
+    error_dir = os.path.join(BASE_DIR, 'target_error')
+    os.makedirs(source_dir, exist_ok=True)
+    os.makedirs(error_dir, exist_ok=True)
     os.makedirs(low_conf_raw_dir, exist_ok=True)
     os.makedirs(low_conf_marked_dir, exist_ok=True)
 
+    ingest = IngestQueue(source_dir)
+    ingest.start()
+    read_failures = {}  # 读取失败的图片 -> 失败次数
     print("开始监听目标目录...")
 
-    while True:
-        img_list = sorted(os.listdir(source_dir))
-
-        if not img_list:
-            time.sleep(1)
-            continue
-
-        for img_name in img_list:
-            img_path = os.path.join(source_dir, img_name)
-
-            start_time = time.time()
-            results = model.predict(source=img_path, device='0', imgsz=640, conf=0.25, verbose=False)
-            duration = time.time() - start_time
-            print(f"检测 {img_name} 耗时: {duration:.3f} 秒")
-
-            low_conf_flag = False
-            pass_flag = False
-            for result in results:
-                if result.boxes is not None and len(result.boxes) > 0:
-                    confs = result.boxes.conf.cpu().numpy()
-                    print(confs)
-                    if (confs < 0.6).any():
-                        low_conf_flag = True
-                else:
-                    pass_flag = True
-
-            if pass_flag:
-                print("PASS")
-                # ***********************************
-                # 流出api接口，向外输出Pass信号
-                # ***********************************
-            elif low_conf_flag:
-                shutil.copy(img_path, os.path.join(low_conf_raw_dir, img_name))
-                img_with_boxes = results[0].plot()
-                cv2.imwrite(os.path.join(low_conf_marked_dir, img_name), img_with_boxes)
-                print(f"**********\n发现低置信度图片!\n低置信度图片已保存: {img_name}\n**********")
-            else:
-                print("Fail")
-                # ***********************************
-                # 流出api接口，向外输出Fail信号
-                # ***********************************
-            os.remove(img_path)
-
-        time.sleep(0.05)
+    try:
+        while stop_event is None or not stop_event.is_set():
+            img_paths = ingest.next_batch(max_batch, max_wait_ms, timeout=0.5)
+            if not img_paths:
+                continue
+
+            # 整个微批次只调用一次 stream_inference，predictor 在首次调用后常驻复用；
+            # AOI 图片分辨率固定，static_input 让预处理直接写入预分配的输入缓冲区；
+            # batch_results 让每个推理批次只返回一个 BatchResults（整批检测框共用一个张量），
+            # 只有需要画框的低置信度图片才会构建 Results 对象
+            start_time = time.perf_counter()
+            batch_args = dict(batch=streams, streams=streams, pipeline=True) if streams else dict(batch=len(img_paths))
+            with get_model() as model:
+                batches = [b.cpu() for b in model.predict(source=img_paths, stream=True, device=device, imgsz=640,
+                                                          conf=0.25, autotune=True, static_input=True,
+                                                          batch_results=True, verbose=False, **batch_args)]
+            duration = time.perf_counter() - start_time
+            print(f"批次 {len(img_paths)} 张，耗时: {duration:.3f} 秒 "
+                  f"({duration / len(img_paths) * 1e3:.1f} ms/张)，队列深度: {ingest.depth()}")
+
+            verdicts = []
+            detected = set()
+            for batch in batches:  # 整批检测结果已一次性拷贝到 CPU
+                detected.update(os.path.abspath(p) for p in batch.paths)  # 推理数据源把路径转成了绝对路径
+                for i, img_path in enumerate(batch.paths):
+                    img_name = os.path.basename(img_path)
+                    boxes = batch.boxes(i)
+                    flag = verdict(boxes)
+                    verdicts.append((img_name, flag))
+                    if len(boxes) > 0:
+                        print(img_name, boxes.conf.numpy())
+
+                    if flag == 'PASS':
+                        print(f"{img_name} PASS")
+                        # ***********************************
+                        # 流出api接口，向外输出Pass信号
+                        # ***********************************
+                    elif flag == 'LOW_CONF':
+                        shutil.copy(img_path, os.path.join(low_conf_raw_dir, img_name))
+                        img_with_boxes = batch[i].plot()
+                        cv2.imwrite(os.path.join(low_conf_marked_dir, img_name), img_with_boxes)
+                        print(f"**********\n发现低置信度图片!\n低置信度图片已保存: {img_name}\n**********")
+                        if feed is not None:
+                            feed.publish(filename=img_name, boxes=boxes.xyxy.tolist(), confs=boxes.conf.tolist(),
+                                         classes=[batch.names[int(c)] for c in boxes.cls])
+                    else:
+                        print(f"{img_name} Fail")
+                        # ***********************************
+                        # 流出api接口，向外输出Fail信号
+                        # ***********************************
+
+            # 读取失败的图片不会出现在 batches 中：保留原图重试，多次失败后移到 target_error 等待人工检查
+            for img_path in img_paths:
+                if os.path.abspath(img_path) in detected:
+                    read_failures.pop(img_path, None)
+                    if os.path.exists(img_path):
+                        os.remove(img_path)
+                    continue
+                read_failures[img_path] = read_failures.get(img_path, 0) + 1
+                if read_failures[img_path] < READ_RETRIES:
+                    ingest.retry(img_path)
+                    continue
+                del read_failures[img_path]
+                if os.path.exists(img_path):
+                    os.replace(img_path, os.path.join(error_dir, os.path.basename(img_path)))
+                    print(f"❌ {os.path.basename(img_path)} 连续 {READ_RETRIES} 次读取失败，已移到 {error_dir}")
+            ingest.done(img_paths)
+            if on_batch is not None:
+                on_batch(verdicts, ingest.depth())
+    finally:
+        ingest.stop()
+
+
+def main(model_path, max_batch=32, max_wait_ms=20, device=None, tune_source=None, streams=0):
+    device = device or ('0' if torch.cuda.is_available() else 'cpu')
+    if tune_source:
+        # 在本机对各推理后端测速并校验输出一致性，之后 predict(autotune=True) 自动加载最快的后端
+        from ultralytics.utils.autotune import autotune
+        autotune(model_path, source=tune_source, batch_sizes=sorted({1, streams or max_batch}), imgsz=640,
+                 device=device)
+    model = YOLO(model_path)
+    detect_loop(lambda: nullcontext(model), max_batch, max_wait_ms, device, streams=streams)
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--model', type=str, required=True, help="模型权重路径")
+    parser.add_argument('--max-batch', type=int, default=32, help="微批次最大图片数")
+    parser.add_argument('--max-wait-ms', type=float, default=20, help="凑批最长等待时间（毫秒）")
+    parser.add_argument('--device', type=str, default=None, help="推理设备，如 0 或 cpu，默认有 GPU 时用 0")
+    parser.add_argument('--streams', type=int, default=0, help="CPU 推理流数量（ONNX/OpenVINO 模型），0 表示不启用")
+    parser.add_argument('--tune', type=str, default=None, help="PCB 样本图片目录，启动前对各推理后端测速并选出最快的")
     args = parser.parse_args()
 
-    main(args.model)
+    main(args.model, args.max_batch, args.max_wait_ms, args.device, args.tune, args.streams)
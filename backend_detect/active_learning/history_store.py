@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _link_or_copy(src, dst):
+    """硬链接不可用（跨文件系统等）时复制，返回是否为硬链接"""
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        shutil.copy2(src, dst)
+        return False
+
+
+class HistoryStore:
+    """
+    历史标注批次的内容寻址存储。每个文件按 sha256 只保存一份（objects/ab/cdef...），
+    每个批次是一份清单（batches/<批次名>.json），记录 相对路径 -> (sha256, 大小)，
+    不同批次之间、同一批次内的重复文件自动去重。
+
+    组装训练集时只按清单建立硬链接，不复制文件内容。对象没有扩展名，训练代码不能直接遍历仓库取图片，
+    增量微调的回放样本来自 replay/ 下组装出的全部批次（images/labels 结构，可按图片路径找到标签）。
+    对象与组装出的文件共用数据，只能删除，不能原地修改。
+
+    :param root: 存储根目录，通常为 datasets/history
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.batches_dir = self.root / 'batches'
+        self.replay_dir = self.root / 'replay'  # 全部批次组装出的回放训练集
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.batches_dir.mkdir(parents=True, exist_ok=True)
+        self._manifests = {}  # 批次名 -> 清单，按需加载后缓存
+        self._lock = threading.Lock()
+
+    def blob_path(self, sha256):
+        return self.objects_dir / sha256[:2] / sha256[2:]
+
+    def batches(self):
+        """按创建顺序返回所有批次名"""
+        return sorted(p.stem for p in self.batches_dir.glob('*.json'))
+
+    def manifest(self, batch):
+        with self._lock:
+            if batch not in self._manifests:
+                with open(self.batches_dir / f'{batch}.json', encoding='utf-8') as f:
+                    self._manifests[batch] = json.load(f)
+            return self._manifests[batch]
+
+    def add_batch(self, batch, files):
+        """
+        把一批文件存入仓库并写入批次清单。新内容复制进来（不与源文件共用数据，之后原地修改源文件
+        不会破坏仓库中的对象），已有内容只记录引用。
+
+        :param batch: 批次名，如 batch_20250710_201220
+        :param files: {相对路径: 源文件路径}，相对路径如 'images/a.jpg'、'labels/a.txt'；
+                      也可以传一个目录，收录其中所有文件
+        :return: 本批次统计 {'files', 'bytes', 'new_bytes', 'dedup_files', 'seconds'}
+        """
+        start_time = time.perf_counter()
+        if isinstance(files, (str, Path)):
+            src_dir = Path(files)
+            files = {p.relative_to(src_dir).as_posix(): p for p in sorted(src_dir.rglob('*')) if p.is_file()}
+        entries, new_bytes, dedup_files = {}, 0, 0
+        for rel, src in files.items():
+            sha256 = file_sha256(src)
+            size = os.path.getsize(src)
+            blob = self.blob_path(sha256)
+            if blob.exists():
+                dedup_files += 1
+            else:
+                blob.parent.mkdir(exist_ok=True)
+                tmp = blob.with_name(f'{blob.name}.{os.getpid()}.tmp')
+                shutil.copy2(src, tmp)
+                os.replace(tmp, blob)
+                new_bytes += size
+            entries[Path(rel).as_posix()] = [sha256, size]
+
+        manifest = {'batch': batch, 'created': time.time(), 'files': entries}
+        path = self.batches_dir / f'{batch}.json'
+        with open(path.with_suffix('.json.tmp'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(path.with_suffix('.json.tmp'), path)
+        with self._lock:
+            self._manifests[batch] = manifest
+
+        stats = {'files': len(entries), 'bytes': sum(size for _, size in entries.values()), 'new_bytes': new_bytes,
+                 'dedup_files': dedup_files, 'seconds': time.perf_counter() - start_time}
+        print(f"📦 历史批次 {batch}：{stats['files']} 个文件，新增内容 {new_bytes / 1e6:.1f}MB，"
+              f"去重 {dedup_files} 个，耗时 {stats['seconds']:.2f} 秒")
+        return stats
+
+    def files(self, batches=None):
+        """
+        合并若干批次的清单，同一相对路径以后面的批次为准。
+
+        :param batches: 批次名列表，None 表示全部批次
+        :return: {相对路径: sha256}
+        """
+        merged = {}
+        for batch in self.batches() if batches is None else batches:
+            merged.update({rel: sha256 for rel, (sha256, _) in self.manifest(batch)['files'].items()})
+        return merged
+
+    def assemble(self, out_dir, batches=None):
+        """
+        把若干批次组装成训练集目录（out_dir/images、out_dir/labels），文件为指向仓库的硬链接。
+        out_dir 中已是正确内容的文件保留，清单以外的文件删除，因此可以反复调用。
+
+        :param out_dir: 输出目录
+        :param batches: 批次名列表，None 表示全部批次
+        :return: 统计 {'files', 'linked', 'seconds'}
+        """
+        start_time = time.perf_counter()
+        out_dir = Path(out_dir)
+        wanted = self.files(batches)
+        for path in sorted(out_dir.rglob('*'), reverse=True) if out_dir.exists() else []:
+            if path.is_dir():
+                if not any(path.iterdir()):
+                    path.rmdir()
+            elif path.relative_to(out_dir).as_posix() not in wanted:
+                path.unlink()
+        linked = 0
+        for rel, sha256 in wanted.items():
+            dst = out_dir / rel
+            blob = self.blob_path(sha256)
+            if dst.exists():
+                if os.path.samefile(dst, blob):
+                    continue
+                dst.unlink()
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(blob, dst)
+            linked += 1
+        stats = {'files': len(wanted), 'linked': linked, 'seconds': time.perf_counter() - start_time}
+        print(f"组装训练集 {out_dir}：{len(wanted)} 个文件（新建链接 {linked} 个），耗时 {stats['seconds']:.3f} 秒")
+        return stats
+
+    def stats(self):
+        """返回存储统计：清单中的逻辑大小、实际保存的大小和节省的空间"""
+        logical = sum(size for batch in self.batches() for _, size in self.manifest(batch)['files'].values())
+        stored = sum(p.stat().st_size for p in self.objects_dir.glob('*/*') if not p.name.endswith('.tmp'))
+        return {'batches': len(self.batches()), 'logical_bytes': logical, 'stored_bytes': stored,
+                'saved_bytes': logical - stored, 'saved_ratio': 1 - stored / logical if logical else 0.0}
+
+    def migrate(self):
+        """把旧版按目录整份复制的 batch_* 目录收录进仓库（已收录的批次跳过），收录后可删除原目录"""
+        done = set(self.batches())
+        for batch_dir in sorted(self.root.glob('batch_*')):
+            if batch_dir.is_dir() and batch_dir.name not in done:
+                self.add_batch(batch_dir.name, batch_dir)
+
+
+if __name__ == '__main__':
+    BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))  # 项目根目录
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--root', type=str, default=os.path.join(BASE_DIR, "datasets", "history"), help="存储根目录")
+    parser.add_argument('--migrate', action='store_true', help="收录旧版 batch_* 目录")
+    parser.add_argument('--assemble', type=str, help="组装训练集的输出目录")
+    parser.add_argument('--batches', type=str, nargs='*', help="参与组装的批次名，默认全部")
+    args = parser.parse_args()
+
+    store = HistoryStore(args.root)
+    if args.migrate:
+        store.migrate()
+    if args.assemble:
+        store.assemble(args.assemble, args.batches)
+    s = store.stats()
+    print(f"共 {s['batches']} 个批次，逻辑大小 {s['logical_bytes'] / 1e6:.1f}MB，实际占用 {s['stored_bytes'] / 1e6:.1f}MB，"
+          f"节省 {s['saved_bytes'] / 1e6:.1f}MB（{s['saved_ratio']:.0%}）")
@@ -6,6 +6,7 @@ import zipfile
 import os
 from ultralytics.models.yolo.detect import DetectionTrainer
 from ..pre import split_dataset, batch_convert
+from .history_store import HistoryStore
 import requests
 
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'True'
@@ -54,31 +55,32 @@ def move_labeled_data(low_conf_dir, next_train_dir, history_dir):
     clear_directory(marked_images_src)
     # print(f"清空 {images_dst} ...")
 
-    # 创建历史目录（按日期命名）
+    # 历史批次存入内容寻址仓库（按日期命名），重复内容只保存一份
     date_str = datetime.now().strftime('%Y%m%d_%H%M%S')
-    history_subdir = Path(history_dir) / f'batch_{date_str}'
-    history_labels = history_subdir / 'labels'
-    history_images = history_subdir / 'images'
-    history_labels.mkdir(parents=True, exist_ok=True)
-    history_images.mkdir(parents=True, exist_ok=True)
+    batch_files = {}
 
-    # 移动并备份标签文件
+    # 移动标签文件
     label_files = list(labels_src.glob('*.txt'))
     for file in label_files:
         dst_path = labels_dst / file.name
         shutil.move(file, dst_path)
-        # 复制到历史
-        shutil.copy(dst_path, history_labels / file.name)
-        print(f"已移动标签: {file} -> {dst_path}，并已备份到历史: {history_labels / file.name}")
+        batch_files[f'labels/{file.name}'] = dst_path
+        print(f"已移动标签: {file} -> {dst_path}")
 
-    # 移动并备份图片文件
+    # 移动图片文件
     image_files = list(images_src.glob('*.*'))  # 可指定格式如 '*.jpg'
     for file in image_files:
         dst_path = images_dst / file.name
         shutil.move(file, dst_path)
-        # 复制到历史
-        shutil.copy(dst_path, history_images / file.name)
-        print(f"已移动图片: {file} -> {dst_path}，并已备份到历史: {history_images / file.name}")
+        batch_files[f'images/{file.name}'] = dst_path
+        print(f"已移动图片: {file} -> {dst_path}")
+
+    store = HistoryStore(history_dir)
+    store.add_batch(f'batch_{date_str}', batch_files)
+    store.assemble(store.replay_dir)  # 增量微调从 history/replay 抽取回放样本，仓库对象本身没有图片扩展名
+    s = store.stats()
+    print(f"历史仓库共 {s['batches']} 个批次，逻辑大小 {s['logical_bytes'] / 1e6:.1f}MB，"
+          f"实际占用 {s['stored_bytes'] / 1e6:.1f}MB，节省 {s['saved_ratio']:.0%}")
 
 # import os
 from dotenv import load_dotenv
@@ -86,9 +88,11 @@ load_dotenv()  # 默认从 .env 读取
 SERVER_IP = os.getenv("VITE_SERVER_IP", "127.0.0.1")
 SERVER_PORT = os.getenv("VITE_SERVER_PORT", "8000")
 
-def upload_and_trigger_training(source_dir: str, output_zip_path: str):
+def upload_and_trigger_training(source_dir: str, output_zip_path: str, job_id: str = None):
     """
-    将 source_dir 目录下所有内容打包成 output_zip_path 文件
+    将 source_dir 目录下所有内容打包成 output_zip_path 文件，上传到训练端 datasets/raw/<zip 文件名> 下
+
+    :param job_id: 上传任务 ID，None 表示由训练端生成
     """
 
     source_dir = str(source_dir)
@@ -105,11 +109,13 @@ def upload_and_trigger_training(source_dir: str, output_zip_path: str):
                 arcname = os.path.relpath(file_path, source_dir)
                 zipf.write(str(file_path), str(arcname))  # 明确转为 str
     print(f"已打包为：{output_zip_path}")
+    # 以原始字节流式上传，训练端边接收边解压
     with open(output_zip_path, 'rb') as f:
-        files = {'file': f}
         response = requests.post(
             f"http://{SERVER_IP}:{SERVER_PORT}/upload/",
-            files=files
+            params={'filename': os.path.basename(output_zip_path), 'job_id': job_id},
+            data=f,
+            headers={'Content-Type': 'application/zip'}
         )
         print(response.json())
     # try:
@@ -134,7 +140,12 @@ if __name__ == '__main__':
     # next_train_dir = '../datasets/raw/next_train'
     # history_dir = '../datasets/history'
     move_labeled_data(low_conf_dir, next_train_dir, history_dir)
+    # 训练端增量微调从 datasets/raw/history_replay 抽取回放样本，先于新数据上传
+    replay_dir = os.path.join(history_dir, "replay")
+    if os.path.isdir(replay_dir):
+        upload_and_trigger_training(replay_dir, os.path.join(BASE_DIR, "datasets", "history_replay.zip"))
     zip_output_path = os.path.join(BASE_DIR, "datasets", "next_train.zip")
-    upload_and_trigger_training(next_train_dir, zip_output_path)
+    # job_id 由 /api/managing-data 生成并返回给前端查询进度
+    upload_and_trigger_training(next_train_dir, zip_output_path, job_id=os.getenv("UPLOAD_JOB_ID"))
     print("数据移动与历史备份完成！")
 
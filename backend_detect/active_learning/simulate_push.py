@@ -1,9 +1,65 @@
 import os
-import shutil
+import sys
+import json
 import time
+import shutil
 import argparse
+import platform
+import tempfile
+import threading
+import subprocess
 import random
 from pathlib import Path
+from contextlib import nullcontext
+from datetime import datetime
+
+import numpy as np
+
+IMG_SUFFIXES = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def push_images(source_dir, target_dir, rate=1.0, max_push=None, shuffle=False, arrival='uniform', seed=0,
+                stop_event=None, on_push=None):
+    """
+    模拟 AOI 数据流，将 source_dir 里的图片按到达速率推送到 target_dir。
+    图片先复制为临时文件再 rename 进目标目录，检测端不会读到写了一半的图片。
+
+    :param source_dir: 模拟 AOI 原始图片目录
+    :param target_dir: 推送图片的目标目录
+    :param rate: 平均到达速率（张/秒）
+    :param max_push: 最大推送图片数，None 表示全部推送一遍；大于图片数时循环推送，文件名加序号前缀
+    :param shuffle: 是否随机打乱图片顺序
+    :param arrival: 'uniform' 固定间隔 1/rate，'poisson' 指数分布间隔（泊松到达）
+    :param seed: 随机种子，相同种子得到相同的推送顺序和间隔
+    :param stop_event: threading.Event，设置后停止推送
+    :param on_push: 每推送一张图片调用 on_push(文件名, 推送时刻 perf_counter)
+    :return: 推送的图片数
+    """
+    rng = random.Random(seed)
+    image_list = sorted(p for p in Path(source_dir).iterdir() if p.suffix.lower() in IMG_SUFFIXES)
+    assert image_list, f"{source_dir} 中没有图片"
+    if shuffle:
+        rng.shuffle(image_list)
+    total = len(image_list) if max_push is None else max_push
+    loop = total > len(image_list)
+    os.makedirs(target_dir, exist_ok=True)
+
+    next_time = time.perf_counter()
+    for i in range(total):
+        if stop_event is not None and stop_event.is_set():
+            return i
+        img_path = image_list[i % len(image_list)]
+        name = f"{i:06d}_{img_path.name}" if loop else img_path.name
+        tmp_path = Path(target_dir) / f".{name}.tmp"
+        shutil.copy(img_path, tmp_path)
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        os.replace(tmp_path, Path(target_dir) / name)
+        if on_push is not None:
+            on_push(name, time.perf_counter())
+        next_time += rng.expovariate(rate) if arrival == 'poisson' else 1.0 / rate
+    return total
 
 
 def simulate_push(source_dir, target_dir, interval=1.0, max_push=None, shuffle=False):
@@ -16,48 +72,278 @@ def simulate_push(source_dir, target_dir, interval=1.0, max_push=None, shuffle=F
     :param max_push: 最大推送图片数（None 表示全部推送完）
     :param shuffle: 是否随机打乱图片顺序
     """
-    source_path = Path(source)
-    target_path = Path(target)
+    push_images(source_dir, target_dir, rate=1.0 / interval, max_push=max_push, shuffle=shuffle,
+                seed=int(time.time()), on_push=lambda name, _: print(f"Pushed {name} -> {target_dir}"))
+    print("模拟推送完成。")
 
 
-    os.makedirs(target_dir, exist_ok=True)
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
 
-    image_list = list(source_path.glob('*.*'))
 
-    if shuffle:
-        random.shuffle(image_list)
-
-    # pushed_count = 0
-    for img_path in image_list:
-        # if max_push is not None and pushed_count >= max_push:
-        #     break
-        dest_path = target_path / img_path.name
-        shutil.copy(img_path, dest_path)
-        print(f"Pushed {img_path} -> {dest_path}")
-        # pushed_count += 1
-        time.sleep(random.uniform(0, 1))
+def benchmark(model_path, source_dir, rate=10.0, max_push=200, arrival='poisson', seed=0, device=None, max_batch=32,
+              max_wait_ms=20, drain_timeout=60.0, sample_interval=0.5, output=None, streams=0):
+    """
+    端到端复检压测：按到达速率把图片推送到临时 target 目录，由 detect_loop 完成 到达 -> 解码 -> 推理 ->
+    低置信度复制与画框保存 -> 删除原图 的完整流程，统计每张图片从推送到处理完的延迟、持续吞吐、
+    CPU/RSS 和积压增长，并写出 JSON 报告，可与其他提交的报告对比（--compare）。
 
-    print("模拟推送完成。")
+    :param model_path: 模型权重路径
+    :param source_dir: 压测图片目录，如 datasets/simulate_ready_push
+    :param rate: 平均到达速率（张/秒）
+    :param max_push: 推送图片总数
+    :param arrival: 'uniform' 或 'poisson'
+    :param seed: 推送顺序和到达间隔的随机种子
+    :param device: 推理设备，None 表示有 GPU 时用 0 号 GPU，否则用 CPU
+    :param max_batch: 微批次最大图片数
+    :param max_wait_ms: 凑批最长等待时间（毫秒）
+    :param drain_timeout: 推送结束后等待积压处理完的最长时间（秒）
+    :param sample_interval: CPU/RSS/积压采样间隔（秒）
+    :param output: 报告路径，None 表示 runs/benchmark/aoi_<时间>.json
+    :param streams: CPU 推理流数量，见 detect_loop
+    :return: 报告 dict
+    """
+    import psutil
+    import torch
+    from ultralytics import YOLO
+    from active_learning import detect_loop
+
+    device = device or ('0' if torch.cuda.is_available() else 'cpu')
+    model = YOLO(model_path)
+    warm = next(p for p in sorted(Path(source_dir).iterdir()) if p.suffix.lower() in IMG_SUFFIXES)
+    model.predict(str(warm), device=device, imgsz=640, conf=0.25, autotune=True, verbose=False,  # 预热，排除模型加载和首次推理
+                  **(dict(batch=streams, streams=streams, pipeline=True) if streams else {}))
+
+    pushed, done, batches, samples = {}, {}, [], []
+    lock = threading.Lock()
+
+    def on_push(name, t):
+        with lock:
+            pushed[name] = t
+
+    def on_batch(verdicts, depth):
+        t = time.perf_counter()
+        with lock:
+            for name, flag in verdicts:
+                done[name] = (t, flag)
+            batches.append((t, len(verdicts), depth))
+
+    work_dir = tempfile.mkdtemp(prefix='aoi_bench_')
+    stop_push, stop_detect = threading.Event(), threading.Event()
+    detector = threading.Thread(target=detect_loop, args=(lambda: nullcontext(model), max_batch, max_wait_ms, device),
+                                kwargs=dict(stop_event=stop_detect, work_dir=work_dir, on_batch=on_batch,
+                                            streams=streams), daemon=True)
+    pusher = threading.Thread(target=push_images, args=(source_dir, os.path.join(work_dir, 'target')),
+                              kwargs=dict(rate=rate, max_push=max_push, shuffle=True, arrival=arrival, seed=seed,
+                                          stop_event=stop_push, on_push=on_push), daemon=True)
+    process = psutil.Process()
+    process.cpu_percent()
+    detector.start()
+    time.sleep(1.0)  # 等待目录监听启动
+    t0 = time.perf_counter()
+    pusher.start()
+    try:
+        deadline = None
+        while True:
+            time.sleep(sample_interval)
+            with lock:
+                backlog = len(pushed) - len(done)
+            samples.append((time.perf_counter() - t0, process.cpu_percent(), process.memory_info().rss, backlog))
+            if not pusher.is_alive():
+                deadline = deadline or time.perf_counter() + drain_timeout
+                if backlog <= 0 or time.perf_counter() > deadline:
+                    break
+    finally:
+        stop_push.set()
+        stop_detect.set()
+        pusher.join()
+        detector.join(timeout=10)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    latency = np.array([(done[n][0] - pushed[n]) * 1e3 for n in pushed if n in done])
+    flags = [flag for _, flag in done.values()]
+    t_last = max((t for t, _ in done.values()), default=t0)
+    ts, cpu, rss, backlog = (np.array(x, dtype=float) for x in zip(*samples))
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'host': platform.node(),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'cores': len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count(),
+            'model': str(model_path),
+            'device': device,
+        },
+        'config': {'rate': rate, 'max_push': max_push, 'arrival': arrival, 'seed': seed, 'max_batch': max_batch,
+                   'max_wait_ms': max_wait_ms, 'streams': streams, 'source': str(source_dir)},
+        'images': {'pushed': len(pushed), 'done': len(latency), 'missing': len(pushed) - len(latency),
+                   'verdicts': {f: flags.count(f) for f in ('PASS', 'LOW_CONF', 'FAIL')}},
+        'latency_ms': {
+            'p50': float(np.percentile(latency, 50)) if len(latency) else None,
+            'p95': float(np.percentile(latency, 95)) if len(latency) else None,
+            'p99': float(np.percentile(latency, 99)) if len(latency) else None,
+            'mean': float(latency.mean()) if len(latency) else None,
+            'max': float(latency.max()) if len(latency) else None,
+        },
+        'throughput': {
+            'offered_ips': len(pushed) / max(max(pushed.values(), default=t0) - t0, 1e-9),
+            'sustained_ips': len(latency) / max(t_last - t0, 1e-9),
+            'batches': len(batches),
+            'mean_batch': float(np.mean([n for _, n, _ in batches])) if batches else 0.0,
+        },
+        'resources': {'cpu_percent_mean': float(cpu.mean()), 'cpu_percent_max': float(cpu.max()),
+                      'rss_mb_max': float(rss.max() / 2 ** 20)},
+        'queue': {
+            'backlog_max': int(backlog.max()),
+            'backlog_growth_ips': float(np.polyfit(ts, backlog, 1)[0]) if len(ts) > 1 else 0.0,  # > 0 表示处理跟不上到达
+            'ingest_depth_max': max((d for _, _, d in batches), default=0),
+        },
+    }
+
+    output = output or os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'runs', 'benchmark',
+                                    f"aoi_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    lat = report['latency_ms']
+    print(f"✅ 压测完成：{report['images']['done']}/{report['images']['pushed']} 张，"
+          f"p50 {lat['p50'] or 0:.1f}ms / p95 {lat['p95'] or 0:.1f}ms / p99 {lat['p99'] or 0:.1f}ms，"
+          f"持续 {report['throughput']['sustained_ips']:.1f} 张/秒（到达 {report['throughput']['offered_ips']:.1f} 张/秒），"
+          f"积压增长 {report['queue']['backlog_growth_ips']:+.2f} 张/秒，报告已保存: {output}")
+    return report
+
+
+def cpu_scaling(model_path, source_dir, core_counts=None, rate=1000.0, max_push=200, seed=0, max_batch=32,
+                max_wait_ms=20, output=None):
+    """
+    CPU 核数扩展性测试：依次把压测子进程绑定到前 n 个核上、每个核一个推理流，以远超处理能力的到达速率压测，
+    统计持续吞吐（张/秒）随核数的变化。ONNX/OpenVINO 模型（或 autotune 选出的后端）才会使用推理流，
+    PyTorch 权重测得的是 torch 线程数的扩展性。
+
+    :param model_path: 模型权重路径
+    :param source_dir: 压测图片目录
+    :param core_counts: 测试的核数列表，None 表示 1、2、4、... 直到全部可用核
+    :param rate: 到达速率（张/秒），应远大于处理能力，使吞吐受限于推理
+    :param max_push: 每个核数推送的图片数
+    :param seed: 随机种子
+    :param max_batch: 微批次最大图片数
+    :param max_wait_ms: 凑批最长等待时间（毫秒）
+    :param output: 报告路径，None 表示 runs/benchmark/cpu_scaling_<时间>.json
+    :return: 报告 dict
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        available = sorted(os.sched_getaffinity(0))
+    else:
+        available = list(range(os.cpu_count() or 1))
+        print("⚠️ 当前平台不支持绑定 CPU 核，各核数的测试实际使用全部核，仅推理流数量不同")
+    core_counts = core_counts or sorted({2 ** i for i in range(len(available).bit_length())} | {len(available)})
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in core_counts:
+            cores = available[:n]
+            report_path = os.path.join(tmp, f'cores_{n}.json')
+            cmd = [sys.executable, os.path.abspath(__file__), '--benchmark', str(model_path),
+                   '--source', str(source_dir), '--device', 'cpu', '--streams', str(n), '--rate', str(rate),
+                   '--max-push', str(max_push), '--arrival', 'uniform', '--seed', str(seed),
+                   '--max-batch', str(max_batch), '--max-wait-ms', str(max_wait_ms), '--output', report_path]
+            print(f"📦 {n} 个核 {cores}：开始压测")
+            pin = (lambda: os.sched_setaffinity(0, cores)) if hasattr(os, 'sched_setaffinity') else None
+            subprocess.run(cmd, check=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                           env={**os.environ, 'OMP_NUM_THREADS': str(n)}, preexec_fn=pin)
+            with open(report_path, encoding='utf-8') as f:
+                report = json.load(f)
+            rows.append({'cores': n, 'streams': n, 'ips': report['throughput']['sustained_ips'],
+                         'p50_ms': report['latency_ms']['p50'], 'p99_ms': report['latency_ms']['p99'],
+                         'cpu_percent_mean': report['resources']['cpu_percent_mean']})
+    base = rows[0]['ips'] / rows[0]['cores']  # 单核吞吐
+    for row in rows:
+        row['speedup'] = row['ips'] / base
+        row['efficiency'] = row['speedup'] / row['cores']
+
+    result = {
+        'meta': {'commit': _git_commit(), 'time': datetime.now().isoformat(timespec='seconds'), 'host': platform.node(),
+                 'platform': platform.platform(), 'cpu_count': os.cpu_count(), 'model': str(model_path)},
+        'config': {'rate': rate, 'max_push': max_push, 'seed': seed, 'max_batch': max_batch,
+                   'max_wait_ms': max_wait_ms, 'source': str(source_dir)},
+        'scaling': rows,
+    }
+    output = output or os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'runs', 'benchmark',
+                                    f"cpu_scaling_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"{'核数':<6}{'张/秒':>10}{'加速比':>10}{'效率':>10}{'p50(ms)':>12}{'p99(ms)':>12}")
+    for row in rows:
+        print(f"{row['cores']:<6}{row['ips']:>10.1f}{row['speedup']:>10.2f}{row['efficiency']:>10.0%}"
+              f"{row['p50_ms'] or 0:>12.1f}{row['p99_ms'] or 0:>12.1f}")
+    print(f"✅ 扩展性测试完成，报告已保存: {output}")
+    return result
+
+
+COMPARE_METRICS = (
+    ('latency_ms', 'p50'), ('latency_ms', 'p95'), ('latency_ms', 'p99'), ('throughput', 'sustained_ips'),
+    ('resources', 'cpu_percent_mean'), ('resources', 'rss_mb_max'), ('queue', 'backlog_max'),
+)
+
+
+def _load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_reports(base, new):
+    """打印两份压测报告的关键指标对比"""
+    base_meta, new_meta = base['meta'], new['meta']
+    if base['config'] != new['config']:
+        print("⚠️ 两份报告的压测配置不同，对比仅供参考")
+    print(f"{'指标':<28}{base_meta.get('commit') or 'base':>12}{new_meta.get('commit') or 'new':>12}{'变化':>10}")
+    for section, key in COMPARE_METRICS:
+        a, b = base[section].get(key), new[section].get(key)
+        change = f"{(b - a) / a:+.1%}" if a and b is not None else '-'
+        print(f"{section + '.' + key:<28}{a if a is None else round(a, 2):>12}{b if b is None else round(b, 2):>12}"
+              f"{change:>10}")
 
 
 if __name__ == '__main__':
-    # 命令行传入
-    # parser = argparse.ArgumentParser(description="模拟 AOI 数据流向目标目录推送图片")
-    # parser.add_argument('--source', type=str, required=True, help="AOI 图片源目录")
-    # parser.add_argument('--target', type=str, required=True, help="图片推送目标目录")
-    # parser.add_argument('--interval', type=float, default=1.0, help="推送间隔（秒）")
-    # parser.add_argument('--max_push', type=int, default=None, help="最大推送图片数（None 表示全部推送）")
-    # parser.add_argument('--shuffle', action='store_true', help="是否打乱图片顺序")
-    #
-    # args = parser.parse_args()
-    #
-    # simulate_push(args.source, args.target, args.interval, args.max_push, args.shuffle)
-
-    # 参数传入
-    source = '../datasets/simulate_ready_push'
-    target = './target'
-    interval = 1.0
-    max_push = 25
-    shuffle = True
-
-    simulate_push(source, target, interval, max_push, shuffle)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="模拟 AOI 数据流向目标目录推送图片，或进行端到端复检压测")
+    parser.add_argument('--source', type=str, default='../datasets/simulate_ready_push', help="AOI 图片源目录")
+    parser.add_argument('--target', type=str, default='./target', help="图片推送目标目录")
+    parser.add_argument('--rate', type=float, default=1.0, help="平均到达速率（张/秒）")
+    parser.add_argument('--max-push', type=int, default=None, help="最大推送图片数（None 表示全部推送）")
+    parser.add_argument('--arrival', type=str, default='uniform', choices=('uniform', 'poisson'), help="到达间隔分布")
+    parser.add_argument('--seed', type=int, default=0, help="随机种子")
+    parser.add_argument('--benchmark', type=str, default=None, metavar='MODEL', help="使用该模型权重进行端到端压测")
+    parser.add_argument('--device', type=str, default=None, help="压测推理设备，如 0 或 cpu，默认有 GPU 时用 0")
+    parser.add_argument('--streams', type=int, default=0, help="CPU 推理流数量（ONNX/OpenVINO 模型），0 表示不启用")
+    parser.add_argument('--cpu-scaling', type=str, default=None, metavar='MODEL',
+                        help="使用该模型权重测试 1 到 N 个 CPU 核的吞吐扩展性")
+    parser.add_argument('--max-batch', type=int, default=32, help="微批次最大图片数")
+    parser.add_argument('--max-wait-ms', type=float, default=20, help="凑批最长等待时间（毫秒）")
+    parser.add_argument('--output', type=str, default=None, help="压测报告路径")
+    parser.add_argument('--compare', type=str, nargs='+', metavar='REPORT',
+                        help="对比报告：给一份时与本次压测结果对比，给两份时直接对比这两份")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        reports = [_load_report(p) for p in args.compare]
+        compare_reports(*reports)
+    elif args.cpu_scaling:
+        cpu_scaling(args.cpu_scaling, args.source, max_push=args.max_push or 200, seed=args.seed,
+                    max_batch=args.max_batch, max_wait_ms=args.max_wait_ms, output=args.output)
+    elif args.benchmark:
+        report = benchmark(args.benchmark, args.source, rate=args.rate, max_push=args.max_push or 200,
+                           arrival=args.arrival, seed=args.seed, device=args.device, max_batch=args.max_batch,
+                           max_wait_ms=args.max_wait_ms, output=args.output, streams=args.streams)
+        if args.compare:
+            compare_reports(_load_report(args.compare[0]), report)
+    else:
+        push_images(args.source, args.target, rate=args.rate, max_push=args.max_push, shuffle=True,
+                    arrival=args.arrival, seed=args.seed,
+                    on_push=lambda name, _: print(f"Pushed {name} -> {args.target}"))
+        print("模拟推送完成。")
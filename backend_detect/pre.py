@@ -1,63 +1,216 @@
 import os
+import json
+import time
+import hashlib
 import shutil
-import random
-import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from lxml.etree import iterparse  # C 实现的解析，比标准库快数倍
+except ImportError:
+    from xml.etree.ElementTree import iterparse
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__)))  # 项目根目录
 
+_class_ids = {}  # 进程池 worker 中的 类别名 -> id 映射，由 _init_worker 设置
+
+
+def parse_annotation(xml_path):
+    """
+    流式解析 Pascal-VOC 标注，只取图片尺寸和目标框，不构建整棵树。
+
+    :param xml_path: xml 标注路径
+    :return: (width, height, [(类别名, xmin, ymin, xmax, ymax), ...])
+    """
+    width = height = 0
+    objects = []
+    for _, elem in iterparse(xml_path, events=('end',)):
+        tag = elem.tag
+        if tag == 'size':
+            width = float(elem.findtext('width'))
+            height = float(elem.findtext('height'))
+        elif tag == 'object':
+            box = elem.find('bndbox')
+            objects.append((elem.findtext('name').strip(),
+                            *(float(box.findtext(k)) for k in ('xmin', 'ymin', 'xmax', 'ymax'))))
+            elem.clear()
+    return width, height, objects
+
+
 def convert_annotation(xml_path, txt_path, class_names):
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-
-    size_node = root.find('size')
-    width = int(size_node.find('width').text)
-    height = int(size_node.find('height').text)
-
-    with open(txt_path, 'w') as f:
-        for obj in root.iter('object'):
-            cls_name = obj.find('name').text
-            if cls_name not in class_names:
-                print(f"警告: 类别 {cls_name} 不在 class_names 中，跳过")
-                continue
-            cls_id = class_names.index(cls_name)
+    """
+    把一个 xml 标注转换为 YOLO txt。先写临时文件再 os.replace，中断时不会留下写了一半的标签；
+    txt 的修改时间设为与 xml 相同，batch_convert 据此判断 xml 是否变化。
+
+    :param xml_path: xml 标注路径
+    :param txt_path: 输出的 YOLO 标签路径
+    :param class_names: 类别名列表，或预先计算好的 类别名 -> id 字典
+    :return: (目标数, {未知类别名: 出现次数})
+    """
+    class_ids = class_names if isinstance(class_names, dict) else {n: i for i, n in enumerate(class_names)}
+    width, height, objects = parse_annotation(xml_path)
+
+    lines, unknown = [], {}
+    for cls_name, xmin, ymin, xmax, ymax in objects:
+        cls_id = class_ids.get(cls_name)
+        if cls_id is None:
+            unknown[cls_name] = unknown.get(cls_name, 0) + 1
+            continue
+        # 归一化
+        x_center = (xmin + xmax) / 2.0 / width
+        y_center = (ymin + ymax) / 2.0 / height
+        w = (xmax - xmin) / width
+        h = (ymax - ymin) / height
+        lines.append(f"{cls_id} {x_center:.6f} {y_center:.6f} {w:.6f} {h:.6f}\n")
 
-            xml_box = obj.find('bndbox')
-            xmin = int(xml_box.find('xmin').text)
-            ymin = int(xml_box.find('ymin').text)
-            xmax = int(xml_box.find('xmax').text)
-            ymax = int(xml_box.find('ymax').text)
+    tmp_path = f"{txt_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.writelines(lines)
+    st = os.stat(xml_path)
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp_path, txt_path)
+    return len(lines), unknown
 
-            # 归一化
-            x_center = (xmin + xmax) / 2.0 / width
-            y_center = (ymin + ymax) / 2.0 / height
-            w = (xmax - xmin) / width
-            h = (ymax - ymin) / height
 
-            f.write(f"{cls_id} {x_center:.6f} {y_center:.6f} {w:.6f} {h:.6f}\n")
+def _init_worker(class_ids):
+    global _class_ids
+    _class_ids = class_ids
 
 
-def batch_convert(xml_root_dir, save_root_dir, class_names):
-    if os.path.exists(save_root_dir):
-        pass
+def _convert_worker(paths):
+    try:
+        return convert_annotation(*paths, _class_ids)
+    except Exception as e:
+        print(f"❌ 转换失败 {paths[0]}: {e}")
+        return None
+
+
+def batch_convert(xml_root_dir, save_root_dir, class_names, workers=None):
+    """
+    把 xml_root_dir 下的 Pascal-VOC 标注批量转换为 YOLO 标签，目录结构保持不变。
+    只转换新增或修改时间与已有标签不同的 xml，因此可以在每次新增标注后重复调用；
+    class_names 与上次转换（记录在 save_root_dir/classes.json）不同或无记录时全部重新转换。
+
+    :param xml_root_dir: xml 标注根目录
+    :param save_root_dir: YOLO 标签保存根目录
+    :param class_names: 类别名列表，下标即类别 id
+    :param workers: 进程数，None 表示 CPU 核数，待转换文件较少时在当前进程内完成
+    :return: 本次转换的文件数
+    """
+    start_time = time.perf_counter()
+    state_path = os.path.join(save_root_dir, 'classes.json')
+    reconvert = True  # 类别映射未知或变化时旧标签的类别 id 已失效
+    if os.path.exists(state_path):
+        with open(state_path, encoding='utf-8') as f:
+            reconvert = json.load(f) != list(class_names)
+        if reconvert:
+            print("⚠️ class_names 与上次转换不同，重新转换全部标注")
+    tasks, skipped = [], 0
+    for subdir, _, files in os.walk(xml_root_dir):
+        out_dir = os.path.join(save_root_dir, os.path.relpath(subdir, xml_root_dir))
+        for file in files:
+            if not file.endswith('.xml'):
+                continue
+            xml_path = os.path.join(subdir, file)
+            txt_path = os.path.join(out_dir, file[:-4] + '.txt')
+            try:
+                if not reconvert and os.stat(txt_path).st_mtime_ns == os.stat(xml_path).st_mtime_ns:
+                    skipped += 1
+                    continue
+            except FileNotFoundError:
+                pass
+            os.makedirs(out_dir, exist_ok=True)
+            tasks.append((xml_path, txt_path))
+
+    class_ids = {name: i for i, name in enumerate(class_names)}
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks) // 64, 1))  # 每个进程至少分到 64 个文件
+    if workers > 1:
+        chunksize = max(len(tasks) // (workers * 8), 1)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(class_ids,)) as executor:
+            results = list(executor.map(_convert_worker, tasks, chunksize=chunksize))
     else:
-        print(f"路径不存在: {save_root_dir}")
-        for subdir, _, files in os.walk(xml_root_dir):
-            for file in files:
-                if file.endswith('.xml'):
-                    xml_path = os.path.join(subdir, file)
+        _init_worker(class_ids)
+        results = [_convert_worker(t) for t in tasks]
+
+    converted, boxes, unknown = 0, 0, {}
+    for result in results:
+        if result is None:
+            continue
+        converted += 1
+        boxes += result[0]
+        for name, n in result[1].items():
+            unknown[name] = unknown.get(name, 0) + n
+    for name, n in unknown.items():
+        print(f"警告: 类别 {name} 不在 class_names 中，跳过 {n} 个目标")
+    os.makedirs(save_root_dir, exist_ok=True)
+    with open(state_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(list(class_names), f, ensure_ascii=False)
+    os.replace(state_path + '.tmp', state_path)
+
+    duration = time.perf_counter() - start_time
+    print(f"✅ 标注转换完成：转换 {converted} 个文件（{len(tasks) - converted} 个失败，{skipped} 个未变化跳过），"
+          f"{boxes} 个目标，{workers} 个进程，耗时 {duration:.2f} 秒（{converted / max(duration, 1e-9):.0f} 个/秒）")
+    print(f"YOLO 标注已保存到: {save_root_dir}")
+    return converted
+
+SPLIT_MODES = ('copy', 'hardlink', 'reflink', 'symlink', 'manifest')
+IMG_SUFFIXES = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+FICLONE = 0x40049409  # Linux ioctl，btrfs/xfs 等文件系统上的写时复制
+
 
-                    # 构造对应 save 路径
-                    relative_path = os.path.relpath(xml_path, xml_root_dir)
-                    txt_path = os.path.join(save_root_dir, relative_path)
-                    txt_path = txt_path.replace('.xml', '.txt')
+def _reflink(src, dst):
+    import fcntl
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    shutil.copystat(src, dst)
 
-                    # 确保保存目录存在
-                    os.makedirs(os.path.dirname(txt_path), exist_ok=True)
 
-                    # 转换
-                    convert_annotation(xml_path, txt_path, class_names)
+def _place_file(src, dst, mode):
+    """
+    按 mode 把 src 放到 dst；已是最新（同一 inode / 指向 src / 大小和修改时间相同）时跳过，
+    硬链接、reflink 不支持（跨文件系统、Windows FAT 等）时退化为复制。
+
+    :return: 实际使用的方式，跳过时返回 None
+    """
+    if os.path.lexists(dst):
+        if mode == 'symlink':
+            current = os.path.islink(dst) and os.readlink(dst) == src
+        else:
+            a, b = os.stat(src), os.lstat(dst)
+            current = not os.path.islink(dst) and (os.path.samefile(src, dst) or
+                                                   (a.st_size, a.st_mtime_ns) == (b.st_size, b.st_mtime_ns))
+        if current:
+            return None
+        os.remove(dst)
+    try:
+        if mode == 'hardlink':
+            os.link(src, dst)
+        elif mode == 'symlink':
+            os.symlink(src, dst)
+        elif mode == 'reflink':
+            _reflink(src, dst)
+        else:
+            shutil.copy2(src, dst)
+        return mode
+    except (OSError, ImportError):
+        if os.path.lexists(dst):
+            os.remove(dst)
+        shutil.copy2(src, dst)
+        return 'copy'
+
+
+def _stratum(label_path, defect):
+    """分层键：有缺陷子目录时为子目录名，否则为标签中出现最多的类别（无目标为 'background'）"""
+    if defect:
+        return defect
+    with open(label_path) as f:
+        ids = [line.split(maxsplit=1)[0] for line in f if line.strip()]
+    return max(set(ids), key=ids.count) if ids else 'background'
+
+
+def _split_order(name, seed):
+    return hashlib.sha256(f"{seed}:{name}".encode()).hexdigest()
 
-        print(f"全部转换完成！YOLO 标注已保存到: {save_root_dir}")
 
 def split_dataset(
         target_data_set: str = 'BJ-PCB',
@@ -65,89 +218,118 @@ def split_dataset(
         image_name: str = 'images',
         train_ratio: float = 0.8,
         next_train: bool = False,
+        mode: str = 'hardlink',
+        seed: int = 0,
 ):
-    if next_train is False:
-        # 路径信息
-        root_dir = os.path.join(BASE_DIR, "datasets", "raw", target_data_set)
-        # root_dir = f'./datasets/raw/{target_data_set}'
-        annotation_dir = os.path.join(root_dir, annotation_name)
-        image_dir = os.path.join(root_dir, image_name)
-        output_root = os.path.join(BASE_DIR, "datasets", target_data_set)
-        # output_root = f'./datasets/{target_data_set}'
-    else:
-        root_dir = os.path.join(BASE_DIR, "datasets", "raw", target_data_set)
-        # root_dir = f'../datasets/raw/{target_data_set}'
-        annotation_dir = os.path.join(root_dir, annotation_name)
-        image_dir = os.path.join(root_dir, image_name)
-        output_root = os.path.join(BASE_DIR, "datasets", target_data_set)
-        # output_root = f'../datasets/{target_data_set}'
-        if os.path.exists(output_root):
-            shutil.rmtree(output_root)
-
-    if os.path.exists(output_root):
-        print('检测到数据集')
-        pass
-    else:
-        # 输出路径
-        train_anno_dir = os.path.join(output_root, 'train', annotation_name)
-        train_img_dir = os.path.join(output_root, 'train', image_name)
-        val_anno_dir = os.path.join(output_root, 'val', annotation_name)
-        val_img_dir = os.path.join(output_root, 'val', image_name)
-
-        # 创建输出目录
-        for d in [train_anno_dir, train_img_dir, val_anno_dir, val_img_dir]:
-            os.makedirs(d, exist_ok=True)
-
-        # 获取缺陷类型
-        possible_defects = [f for f in os.listdir(annotation_dir) if os.path.isdir(os.path.join(annotation_dir, f))]
-
-        if possible_defects:
-            for defect in possible_defects:
-                anno_path = os.path.join(annotation_dir, defect)
-                img_path = os.path.join(image_dir, defect)
-
-                annos = os.listdir(anno_path)
-                random.shuffle(annos)
-
-                split_idx = int(len(annos) * train_ratio)
-                train_annos = annos[:split_idx]
-                val_annos = annos[split_idx:]
-
-                # 创建子目录
-                os.makedirs(os.path.join(train_anno_dir, defect), exist_ok=True)
-                os.makedirs(os.path.join(train_img_dir, defect), exist_ok=True)
-                os.makedirs(os.path.join(val_anno_dir, defect), exist_ok=True)
-                os.makedirs(os.path.join(val_img_dir, defect), exist_ok=True)
-
-                # 移动文件
-                for anno in train_annos:
-                    img = anno.replace('.txt', '.jpg')
-                    shutil.copy(os.path.join(anno_path, anno), os.path.join(train_anno_dir, defect, anno))
-                    shutil.copy(os.path.join(img_path, img), os.path.join(train_img_dir, defect, img))
-
-                for anno in val_annos:
-                    img = anno.replace('.txt', '.jpg')
-                    shutil.copy(os.path.join(anno_path, anno), os.path.join(val_anno_dir, defect, anno))
-                    shutil.copy(os.path.join(img_path, img), os.path.join(val_img_dir, defect, img))
+    """
+    把 datasets/raw/<target_data_set> 按缺陷类别分层划分为 train/val，写入 datasets/<target_data_set>。
 
-        else:
-            # 无缺陷类型子目录
-            annos = [f for f in os.listdir(annotation_dir) if f.endswith('.txt')]
-            random.shuffle(annos)
-
-            split_idx = int(len(annos) * train_ratio)
-            train_annos = annos[:split_idx]
-            val_annos = annos[split_idx:]
-
-            # 移动文件
-            for anno in train_annos:
-                img = anno.replace('.txt', '.jpg')
-                shutil.copy(os.path.join(annotation_dir, anno), os.path.join(train_anno_dir, anno))
-                shutil.copy(os.path.join(image_dir, img), os.path.join(train_img_dir, img))
-
-            for anno in val_annos:
-                img = anno.replace('.txt', '.jpg')
-                shutil.copy(os.path.join(annotation_dir, anno), os.path.join(val_anno_dir, anno))
-                shutil.copy(os.path.join(image_dir, img), os.path.join(val_img_dir, img))
-
-        print("数据集划分完成")
+    划分结果保存在输出目录的 split.json 中：已划分的文件保持原来的归属，新增文件按 seed 决定的顺序
+    分配到各自的层，使每层的训练集比例接近 train_ratio；原始目录中已删除的文件从输出中移除。
+    因此相同 seed 和文件集合总能得到相同的划分，每次重新训练只需处理变化的文件。
+
+    :param target_data_set: 数据集名称
+    :param annotation_name: 标签目录名
+    :param image_name: 图片目录名
+    :param train_ratio: 训练集比例
+    :param next_train: 兼容旧参数，增量划分后不再需要删除整个输出目录
+    :param mode: 'copy'、'hardlink'、'reflink'、'symlink' 或 'manifest'。前四种在输出目录中建立
+                 train/val 文件树；'manifest' 不放置任何文件，只写 train.txt/val.txt 图片列表
+                 （BaseDataset.get_img_files 直接读取，标签按 images -> labels 从原始目录找到）
+    :param seed: 划分随机种子
+    :return: {'train': 训练集路径, 'val': 验证集路径}，可直接写入数据集 yaml
+    """
+    assert mode in SPLIT_MODES, f"mode 必须是 {SPLIT_MODES} 之一"
+    root_dir = os.path.join(BASE_DIR, "datasets", "raw", target_data_set)
+    annotation_dir = os.path.join(root_dir, annotation_name)
+    image_dir = os.path.join(root_dir, image_name)
+    output_root = os.path.join(BASE_DIR, "datasets", target_data_set)
+    if mode == 'manifest' and (annotation_name, image_name) != ('labels', 'images'):
+        print("⚠️ manifest 模式要求目录名为 labels/images 才能由图片路径找到标签，改用 hardlink")
+        mode = 'hardlink'
+    start_time = time.perf_counter()
+
+    # 扫描原始数据：相对路径（缺陷子目录/文件名）-> (标签路径, 图片路径, 分层键)
+    possible_defects = sorted(f for f in os.listdir(annotation_dir) if os.path.isdir(os.path.join(annotation_dir, f)))
+    if not possible_defects:
+        print("进入无缺陷子目录")
+    samples = {}
+    for defect in possible_defects or ['']:
+        anno_path = os.path.join(annotation_dir, defect)
+        img_path = os.path.join(image_dir, defect)
+        images = {}
+        if os.path.isdir(img_path):
+            for f in os.listdir(img_path):
+                stem, suffix = os.path.splitext(f)
+                if suffix.lower() in IMG_SUFFIXES:
+                    images.setdefault(stem, f)
+        for anno in sorted(os.listdir(anno_path)):
+            if not anno.endswith('.txt'):
+                continue
+            img = images.get(anno[:-4])
+            if img is None:
+                print(f"❌ 缺失图像文件：{os.path.join(defect, anno[:-4])}.*")
+                continue
+            label_path = os.path.join(anno_path, anno)
+            samples[os.path.join(defect, anno)] = (label_path, os.path.join(img_path, img),
+                                                   _stratum(label_path, defect))
+
+    # 读取已有划分，保持旧文件的归属，按 seed 决定的顺序分配新文件
+    state_path = os.path.join(output_root, 'split.json')
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+        if (state.get('seed'), state.get('train_ratio')) != (seed, train_ratio):
+            print(f"⚠️ seed/train_ratio 与已有划分不同，按已有划分增量更新（重新划分请删除 {state_path}）")
+    old = state.get('assignments', {})
+    assignments = {k: v for k, v in old.items() if k in samples}
+    removed = {k: v for k, v in old.items() if k not in samples}
+    counts = {}
+    for rel, split in assignments.items():
+        stratum = samples[rel][2]
+        counts.setdefault(stratum, {'train': 0, 'val': 0})[split] += 1
+    new = sorted((rel for rel in samples if rel not in assignments), key=lambda rel: _split_order(rel, seed))
+    for rel in new:
+        c = counts.setdefault(samples[rel][2], {'train': 0, 'val': 0})
+        split = 'train' if c['train'] < round((c['train'] + c['val'] + 1) * train_ratio) else 'val'
+        assignments[rel] = split
+        c[split] += 1
+
+    # 放置文件或写清单
+    os.makedirs(output_root, exist_ok=True)
+    placed = {}
+    for rel, split in removed.items():  # 原始目录中已删除的文件
+        label_dir = os.path.join(output_root, split, annotation_name, os.path.dirname(rel))
+        img_dir = os.path.join(output_root, split, image_name, os.path.dirname(rel))
+        stem = os.path.basename(rel)[:-4]
+        for path in [os.path.join(label_dir, stem + '.txt')] + [os.path.join(img_dir, stem + s) for s in IMG_SUFFIXES]:
+            if os.path.lexists(path):
+                os.remove(path)
+    for rel, split in sorted(assignments.items()):
+        label_path, img_path, _ = samples[rel]
+        if mode == 'manifest':
+            continue
+        for src, sub in (label_path, annotation_name), (img_path, image_name):
+            dst_dir = os.path.join(output_root, split, sub, os.path.dirname(rel))
+            os.makedirs(dst_dir, exist_ok=True)
+            used = _place_file(os.path.abspath(src), os.path.join(dst_dir, os.path.basename(src)), mode)
+            if used:
+                placed[used] = placed.get(used, 0) + 1
+    if mode == 'manifest':
+        for split in ('train', 'val'):
+            with open(os.path.join(output_root, f'{split}.txt.tmp'), 'w', encoding='utf-8') as f:
+                f.writelines(os.path.abspath(samples[rel][1]) + '\n'
+                             for rel in sorted(assignments) if assignments[rel] == split)
+            os.replace(os.path.join(output_root, f'{split}.txt.tmp'), os.path.join(output_root, f'{split}.txt'))
+
+    with open(state_path + '.tmp', 'w') as f:
+        json.dump({'seed': seed, 'train_ratio': train_ratio, 'mode': mode, 'assignments': assignments}, f)
+    os.replace(state_path + '.tmp', state_path)
+
+    n_train = sum(split == 'train' for split in assignments.values())
+    print(f"数据集划分完成：训练集 {n_train}，验证集 {len(assignments) - n_train}，新增 {len(new)}，移除 {len(removed)}，"
+          f"放置文件 {', '.join(f'{k} {v}' for k, v in placed.items()) or 0}，耗时 {time.perf_counter() - start_time:.2f} 秒")
+    if mode == 'manifest':
+        return {split: os.path.join(output_root, f'{split}.txt') for split in ('train', 'val')}
+    return {split: os.path.join(output_root, split, image_name) for split in ('train', 'val')}
@@ -1,16 +1,34 @@
+import asyncio
+import hashlib
+import re
 import subprocess
 import os
+import json
+import time
+import threading
+import uuid
 import uvicorn
 import signal
 import sys
 import shutil
 import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+import cv2
+import numpy as np
 from pydantic import BaseModel
 from fastapi.staticfiles import StaticFiles
-from typing import Dict
+from typing import Dict, List
 from fastapi import FastAPI, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.websockets import WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from ultralytics import YOLO
+from active_learning.active_learning import LowConfFeed, detect_loop, verdict
+# 两个服务共用项目根目录下的 common 模块
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.connection_manager import ConnectionManager
 
 app = FastAPI()
 # BASE_DIR = os.path.dirname(__file__)  # server.py 所在目录
@@ -31,9 +49,6 @@ app.add_middleware(
 training_processes: Dict[str, subprocess.Popen] = {}
 training_status: Dict[str, Dict] = {}
 
-# active_process: Optional[subprocess.Popen] = None
-active_processes: Dict[str, subprocess.Popen] = {}
-
 SAVE_DIR = "./active_learning/low_conf_images/labels"
 
 BASE_DIR = os.path.dirname(__file__)
@@ -42,28 +57,16 @@ app.mount("/static/low_conf_images", StaticFiles(directory=low_conf_dir), name="
 
 
 # WebSocket 连接管理器
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
-
-
 manager = ConnectionManager()
+low_conf_manager = ConnectionManager(max_queue=1024, overflow="close")  # 断开后按序号补发，不丢事件
+low_conf_feed = LowConfFeed()
 
 
 @app.websocket("/ws/training-status")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, channels: str = None):
+    # channels: 逗号分隔的订阅频道（progress,metrics,model），不传则订阅全部
+    channels = [c for c in channels.split(",") if c in ConnectionManager.CHANNELS] if channels else None
+    await manager.connect(websocket, channels)
     try:
         while True:
             await websocket.receive_text()  # 可接收前端心跳消息
@@ -74,19 +77,70 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.post("/api/training-finished")
 async def training_finished():
     print("@app.post(\"/api/training-finished\")")
-    await manager.broadcast("training_complete")
+    await manager.broadcast("training_complete", channel="model")
     return {"status": "notified"}
 
 
+class TrainingEvent(BaseModel):
+    channel: str
+    data: dict = {}
+
+
+@app.post("/api/training-event")
+async def training_event(event: TrainingEvent):
+    # 训练进程上报的进度/指标，以 JSON {"channel": ..., ...} 推送给订阅了该频道的客户端
+    if event.channel not in ConnectionManager.CHANNELS:
+        return {"status": "error", "message": f"未知频道: {event.channel}"}
+    await manager.broadcast(json.dumps({"channel": event.channel, **event.data}), channel=event.channel)
+    return {"status": "notified", "clients": len(manager.active_connections)}
+
+
+@app.get("/api/ws-stats")
+def websocket_stats():
+    return {"training": manager.stats(), "low_conf": low_conf_manager.stats()}
+
+
+@app.on_event("startup")
+async def subscribe_low_conf_feed():
+    # 检测线程发布事件，切回事件循环后入队到各客户端
+    loop = asyncio.get_running_loop()
+    low_conf_feed.subscribe(lambda event: loop.call_soon_threadsafe(
+        low_conf_manager.broadcast_nowait, json.dumps({"type": "low_conf", **event})))
+
+
+@app.websocket("/ws/low-conf")
+async def low_conf_websocket(websocket: WebSocket, since: int = 0, epoch: int = 0):
+    """
+    推送低置信度图片事件 {type, seq, ts, filename, boxes, confs, classes}，替代轮询 /api/transfer-images。
+
+    :param since: 客户端已收到的最大序号，重连时补发缓冲区中其后的事件
+    :param epoch: 客户端记录的 LowConfFeed.epoch，与服务端不一致（服务重启）时 since 作废
+    """
+    await low_conf_manager.connect(websocket)
+    if epoch != low_conf_feed.epoch:
+        since = 0
+    # 注册队列与补发之间没有 await，补发的事件一定排在后续实时事件之前；重复的序号由客户端忽略
+    low_conf_manager.send(websocket, json.dumps({"type": "hello", "epoch": low_conf_feed.epoch,
+                                                 "seq": low_conf_feed.seq}))
+    for event in low_conf_feed.since(since):
+        low_conf_manager.send(websocket, json.dumps({"type": "low_conf", **event}))
+    try:
+        while True:
+            await websocket.receive_text()  # 可接收前端心跳消息
+    except WebSocketDisconnect:
+        low_conf_manager.disconnect(websocket)
+
+
 def handle_shutdown(signum, frame):
     print("\n🚧 正在关闭服务器，停止所有训练进程...")
+    stop_detect_thread()
     for tid, process in training_processes.items():
         print(f"⛔ 终止训练 {tid} (PID: {process.pid})")
         process.terminate()
     sys.exit(0)
 
 
-# 待实现和完善：前端隔一段时间调用该方法，将raw和marked对应图片传入前端展示，给工人标注用
+# 兼容旧前端的轮询接口：只转移未开启推送（detect_loop 未传 feed）时写入 tmp 的图片，新前端使用 /ws/low-conf
 @app.get("/api/transfer-images")
 def get_transfer_images():
     src_dir = os.path.join(BASE_DIR, "active_learning", "low_conf_images", "tmp")
@@ -112,25 +166,11 @@ def get_transfer_images():
     return {"status": "ok", "files": moved_files}
 
 
-class StartDetectRequest(BaseModel):
-    model_name: str
-
-
-@app.post("/api/start-detecting")
-def start_detecting(req: StartDetectRequest):
-    model_name = req.model_name
-    process = active_processes.get(model_name)
-    if process and process.poll() is None:
-        return {"status": "already_running", "pid": process.pid}
-
-    script_path = os.path.join(BASE_DIR, "active_learning", "active_learning.py")
+def resolve_model_path(model_name):
+    """在 runs/active_learning 下查找目录名以 model_name（时间戳）结尾的模型，返回 best.pt 路径"""
     model_base_dir = os.path.join(BASE_DIR, "runs", "active_learning")
-
     if not os.path.exists(model_base_dir):
-        return {"status": "error", "message": f"模型目录不存在: {model_base_dir}"}
-
-    # 在模型目录下查找匹配的文件夹
-    matched_model_path = None
+        return None
     for d in os.listdir(model_base_dir):  # 所有模型文件
         full_path = os.path.join(model_base_dir, d)
         if os.path.isdir(full_path):  # 检查目录
@@ -138,40 +178,217 @@ def start_detecting(req: StartDetectRequest):
             if len(parts) >= 2:
                 last_two = "_".join(parts[-2:])
                 if last_two == model_name:  # name匹配
-                    matched_model_path = os.path.join(full_path, "weights", "best.pt")
-                    break
+                    weights = os.path.join(full_path, "weights", "best.pt")
+                    return weights if os.path.exists(weights) else None
+    return None
+
+
+class ModelPool:
+    """
+    常驻内存的 YOLO 模型池，按模型名索引。
+    模型只在首次使用时加载并预热，超过 max_models 时淘汰最久未使用的（正在检测的模型除外），
+    切换已常驻的模型只是替换 active 指针。
+    同一个 YOLO 对象的 predictor 及其参数由所有调用方共用，每次 predict 必须通过 lease() 持有该模型的锁。
+    """
+
+    def __init__(self, max_models=2, device="0", imgsz=640):
+        self.max_models = max_models
+        self.device = device
+        self.imgsz = imgsz
+        self.models = OrderedDict()
+        self.locks = {}  # 模型名 -> threading.Lock，串行化同一模型上的 predict
+        self.active = None
+        self.metrics = {"loads": 0, "evictions": 0, "warm_switches": 0, "cold_switches": 0, "models": {}}
+        self._lock = threading.Lock()
+
+    def get(self, model_name):
+        with self._lock:
+            return self._get(model_name)
+
+    def _get(self, model_name):
+        if model_name in self.models:
+            self.models.move_to_end(model_name)
+            self.metrics["models"][model_name]["hits"] += 1
+            return self.models[model_name]
+
+        model_path = resolve_model_path(model_name)
+        if model_path is None:
+            raise FileNotFoundError(f"未找到匹配模型或权重文件: {model_name}")
+        start = time.perf_counter()
+        model = YOLO(model_path)
+        # 预热：建立常驻 predictor 并完成 warmup，后续请求不再付出这部分开销
+        model.predict(np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8), device=self.device,
+                      imgsz=self.imgsz, autotune=True, verbose=False)
+        load_time = time.perf_counter() - start
+        print(f"📦 已加载模型 {model_name}，耗时 {load_time:.2f} 秒: {model_path}")
+
+        self.models[model_name] = model
+        self.locks[model_name] = threading.Lock()
+        self.metrics["loads"] += 1
+        self.metrics["models"][model_name] = {"model_path": model_path, "load_time_s": round(load_time, 3),
+                                              "hits": 0}
+        self._evict(keep=model_name)
+        return model
+
+    def _evict(self, keep):
+        for name in list(self.models):
+            if len(self.models) <= self.max_models:
+                break
+            if name not in (keep, self.active):
+                del self.models[name]
+                del self.locks[name]  # 仍在使用的调用方持有锁对象的引用，可以正常释放
+                self.metrics["evictions"] += 1
+                print(f"♻️ 模型池已满，卸载模型 {name}")
+
+    def switch(self, model_name):
+        """将 model_name 设为检测循环使用的模型，返回切换耗时（毫秒）以及是否为冷启动"""
+        with self._lock:
+            start = time.perf_counter()
+            cold = model_name not in self.models
+            self._get(model_name)
+            self.active = model_name
+            self._evict(keep=model_name)  # 之前的 active 模型不再受保护
+            switch_ms = (time.perf_counter() - start) * 1e3
+            self.metrics["cold_switches" if cold else "warm_switches"] += 1
+            self.metrics["models"][model_name]["last_switch_ms"] = round(switch_ms, 3)
+        return switch_ms, cold
+
+    @contextmanager
+    def lease(self, model_name=None):
+        """持有模型的锁并返回模型，model_name 为 None 时使用检测循环当前的模型"""
+        with self._lock:
+            model_name = model_name or self.active
+            model = self._get(model_name)
+            lock = self.locks[model_name]
+        with lock:
+            yield model
+
+    def stats(self):
+        with self._lock:
+            return {
+                "device": self.device,
+                "max_models": self.max_models,
+                "active": self.active,
+                "resident": list(self.models),
+                **self.metrics,
+            }
+
+
+model_pool = ModelPool(max_models=int(os.getenv("DETECT_MAX_MODELS", "2")), device=os.getenv("DETECT_DEVICE", "0"))
+detect_stop = threading.Event()
+detect_thread = None
+
+
+def run_inference(model_name, data):
+    """对单张图片字节做推理，返回复检结论"""
+    img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return {"status": "error", "message": "无法解码图片"}
+    model_name = model_name or model_pool.active
+    if model_name is None:
+        return {"status": "error", "message": "未指定模型且没有正在检测的模型"}
+    try:
+        # 与 detect_loop 共用同一个 predictor：持有模型锁，避免并发调用互相改写 predictor 参数；
+        # 其参数会沿用上次调用，需显式关闭 batch_results 以返回 Results
+        with model_pool.lease(model_name) as model:
+            start = time.perf_counter()
+            result = model.predict(img, device=model_pool.device, imgsz=model_pool.imgsz, conf=0.25,
+                                   autotune=True, batch_results=False, verbose=False)[0]
+    except FileNotFoundError as e:
+        return {"status": "error", "message": str(e)}
+    boxes = result.boxes
+    return {
+        "status": "ok",
+        "model_name": model_name,
+        "verdict": verdict(result),
+        "boxes": boxes.xyxy.tolist(),
+        "confs": boxes.conf.tolist(),
+        "classes": [result.names[int(c)] for c in boxes.cls],
+        "infer_ms": round((time.perf_counter() - start) * 1e3, 3),
+    }
 
-    if not matched_model_path or not os.path.exists(matched_model_path):
-        return {"status": "error", "message": f"未找到匹配模型或权重文件: {model_name}"}
 
-    # 构造启动命令
-    cmd = [
-        "python", script_path,
-        "--model", matched_model_path
-    ]
+@app.post("/api/infer")
+async def infer(request: Request, model_name: str = None):
+    data = await request.body()
+    return await run_in_threadpool(run_inference, model_name, data)
+
 
-    active_process = subprocess.Popen(cmd)
-    active_processes[model_name] = active_process
+@app.websocket("/ws/infer")
+async def infer_websocket(websocket: WebSocket):
+    # 二进制消息为图片字节；文本消息 {"model_name": ...} 用于切换本连接使用的模型
+    await websocket.accept()
+    model_name = None
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                await websocket.send_json(await run_in_threadpool(run_inference, model_name, message["bytes"]))
+            elif message.get("text"):
+                try:
+                    model_name = json.loads(message["text"]).get("model_name")
+                    await websocket.send_json({"status": "ok", "model_name": model_name})
+                except (ValueError, AttributeError):
+                    await websocket.send_json({"status": "error", "message": "无法解析的文本消息"})
+    except WebSocketDisconnect:
+        pass
 
-    print(f"🚀 启动主动学习进程 (PID: {active_process.pid})，模型路径: {matched_model_path}")
-    return {"status": "started", "pid": active_process.pid, "model_path": matched_model_path}
+
+@app.get("/api/model-metrics")
+def model_metrics():
+    return model_pool.stats()
+
+
+class StartDetectRequest(BaseModel):
+    model_name: str
+
+
+@app.post("/api/start-detecting")
+def start_detecting(req: StartDetectRequest):
+    global detect_thread
+    model_name = req.model_name
+    running = detect_thread is not None and detect_thread.is_alive()
+    if running and model_pool.active == model_name:
+        return {"status": "already_running", "pid": os.getpid()}
+
+    try:
+        switch_ms, cold = model_pool.switch(model_name)
+    except FileNotFoundError as e:
+        return {"status": "error", "message": str(e)}
+    model_path = model_pool.metrics["models"][model_name]["model_path"]
+
+    # 检测循环每个批次通过 model_pool.lease() 取模型并持有其锁，切换模型无需重启
+    if not running:
+        detect_stop.clear()
+        detect_thread = threading.Thread(
+            target=detect_loop,
+            args=(model_pool.lease,),
+            kwargs=dict(device=model_pool.device, stop_event=detect_stop, feed=low_conf_feed),
+            daemon=True,
+        )
+        detect_thread.start()
+
+    print(f"🚀 检测模型切换为 {model_name}（{'冷启动' if cold else '热切换'} {switch_ms:.1f} ms），模型路径: {model_path}")
+    return {"status": "started", "pid": os.getpid(), "model_path": model_path,
+            "switch_ms": round(switch_ms, 3), "cold": cold}
+
+
+def stop_detect_thread(timeout=5):
+    if detect_thread is None or not detect_thread.is_alive():
+        return False
+    detect_stop.set()
+    detect_thread.join(timeout=timeout)
+    return True
 
 
 @app.post("/api/stop-detecting")
 def stop_detecting(req: StartDetectRequest):
-    # global active_process
-    model_name = req.model_name
-    process = active_processes.get(model_name)
-    if process and process.poll() is None:
-        process.terminate()
-        try:
-            process.wait(timeout=5)
-            print(f"✅ 已停止主动学习进程 (PID: {process.pid})")
-            return {"status": "stopped", "pid": process.pid}
-        except subprocess.TimeoutExpired:
-            process.kill()
-            print(f"⚠️ 强制终止主动学习进程 (PID: {process.pid})")
-            return {"status": "killed", "pid": process.pid}
+    # 只停止检测循环，模型仍常驻在模型池中，再次启动为热切换
+    if model_pool.active == req.model_name and stop_detect_thread():
+        print(f"✅ 已停止检测循环，模型: {req.model_name}")
+        return {"status": "stopped", "pid": os.getpid()}
     else:
         return {"status": "no_running_process"}
 
@@ -183,12 +400,15 @@ def managing_data():
     # 设置 PYTHONPATH 环境变量为项目根目录
     env = os.environ.copy()
     env["PYTHONPATH"] = BASE_DIR_in
+    # 数据集上传到训练端时使用的任务 ID，前端用它查询 /upload-status/{upload_id}
+    upload_id = uuid.uuid4().hex
+    env["UPLOAD_JOB_ID"] = upload_id
     cmd = [
         "python", "-m", module_name
     ]
     active_process = subprocess.Popen(cmd, env=env)
     print(f"数据整理进程 (PID: {active_process.pid})")
-    return {"status": "start managing", "pid": active_process.pid}
+    return {"status": "start managing", "pid": active_process.pid, "upload_id": upload_id}
 
 
 @app.get("/api/return_model")
@@ -240,7 +460,7 @@ async def upload_model_zip(file: UploadFile = File(...)):
         # 保存 zip 文件到临时路径
         zip_path = os.path.join(model_base_dir, file.filename)
         with open(zip_path, "wb") as f:
-            f.write(await file.read())
+            shutil.copyfileobj(file.file, f)  # 不把整个 zip 读入内存
 
         # 解压到同目录下，以 zip 文件名为目录名
         extract_name = os.path.splitext(file.filename)[0]
@@ -266,6 +486,159 @@ async def upload_model_zip(file: UploadFile = File(...)):
         }
 
 
+class ArtifactFile(BaseModel):
+    path: str  # 相对模型目录的路径，如 weights/best.pt
+    size: int
+    sha256: str
+
+
+class ArtifactManifest(BaseModel):
+    name: str  # 模型目录名，如 model_..._20250101_120000
+    files: List[ArtifactFile]
+
+
+class ArtifactStore:
+    """
+    内容寻址的模型产物仓库，配合训练端 upload_model_artifacts 使用：
+    plan 返回每个文件需要从哪个偏移量开始上传（sha256 已存在的文件不需要上传），
+    训练端按块 PUT 到 partial/<sha256>，commit 校验哈希后移入 blobs/ 并以硬链接组装出模型目录。
+    相同权重只保存一份，中断的上传下次从 partial 已写入的字节继续。
+    替换已有模型目录时旧目录先移到 replaced/，新目录就位后再删除；两次重命名之间中断时，启动时把旧目录移回。
+
+    :param root: 仓库根目录
+    :param target_dir: 模型目录所在目录（runs/active_learning）
+    """
+
+    def __init__(self, root, target_dir):
+        self.root = root
+        self.target_dir = target_dir
+        for d in ("blobs", "partial", "staging", "replaced"):
+            os.makedirs(os.path.join(root, d), exist_ok=True)
+        self._recover_replaced()
+
+    def _recover_replaced(self):
+        """处理上次 commit 在替换模型目录时中断留下的旧目录：新目录未就位则移回，否则删除"""
+        replaced_dir = os.path.join(self.root, "replaced")
+        for name in os.listdir(replaced_dir):
+            old_dir, model_dir = os.path.join(replaced_dir, name), os.path.join(self.target_dir, name)
+            if os.path.exists(model_dir):
+                shutil.rmtree(old_dir)
+            else:
+                os.makedirs(self.target_dir, exist_ok=True)
+                os.replace(old_dir, model_dir)
+
+    @staticmethod
+    def check_sha256(sha256):
+        if not re.fullmatch(r"[0-9a-f]{64}", sha256):
+            raise ValueError(f"非法的 sha256: {sha256}")
+        return sha256
+
+    def blob_path(self, sha256):
+        return os.path.join(self.root, "blobs", self.check_sha256(sha256))
+
+    def partial_path(self, sha256):
+        return os.path.join(self.root, "partial", self.check_sha256(sha256))
+
+    def plan(self, manifest: ArtifactManifest):
+        missing = []
+        for f in manifest.files:
+            if os.path.exists(self.blob_path(f.sha256)):
+                continue
+            partial = self.partial_path(f.sha256)
+            offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+            missing.append({"path": f.path, "sha256": f.sha256, "offset": min(offset, f.size)})
+        return missing
+
+    def commit(self, manifest: ArtifactManifest):
+        """校验所有文件并组装模型目录，目录整体重命名就位，检测端不会看到写了一半的模型"""
+        if os.path.basename(manifest.name) != manifest.name or manifest.name.startswith("."):
+            raise ValueError(f"非法的模型名: {manifest.name}")
+        for f in manifest.files:
+            blob = self.blob_path(f.sha256)
+            if os.path.exists(blob):
+                continue
+            partial = self.partial_path(f.sha256)
+            if f.size == 0:
+                open(partial, "ab").close()
+            if not os.path.exists(partial) or os.path.getsize(partial) != f.size:
+                raise ValueError(f"{f.path} 未上传完整")
+            if file_sha256(partial) != f.sha256:
+                os.remove(partial)  # 内容损坏，下次从头上传
+                raise ValueError(f"{f.path} sha256 校验失败")
+            os.replace(partial, blob)
+
+        staging = os.path.join(self.root, "staging", manifest.name)
+        if os.path.exists(staging):
+            shutil.rmtree(staging)
+        for f in manifest.files:
+            dst = os.path.normpath(os.path.join(staging, f.path))
+            if not dst.startswith(staging + os.sep):
+                raise ValueError(f"非法的文件路径: {f.path}")
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            try:
+                os.link(self.blob_path(f.sha256), dst)
+            except OSError:  # 不支持硬链接的文件系统
+                shutil.copyfile(self.blob_path(f.sha256), dst)
+
+        os.makedirs(self.target_dir, exist_ok=True)
+        model_dir = os.path.join(self.target_dir, manifest.name)
+        old_dir = os.path.join(self.root, "replaced", manifest.name)
+        if os.path.exists(old_dir):
+            shutil.rmtree(old_dir)
+        if os.path.exists(model_dir):
+            os.replace(model_dir, old_dir)  # 先移开旧目录（不删除），中断时仍可恢复
+        os.replace(staging, model_dir)
+        if os.path.exists(old_dir):
+            shutil.rmtree(old_dir)
+        return model_dir
+
+
+def file_sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            h.update(block)
+    return h.hexdigest()
+
+
+artifact_store = ArtifactStore(os.path.join(BASE_DIR, "runs", "artifact_store"),
+                               os.path.join(BASE_DIR, "runs", "active_learning"))
+
+
+@app.post("/api/artifacts/plan")
+def plan_artifacts(manifest: ArtifactManifest):
+    try:
+        return {"status": "ok", "missing": artifact_store.plan(manifest)}
+    except ValueError as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
+
+
+@app.put("/api/artifacts/chunk")
+async def upload_artifact_chunk(request: Request, sha256: str, offset: int):
+    # 请求体按到达顺序追加写入 partial 文件，接收端内存占用与块大小无关
+    try:
+        path = artifact_store.partial_path(sha256)
+    except ValueError as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=400)
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    if offset != size:  # 上次的块已部分写入，让发送端从服务端的偏移量继续
+        return JSONResponse({"status": "offset_mismatch", "offset": size}, status_code=409)
+    with open(path, "ab") as f:
+        async for data in request.stream():
+            await run_in_threadpool(f.write, data)  # 磁盘写入不阻塞事件循环
+    return {"status": "ok", "offset": os.path.getsize(path)}
+
+
+@app.post("/api/artifacts/commit")
+def commit_artifacts(manifest: ArtifactManifest):
+    try:
+        model_dir = artifact_store.commit(manifest)
+    except ValueError as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=422)
+    print(f"📦 模型已接收: {model_dir}")
+    return {"status": "success", "model_dir": model_dir}
+
+
 signal.signal(signal.SIGINT, handle_shutdown)
 signal.signal(signal.SIGTERM, handle_shutdown)
 
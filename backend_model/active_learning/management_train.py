@@ -1,11 +1,12 @@
 import os
+import time
 import shutil
+import hashlib
 from pathlib import Path
 from datetime import datetime
 from ultralytics.models.yolo.detect import DetectionTrainer
 from ..pre import split_dataset, batch_convert
 import requests
-import zipfile
 from dotenv import load_dotenv
 
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'True'
@@ -14,11 +15,14 @@ annotation_type = 'xml'
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))  # 项目根目录
 
-train_path = os.path.join(BASE_DIR, "datasets/next_train/train/images").replace("\\", "/")
-val_path = os.path.join(BASE_DIR, "datasets/next_train/val/images").replace("\\", "/")
-yaml_content = f"""
-train: {train_path}
-val: {val_path}
+# 训练服务按数据集调度任务，不同数据集的任务可能同时在不同 GPU 上运行，由 TRAIN_DATASET 指定本进程的数据集
+DEFAULT_DATASET = os.getenv("TRAIN_DATASET", "next_train")
+# 增量微调的回放样本：检测端把历史仓库组装出的 replay 训练集打包为 history_replay.zip 上传，解压到 datasets/raw 下；
+# 两端共用存储时可用 REPLAY_DIR 直接指向检测端的 datasets/history/replay
+REPLAY_DIR = os.getenv("REPLAY_DIR", os.path.join(BASE_DIR, "datasets", "raw", "history_replay"))
+yaml_template = """
+train: {train}
+val: {val}
 nc: 6
 names: ['Missing_hole', 'Mouse_bite', 'Open_circuit', 'Short', 'Spur', 'Spurious_copper']
 """
@@ -28,6 +32,15 @@ SERVER_IP_DETECT = os.getenv("VITE_SERVER_IP_DETECT", "127.0.0.1")
 SERVER_PORT_DETECT = os.getenv("VITE_SERVER_PORT_DETECT", "8000")
 
 
+def write_data_yaml(dataset):
+    """生成数据集对应的训练 yaml（active_learning/<dataset>.yaml），返回其路径"""
+    images = os.path.join(BASE_DIR, "datasets", dataset, "{}", "images").replace("\\", "/")
+    data_url = os.path.join(BASE_DIR, "active_learning", f"{dataset}.yaml")
+    with open(data_url, "w") as f:
+        f.write(yaml_template.format(train=images.format("train"), val=images.format("val")))
+    return data_url
+
+
 def find_latest_model_dir(base_dir, prefix='model_'):
     # 获取所有以 prefix 开头的文件夹
     candidates = [
@@ -60,12 +73,11 @@ def train(
         scale_values=0.5,
         shear_values=2.5,
         perspective_values=0.001,
-        mosaic_values=True
+        mosaic_values=True,
+        dataset=DEFAULT_DATASET
 ):
     base_dir = os.path.join(BASE_DIR, "runs", "active_learning")
-    with open(os.path.join(BASE_DIR, "active_learning", "next_train.yaml"), "w") as f:
-        f.write(yaml_content)
-    data_url = os.path.join(BASE_DIR, "active_learning", "next_train.yaml")
+    data_url = write_data_yaml(dataset)
     latest_model = find_latest_model_dir(base_dir)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
@@ -103,7 +115,7 @@ def train(
     """
 
     split_dataset(
-        target_data_set='next_train',
+        target_data_set=dataset,
         annotation_name='labels',
         image_name='images',
         train_ratio=0.8,
@@ -111,32 +123,144 @@ def train(
     )
 
     trainer = DetectionTrainer(overrides=args)
+    trainer.add_callback("on_train_epoch_end", lambda t: notify_training_event(
+        "progress", {"epoch": t.epoch + 1, "epochs": t.epochs}))
+    trainer.add_callback("on_fit_epoch_end", lambda t: notify_training_event(
+        "metrics", {"epoch": t.epoch + 1, **{k: round(float(v), 5) for k, v in t.metrics.items()}}))
     trainer.train()
 
     output_dir = os.path.join(base_dir, args["name"])
-    zip_path = output_dir + ".zip"
-    zip_directory(output_dir, zip_path)
-    upload_zip_to_server(zip_path, f"http://{SERVER_IP_DETECT}:{SERVER_PORT_DETECT}/upload/")
+    upload_model_artifacts(output_dir, f"http://{SERVER_IP_DETECT}:{SERVER_PORT_DETECT}")
+
+    notify_training_complete()
+
+
+# 增量微调在同一进程内跨周期复用的 trainer，按设备索引；模型、优化器和 EMA 常驻内存
+_resident_trainers = {}
+
+
+def incremental_train(device=None, epochs=3, replay_ratio=1.0, dataset=DEFAULT_DATASET, stop_event=None):
+    """
+    增量微调：常驻 trainer 只在第一次调用时完成模型/优化器构建，之后每个周期只扫描新标注数据，
+    并混入从 REPLAY_DIR 随机抽取的回放图片以减轻遗忘；跳过绘图和最终评估，
+    以 time_to_model（从开始到新权重写出的耗时）作为关键指标上报。
+
+    :param device: 训练设备，如 '0' 或 'cpu'，None 表示自动选择
+    :param epochs: 每个周期的训练轮数
+    :param replay_ratio: 每张新图片对应的回放图片数
+    :param dataset: datasets/raw 下的数据集名称
+    :param stop_event: 本任务的 threading.Event，设置后在当前批次结束时停止，不写出权重；
+                       只影响本任务，同一进程中其他设备上的周期不受影响
+    :return: 本周期统计信息（BaseTrainer.finetune 的返回值），取消时含 'stopped': True
+    """
+    if stop_event is not None and stop_event.is_set():
+        return {"stopped": True}
+    base_dir = os.path.join(BASE_DIR, "runs", "active_learning")
+    data_url = write_data_yaml(dataset)
+    name = f"model_incremental_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    split_dataset(
+        target_data_set=dataset,
+        annotation_name='labels',
+        image_name='images',
+        train_ratio=0.8,
+        next_train=True
+    )
+
+    trainer = _resident_trainers.get(device)
+    if trainer is None:
+        trainer = DetectionTrainer(overrides=dict(model=find_latest_model_dir(base_dir), data=data_url, epochs=epochs,
+                                                  batch=2, project=base_dir, name=name, device=device, plots=False))
+        trainer.add_callback("on_train_epoch_end", lambda t: notify_training_event(
+            "progress", {"epoch": t.epoch + 1, "epochs": t.epochs}))
+        _resident_trainers[device] = trainer
+    trainer.stop = False  # 清除上个周期留下的停止标记；本任务的取消由 stop_event 传入，setup 期间的取消也不会丢失
+    stats = trainer.finetune(data=data_url, epochs=epochs, replay=REPLAY_DIR, replay_ratio=replay_ratio,
+                             save_dir=os.path.join(base_dir, name), stop_event=stop_event)
+    if stats.get("stopped"):
+        print("⏹️ 增量微调已取消")
+        return stats
+    print(f"✅ 增量微调完成，新模型耗时 {stats['time_to_model']:.1f} 秒: {stats}")
+    notify_training_event("metrics", {"epoch": stats["epochs"], **stats})
 
+    upload_model_artifacts(os.path.join(base_dir, name), f"http://{SERVER_IP_DETECT}:{SERVER_PORT_DETECT}")
     notify_training_complete()
+    return stats
+
+
+# 检测端只需要可部署的权重和训练元数据，曲线图、train_batch*.jpg、last.pt 等不再传输
+DEPLOY_FILES = ("weights/best.pt", "args.yaml", "results.csv")
 
 
-def zip_directory(source_dir: str, output_zip_path: str):
-    with zipfile.ZipFile(output_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, _, files in os.walk(source_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, source_dir)
-                zipf.write(file_path, arcname)
-    print(f"✅ 模型目录已打包：{output_zip_path}")
+def file_sha256(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            h.update(block)
+    return h.hexdigest()
 
 
-def upload_zip_to_server(zip_path: str, target_url: str):
-    with open(zip_path, 'rb') as f:
-        files = {'file': f}
-        response = requests.post(target_url, files=files)
-        print("📦 上传结果：", response.status_code, response.text)
-        response.raise_for_status()
+def upload_model_artifacts(output_dir: str, server_url: str, chunk_size=8 << 20, retries=5):
+    """
+    按内容哈希分块上传模型产物到检测端（backend_detect /api/artifacts/*）：
+    先提交清单，检测端返回缺失的文件及已接收的偏移量（已有相同 sha256 的权重直接复用），
+    再逐块 PUT，最后 commit 校验并组装模型目录。网络中断时重新协商偏移量后续传。
+
+    :param output_dir: 训练输出目录，目录名即模型名
+    :param server_url: 检测端地址，如 http://127.0.0.1:9000
+    :param chunk_size: 每块字节数
+    :param retries: 最大尝试次数
+    """
+    files = []
+    for rel in DEPLOY_FILES:
+        path = os.path.join(output_dir, rel)
+        if os.path.exists(path):
+            files.append({"path": rel, "size": os.path.getsize(path), "sha256": file_sha256(path)})
+    manifest = {"name": os.path.basename(output_dir), "files": files}
+
+    for attempt in range(retries):
+        try:
+            response = requests.post(f"{server_url}/api/artifacts/plan", json=manifest, timeout=30)
+            response.raise_for_status()
+            missing = response.json()["missing"]
+            sent = 0
+            for item in missing:
+                sent += upload_artifact_file(os.path.join(output_dir, item["path"]), item, server_url, chunk_size)
+            response = requests.post(f"{server_url}/api/artifacts/commit", json=manifest, timeout=300)
+            response.raise_for_status()
+            print(f"📦 模型产物上传完成：{len(files)} 个文件，{len(files) - len(missing)} 个已存在，"
+                  f"本次传输 {sent / 2 ** 20:.1f} MB")
+            return response.json()
+        except requests.RequestException as e:
+            print(f"❌ 上传中断（第 {attempt + 1}/{retries} 次）：{e}")
+            time.sleep(2 ** attempt)
+    raise RuntimeError(f"模型产物上传失败：{output_dir}")
+
+
+def upload_artifact_file(path: str, item: dict, server_url: str, chunk_size: int):
+    """从 item['offset'] 开始逐块上传单个文件，返回本次发送的字节数"""
+    offset, sent = item["offset"], 0
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while chunk := f.read(chunk_size):
+            response = requests.put(f"{server_url}/api/artifacts/chunk", params={"sha256": item["sha256"],
+                                    "offset": offset}, data=chunk, timeout=60)
+            if response.status_code == 409:  # 服务端已接收的字节数与本地不一致，从服务端的偏移量继续
+                offset = response.json()["offset"]
+                f.seek(offset)
+                continue
+            response.raise_for_status()
+            offset = response.json()["offset"]
+            sent += len(chunk)
+    return sent
+
+
+def notify_training_event(channel: str, data: dict):
+    # 训练进度/指标只是展示用，上报失败不影响训练
+    try:
+        requests.post("http://127.0.0.1:8000/api/training-event", json={"channel": channel, "data": data}, timeout=1)
+    except Exception as e:
+        print("❌ 训练事件上报失败：", e)
 
 
 def notify_training_complete():
@@ -146,19 +270,6 @@ def notify_training_complete():
     except Exception as e:
         print("❌ 通知失败：", e)
 
-    # 原 train 函数末尾添加以下内容
-    # 假设训练输出目录如下：
-    # output_dir = os.path.join(BASE_DIR, args["name"])
-    # zip_path = output_dir + ".zip"
-    # zip_directory(output_dir, zip_path)
-    #
-    # # 上传到另一个后端
-    # try:
-    #     upload_zip_to_server(zip_path, "http://192.168.1.100:8000/upload/")
-    #     notify_training_complete()
-    # except Exception as e:
-    #     print("❌ 上传或通知失败：", e)
-
 
 if __name__ == '__main__':
     low_conf_dir = os.path.join(BASE_DIR, "active_learning", "low_conf_images")
@@ -170,6 +281,9 @@ if __name__ == '__main__':
     # history_dir = '../datasets/history'
     # move_labeled_data(low_conf_dir, next_train_dir, history_dir)
     print("数据移动与历史备份完成！")
-    train()
+    if os.getenv("TRAIN_MODE") == "incremental":
+        incremental_train()  # 单次进程内只有一个周期；常驻复用需在训练服务进程内调用（TRAIN_MODE=incremental）
+    else:
+        train()
+        notify_training_complete()
     print("新数据完成训练！")
-    notify_training_complete()
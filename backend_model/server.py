@@ -1,16 +1,30 @@
+import asyncio
+import json
 import subprocess
 import os
+import re
+import time
+import uuid
+import zlib
+import queue
+import struct
+import threading
+from collections import OrderedDict
 import uvicorn
 import signal
 import sys
 from pydantic import BaseModel
 from fastapi.staticfiles import StaticFiles
-from typing import Dict
+from typing import Dict, Optional
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.websockets import WebSocket, WebSocketDisconnect
-from fastapi import FastAPI, UploadFile, File, Request
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 import shutil
 import zipfile
+# 两个服务共用项目根目录下的 common 模块
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.connection_manager import ConnectionManager
 
 app = FastAPI()
 # app.mount("/active_learning", StaticFiles(directory="low_conf_images"), name="low_conf_images")
@@ -40,28 +54,14 @@ low_conf_dir = os.path.join(BASE_DIR, "active_learning", "low_conf_images")
 
 
 # WebSocket 连接管理器
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
-
-
 manager = ConnectionManager()
 
 
 @app.websocket("/ws/training-status")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, channels: str = None):
+    # channels: 逗号分隔的订阅频道（progress,metrics,model），不传则订阅全部
+    channels = [c for c in channels.split(",") if c in ConnectionManager.CHANNELS] if channels else None
+    await manager.connect(websocket, channels)
     print("starting listening on websocket...")
     try:
         while True:
@@ -73,10 +73,29 @@ async def websocket_endpoint(websocket: WebSocket):
 @app.post("/api/training-finished")
 async def training_finished():
     print("@app.post(\"/api/training-finished\")")
-    await manager.broadcast("training_complete")
+    await manager.broadcast("training_complete", channel="model")
     return {"status": "notified"}
 
 
+class TrainingEvent(BaseModel):
+    channel: str
+    data: dict = {}
+
+
+@app.post("/api/training-event")
+async def training_event(event: TrainingEvent):
+    # 训练进程上报的进度/指标，以 JSON {"channel": ..., ...} 推送给订阅了该频道的客户端
+    if event.channel not in ConnectionManager.CHANNELS:
+        return {"status": "error", "message": f"未知频道: {event.channel}"}
+    await manager.broadcast(json.dumps({"channel": event.channel, **event.data}), channel=event.channel)
+    return {"status": "notified", "clients": len(manager.active_connections)}
+
+
+@app.get("/api/ws-stats")
+def websocket_stats():
+    return manager.stats()
+
+
 def handle_shutdown(signum, frame):
     print("\n🚧 正在关闭服务器，停止所有训练进程...")
     for tid, process in training_processes.items():
@@ -115,22 +134,290 @@ class StartDetectRequest(BaseModel):
     model_name: str
 
 
-@app.post("/api/managing-training")
-def managing_training():
+class TrainingScheduler:
+    """
+    训练任务调度器。任务持久化在 jobs_file 中，每个设备（GPU）一个工作线程依次取出排队任务，
+    通过 launch(job, device) 启动训练子进程；同一数据集同时只运行一个任务，
+    排队中的同数据集请求合并为一个任务。任务状态: queued -> running -> finished / failed / cancelled。
+
+    :param jobs_file: 任务持久化文件
+    :param launch: 启动训练子进程的函数，返回 subprocess.Popen
+    :param devices: 设备编号列表，None 时使用 TRAIN_GPUS 环境变量或全部可见 GPU，没有 GPU 时为 ['cpu']
+    :param on_update: 任务状态变化回调，参数为任务 dict，在工作线程或请求线程中调用
+    :param sample_interval: 训练期间 GPU 利用率采样间隔（秒）
+    """
+
+    def __init__(self, jobs_file, launch, devices=None, on_update=None, sample_interval=5.0, max_history=200):
+        self.jobs_file = jobs_file
+        self.launch = launch
+        self.devices = devices or self.detect_devices()
+        self.on_update = on_update
+        self.sample_interval = sample_interval
+        self.max_history = max_history
+        self.jobs = OrderedDict()
+        self._processes = {}
+        self._cond = threading.Condition()
+        self._gpu_info = None
+        self._gpu_lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def detect_devices():
+        if os.getenv("TRAIN_GPUS"):
+            return [d.strip() for d in os.getenv("TRAIN_GPUS").split(",") if d.strip()]
+        import torch
+
+        return [str(i) for i in range(torch.cuda.device_count())] or ["cpu"]
+
+    def _load(self):
+        if not os.path.exists(self.jobs_file):
+            return
+        with open(self.jobs_file, encoding="utf-8") as f:
+            for job in json.load(f):
+                if job["state"] == "running":  # 上次服务退出时正在训练的任务
+                    job.update(state="failed", message="服务重启，训练中断")
+                self.jobs[job["id"]] = job
+
+    def _save(self):
+        finished = [k for k, j in self.jobs.items() if j["state"] not in ("queued", "running")]
+        for job_id in finished[:max(len(finished) - self.max_history, 0)]:
+            del self.jobs[job_id]
+        os.makedirs(os.path.dirname(self.jobs_file), exist_ok=True)
+        tmp = f"{self.jobs_file}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(list(self.jobs.values()), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.jobs_file)
+
+    def _publish(self, job):
+        if self.on_update is not None:
+            self.on_update(dict(job))
+
+    def start(self):
+        if self.devices != ["cpu"]:
+            try:
+                from ultralytics.utils.autodevice import GPUInfo
+
+                self._gpu_info = GPUInfo()
+            except Exception as e:
+                print(f"⚠️ 无法获取 GPU 利用率：{e}")
+        for device in self.devices:
+            threading.Thread(target=self._worker, args=(device,), daemon=True).start()
+        print(f"🧵 训练调度器已启动，设备: {self.devices}，排队任务: {len(self.queued())}")
+
+    def queued(self):
+        return [j for j in self.jobs.values() if j["state"] == "queued"]
+
+    def snapshot(self, job_id=None):
+        with self._cond:
+            if job_id is not None:
+                return dict(self.jobs[job_id]) if job_id in self.jobs else None
+            return [dict(j) for j in self.jobs.values()]
+
+    def submit(self, dataset="next_train"):
+        """提交训练请求，返回 (任务, 是否合并到已排队任务)"""
+        with self._cond:
+            job = next((j for j in self.queued() if j["dataset"] == dataset), None)
+            coalesced = job is not None
+            if coalesced:
+                job["requests"] += 1
+            else:
+                job = {"id": uuid.uuid4().hex, "dataset": dataset, "state": "queued", "requests": 1,
+                       "created": time.time(), "started": None, "finished": None, "wall_time_s": None,
+                       "device": None, "pid": None, "returncode": None, "gpu_util": None, "message": ""}
+                self.jobs[job["id"]] = job
+            self._save()
+            self._cond.notify_all()
+            job = dict(job, position=self.queued().index(job))
+        self._publish(job)
+        return job, coalesced
+
+    def cancel(self, job_id):
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job["state"] == "queued":
+                job.update(state="cancelled", finished=time.time())
+                self._save()
+            elif job["state"] == "running":
+                job["cancel_requested"] = True
+                self._processes[job_id].terminate()  # 工作线程在进程退出后更新状态
+            job = dict(job)
+        self._publish(job)
+        return job
+
+    def _next_job(self):
+        running = {j["dataset"] for j in self.jobs.values() if j["state"] == "running"}
+        return next((j for j in self.queued() if j["dataset"] not in running), None)
+
+    def _worker(self, device):
+        while True:
+            with self._cond:
+                while (job := self._next_job()) is None:
+                    self._cond.wait()
+                job.update(state="running", device=device, started=time.time())
+                try:
+                    process = self.launch(job, device)
+                except Exception as e:
+                    job.update(state="failed", finished=time.time(), message=str(e))
+                    self._save()
+                    self._publish(job)
+                    continue
+                job["pid"] = process.pid
+                self._processes[job["id"]] = process
+                training_processes[job["id"]] = process
+                self._save()
+            print(f"🚀 训练任务 {job['id']} 开始，设备: {device}，PID: {process.pid}")
+            self._publish(job)
+
+            samples = []
+            while process.poll() is None:
+                if (stats := self._device_stats(device)) is not None:
+                    samples.append(stats)
+                try:
+                    process.wait(timeout=self.sample_interval)
+                except subprocess.TimeoutExpired:
+                    pass
+
+            with self._cond:
+                del self._processes[job["id"]]
+                training_processes.pop(job["id"], None)
+                finished = time.time()
+                state = "finished" if process.returncode == 0 else "failed"
+                job.update(state="cancelled" if job.pop("cancel_requested", False) else state, finished=finished,
+                           wall_time_s=round(finished - job["started"], 3), returncode=process.returncode)
+                if samples:
+                    util = [s["utilization"] for s in samples]
+                    job["gpu_util"] = {"mean": round(sum(util) / len(util), 1), "max": max(util),
+                                       "memory_max_mib": max(s["memory_used"] for s in samples),
+                                       "samples": len(samples)}
+                self._save()
+                self._cond.notify_all()  # 同数据集的排队任务可以开始了
+            print(f"🏁 训练任务 {job['id']} {job['state']}，耗时 {job['wall_time_s']:.1f} 秒")
+            self._publish(job)
+
+    def _device_stats(self, device):
+        if self._gpu_info is None or not device.isdigit():
+            return None
+        with self._gpu_lock:
+            self._gpu_info.refresh_stats()
+            return next((s for s in self._gpu_info.gpu_stats if s["index"] == int(device)), None)
+
+
+def launch_training(job, device):
     module_name = "backend_model.active_learning.management_train"
     BASE_DIR_in = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     # 设置 PYTHONPATH 环境变量为项目根目录
     env = os.environ.copy()
     env["PYTHONPATH"] = BASE_DIR_in
+    env["TRAIN_DATASET"] = job["dataset"]  # 不同数据集的任务可能并发运行，各自划分、缓存和训练自己的数据
+    if device != "cpu":  # 子进程只看到分配给它的 GPU，编号与 NVML 一致
+        env["CUDA_DEVICE_ORDER"] = "PCI_BUS_ID"
+        env["CUDA_VISIBLE_DEVICES"] = device
 
     cmd = [
         "python", "-m", module_name
     ]
-    active_process = subprocess.Popen(cmd, env=env)
-    # training_processes[active_process.pid] = active_process
-    print(f"训练进程 (PID: {active_process.pid})")
+    return subprocess.Popen(cmd, env=env)
+
+
+class InProcessTraining:
+    """
+    在训练服务进程的线程中运行增量微调（TRAIN_MODE=incremental），模型和优化器常驻内存、跨训练周期复用。
+    提供与 subprocess.Popen 相同的 pid/poll/wait/terminate 接口供 TrainingScheduler 使用。
+
+    :param device: 训练设备
+    :param dataset: datasets/raw 下的数据集名称
+    """
+
+    def __init__(self, device, dataset):
+        sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+        from backend_model.active_learning import management_train
+
+        self.trainer_module = management_train
+        self.pid = os.getpid()
+        self.returncode = None
+        self._done = threading.Event()
+        self._stop = threading.Event()  # 只取消本任务，其他设备上的增量微调不受影响
+        threading.Thread(target=self._run, args=(device, dataset), daemon=True).start()
+
+    def _run(self, device, dataset):
+        try:
+            stats = self.trainer_module.incremental_train(device=device, dataset=dataset, stop_event=self._stop)
+            self.returncode = 1 if stats.get("stopped") else 0  # 取消的周期没有写出和上传权重
+        except Exception as e:
+            print(f"❌ 增量微调失败：{e}")
+            self.returncode = 1
+        finally:
+            self._done.set()
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise subprocess.TimeoutExpired("incremental_train", timeout)
+        return self.returncode
+
+    def terminate(self):
+        self._stop.set()
+
+
+def launch_incremental_training(job, device):
+    return InProcessTraining(device, job["dataset"])
+
 
-    return {"status": "start training", "pid": active_process.pid}
+def publish_training_job(job):
+    if event_loop is not None:
+        event_loop.call_soon_threadsafe(manager.broadcast_nowait,
+                                        json.dumps({"channel": "progress", "event": "job", **job}), "progress")
+
+
+event_loop = None
+# TRAIN_MODE=incremental 时在本进程内增量微调（模型常驻），否则每个任务启动一个完整训练子进程
+scheduler = TrainingScheduler(os.path.join(BASE_DIR, "runs", "training_jobs.json"),
+                              launch_incremental_training if os.getenv("TRAIN_MODE") == "incremental" else launch_training,
+                              on_update=publish_training_job)
+
+
+@app.on_event("startup")
+async def start_scheduler():
+    global event_loop
+    event_loop = asyncio.get_running_loop()
+    scheduler.start()
+
+
+class TrainingRequest(BaseModel):
+    dataset: str = "next_train"
+
+
+@app.post("/api/managing-training")
+def managing_training(req: Optional[TrainingRequest] = None):
+    # 不再直接启动训练进程，而是提交到调度器排队；排队中的同数据集请求合并为一个任务
+    dataset = (req or TrainingRequest()).dataset
+    if not re.fullmatch(r"[\w-]+", dataset):  # 数据集名称会拼进 datasets/ 下的路径
+        return {"status": "error", "message": f"非法的数据集名称: {dataset}"}
+    job, coalesced = scheduler.submit(dataset)
+    print(f"训练任务 {job['id']} {'已合并' if coalesced else '已排队'}，前面还有 {job['position']} 个任务")
+    return {"status": "coalesced" if coalesced else "queued", "job_id": job["id"], "position": job["position"],
+            "requests": job["requests"]}
+
+
+@app.get("/api/training-jobs")
+def list_training_jobs():
+    return {"devices": scheduler.devices, "jobs": scheduler.snapshot()}
+
+
+@app.get("/api/training-jobs/{job_id}")
+def get_training_job(job_id: str):
+    job = scheduler.snapshot(job_id)
+    return job if job else {"status": "error", "message": f"未找到训练任务: {job_id}"}
+
+
+@app.post("/api/training-jobs/{job_id}/cancel")
+def cancel_training_job(job_id: str):
+    job = scheduler.cancel(job_id)
+    return job if job else {"status": "error", "message": f"未找到训练任务: {job_id}"}
 
 
 @app.get("/api/return_model")
@@ -175,41 +462,268 @@ async def export_data(request: Request):
             f.write("\n".join(item["labels"]))
     return {"status": "success"}
 
-UPLOAD_STATUS = {"done": False}
+class ZipStreamExtractor:
+    """
+    边接收边解压 zip：按顺序解析各成员的本地文件头（local file header），成员数据到齐即写出，
+    读到中央目录即结束。本地文件头中没有大小的 zip（data descriptor / ZIP64）或加密 zip 无法流式解析，
+    此时 supported 为 False，由调用方在接收完成后用 zipfile 整体解压。
+
+    :param extract_dir: 解压目录
+    """
+
+    def __init__(self, extract_dir):
+        self.extract_dir = os.path.abspath(extract_dir)
+        self.extracted = 0
+        self.supported = True
+        self.finished = False
+        self._buf = bytearray()
+        self._member = None  # [文件对象, 剩余压缩字节数, 解压器, 期望 crc, 当前 crc]
+        self._skip = 0  # 目录成员的数据（通常为空的 deflate 流）直接跳过
+
+    def feed(self, data):
+        if not self.supported or self.finished:
+            return
+        self._buf += data
+        while self._step():
+            pass
+
+    def _step(self):
+        if self._skip:
+            n = min(self._skip, len(self._buf))
+            del self._buf[:n]
+            self._skip -= n
+            return n > 0
+        if self._member is not None:
+            return self._write_member()
+        if len(self._buf) < 4:
+            return False
+        signature = bytes(self._buf[:4])
+        if signature != b"PK\x03\x04":
+            if signature in (b"PK\x01\x02", b"PK\x05\x06"):  # 中央目录，所有成员已解压
+                self.finished = True
+            else:
+                self.supported = False
+            return False
+        if len(self._buf) < 30:
+            return False
+        _, _, flag, method, _, _, crc, csize, _, name_len, extra_len = struct.unpack("<IHHHHHIIIHH", self._buf[:30])
+        if len(self._buf) < 30 + name_len + extra_len:
+            return False
+        if flag & 0x09 or csize == 0xFFFFFFFF or method not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            self.supported = False
+            return False
+        name = bytes(self._buf[30:30 + name_len]).decode("utf-8" if flag & 0x800 else "cp437")
+        del self._buf[:30 + name_len + extra_len]
+
+        path = os.path.normpath(os.path.join(self.extract_dir, name))
+        if not path.startswith(self.extract_dir + os.sep):
+            raise ValueError(f"非法的 zip 成员路径: {name}")
+        if name.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+            self._skip = csize
+            return True
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        decompressor = zlib.decompressobj(-15) if method == zipfile.ZIP_DEFLATED else None
+        self._member = [open(path, "wb"), csize, decompressor, crc, 0]
+        return True
+
+    def _write_member(self):
+        f, remaining, decompressor, crc, running_crc = self._member
+        if remaining:
+            if not self._buf:
+                return False
+            chunk = bytes(self._buf[:remaining])
+            del self._buf[:len(chunk)]
+            data = decompressor.decompress(chunk) if decompressor else chunk
+            remaining -= len(chunk)
+        else:
+            data = b""
+        if not remaining and decompressor:
+            data += decompressor.flush()
+        f.write(data)
+        running_crc = zlib.crc32(data, running_crc)
+        self._member[1], self._member[4] = remaining, running_crc
+        if remaining:
+            return True
+        f.close()
+        self._member = None
+        if running_crc != crc:
+            raise ValueError(f"zip 成员 CRC 校验失败: {f.name}")
+        self.extracted += 1
+        return True
+
+    def close(self):
+        if self._member is not None:
+            self._member[0].close()
+            self._member = None
+
+
+class UploadJob:
+    """
+    单次数据集上传任务，在工作线程中把接收到的字节写入 zip 并同时流式解压到临时目录，
+    完成后整体替换解压目录，进度通过 /upload-status/{job_id} 查询。
+
+    :param job_id: 任务 ID
+    :param filename: zip 文件名
+    :param total_bytes: 请求体总字节数（Content-Length），未知时为 None
+    """
+
+    _swap_locks: Dict[str, threading.Lock] = {}  # 解压目录 -> 替换锁，同名数据集的并发任务依次替换
+    _swap_locks_guard = threading.Lock()
+
+    def __init__(self, job_id, filename, total_bytes=None):
+        self.job_id = job_id
+        self.filename = filename
+        self.total_bytes = total_bytes
+        self.bytes_received = 0
+        self.files_extracted = 0
+        self.state = "receiving"  # receiving -> extracting -> done / error
+        self.message = ""
+        self.started = time.time()
+        self.finished = None
+
+    def run(self, chunks: queue.Queue):
+        """:param chunks: 请求体字节块队列，None 表示接收完成，Exception 表示接收失败"""
+        base_dir = os.path.join(BASE_DIR, "datasets", "raw")
+        extract_dir = os.path.join(base_dir, os.path.splitext(self.filename)[0])
+        staging = f"{extract_dir}.{self.job_id}.partial"
+        zip_path = f"{staging}.zip"  # 每个任务独立的 zip，同名并发上传互不覆盖
+        drained = False  # 队列中的结束标记是否已被取出
+        try:
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+            extractor = ZipStreamExtractor(staging)
+            try:
+                with open(zip_path, "wb") as f:
+                    while True:
+                        data = chunks.get()
+                        if data is None or isinstance(data, Exception):
+                            drained = True
+                            if data is None:
+                                break
+                            raise data
+                        self.bytes_received += len(data)
+                        f.write(data)
+                        extractor.feed(data)
+                        self.files_extracted = extractor.extracted
+            finally:
+                extractor.close()
+
+            self.state = "extracting"
+            if not extractor.finished:  # 无法流式解析，接收完成后整体解压
+                print(f"📦 {self.filename} 不支持流式解压，改为整体解压")
+                shutil.rmtree(staging)
+                with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                    zip_ref.extractall(staging)
+                    self.files_extracted = sum(not name.endswith("/") for name in zip_ref.namelist())
+
+            # 先解压到临时目录再整体替换，解压过程中旧数据集保持完整
+            with UploadJob._swap_locks_guard:
+                swap_lock = UploadJob._swap_locks.setdefault(extract_dir, threading.Lock())
+            with swap_lock:
+                trash = None
+                if os.path.exists(extract_dir):
+                    trash = f"{extract_dir}.{self.job_id}.old"
+                    os.replace(extract_dir, trash)
+                os.replace(staging, extract_dir)
+            if trash:
+                shutil.rmtree(trash)
+            self.state = "done"
+            print(f"📁 {self.filename} 已解压 {self.files_extracted} 个文件到: {extract_dir}")
+        except Exception as e:
+            self.state, self.message = "error", str(e)
+            shutil.rmtree(staging, ignore_errors=True)
+            print(f"❌ 上传任务 {self.job_id} 失败：{e}")
+            while not drained:  # 继续消费，避免接收协程阻塞在已满的队列上
+                data = chunks.get()
+                drained = data is None or isinstance(data, Exception)
+        finally:
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
+            self.finished = time.time()
+
+    def status(self):
+        return {
+            "job_id": self.job_id,
+            "filename": self.filename,
+            "state": self.state,
+            "done": self.state == "done",
+            "bytes_received": self.bytes_received,
+            "total_bytes": self.total_bytes,
+            "files_extracted": self.files_extracted,
+            "message": self.message,
+            "elapsed_s": round((self.finished or time.time()) - self.started, 3),
+        }
+
+
+upload_jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+MAX_UPLOAD_JOBS = 100
+
 
 @app.post("/upload/")
-async def upload(file: UploadFile = File(...)):
-    UPLOAD_STATUS["done"] = False  # 上传开始，标记未完成
-    model_base_dir = os.path.join(BASE_DIR, "datasets", "raw")
-    os.makedirs(model_base_dir, exist_ok=True)
-
-    # 保存 zip 文件
-    zip_save_path = os.path.join(model_base_dir, file.filename)
-    with open(zip_save_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    # 解压 zip 文件到指定目录（与 zip 同名的子目录）
-    extract_dir = os.path.join(model_base_dir, os.path.splitext(file.filename)[0])
-    if os.path.exists(extract_dir):
-        shutil.rmtree(extract_dir)
-    os.makedirs(extract_dir, exist_ok=True)
-    print(f"📦 ZIP文件保存至: {zip_save_path}")
-    print(f"📁 解压目标目录: {extract_dir}")
-    with zipfile.ZipFile(zip_save_path, 'r') as zip_ref:
-        print(f"📄 ZIP包含文件: {zip_ref.namelist()}")
-        zip_ref.extractall(extract_dir)
-
-    UPLOAD_STATUS["done"] = True  # 解压完成
+async def upload(request: Request, filename: str = None, job_id: str = None):
+    """
+    上传数据集 zip。请求体可以是 multipart 表单（字段 file，兼容旧客户端）或原始 zip 字节（配合 filename 参数，
+    边接收边解压）。立即在工作线程中处理，返回 job_id，进度通过 /upload-status/{job_id} 查询。
+
+    :param filename: 原始字节上传时的 zip 文件名
+    :param job_id: 调用方预先生成的任务 ID（如 /api/managing-data 返回给前端的 upload_id），不传则自动生成
+    """
+    job_id = job_id or uuid.uuid4().hex
+    if not re.fullmatch(r"[0-9A-Za-z_-]{1,64}", job_id) or job_id in upload_jobs:
+        return {"status": "error", "message": f"非法或重复的 job_id: {job_id}"}
+    content_length = request.headers.get("content-length")
+    job = UploadJob(job_id, None, int(content_length) if content_length else None)
+    chunks = queue.Queue(maxsize=64)  # 有界：解压跟不上时反压到网络接收
+
+    async def put(data):
+        if chunks.full():
+            await run_in_threadpool(chunks.put, data)
+        else:
+            chunks.put_nowait(data)
+
+    form = None
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()  # starlette 已把文件写入临时文件，这里只能在接收完成后解压
+        body = form["file"]
+        filename = body.filename
+    job.filename = os.path.basename(filename or f"{job_id}.zip")
+
+    upload_jobs[job_id] = job
+    while len(upload_jobs) > MAX_UPLOAD_JOBS:
+        upload_jobs.popitem(last=False)
+    threading.Thread(target=job.run, args=(chunks,), daemon=True).start()
+
+    try:
+        if form is not None:
+            while data := await body.read(1 << 20):
+                await put(data)
+            await form.close()
+        else:
+            async for data in request.stream():
+                await put(data)
+        await put(None)
+    except Exception as e:  # 客户端断开等
+        await put(e)
+        return {"status": "error", "job_id": job_id, "message": str(e)}
+
+    return {"status": "accepted", "job_id": job_id, "filename": job.filename}
+
+
+@app.get("/upload-status/{job_id}")
+def get_upload_job_status(job_id: str):
+    job = upload_jobs.get(job_id)
+    if job is None:  # 上传请求尚未到达
+        return {"job_id": job_id, "state": "pending", "done": False}
+    return job.status()
 
-    return {
-        "status": "success",
-        "filename": file.filename,
-        "unzipped_to": extract_dir
-    }
 
 @app.get("/upload-status/")
 def get_upload_status():
-    return {"done": UPLOAD_STATUS["done"]}
+    # 兼容旧前端：返回最近一次上传任务的状态
+    if not upload_jobs:
+        return {"state": "pending", "done": False}
+    return next(reversed(upload_jobs.values())).status()
 
 
 signal.signal(signal.SIGINT, handle_shutdown)
@@ -1,14 +1,17 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import shutil
 import sys
+import threading
 from unittest import mock
 
 from tests import MODEL
 from ultralytics import YOLO
 from ultralytics.cfg import get_cfg
 from ultralytics.engine.exporter import Exporter
+from ultralytics.engine.tuner import Sweeper
 from ultralytics.models.yolo import classify, detect, segment
-from ultralytics.utils import ASSETS, DEFAULT_CFG, WEIGHTS_DIR
+from ultralytics.utils import ASSETS, DEFAULT_CFG, WEIGHTS_DIR, YAML
 
 
 def test_func(*args):  # noqa
@@ -103,6 +106,60 @@ def test_segment():
     raise Exception("Resume test failed!")
 
 
+def test_detect_finetune(tmp_path):
+    """Test incremental fine-tuning cycles that reuse the resident model and optimizer and mix in replay images."""
+    for split, n in ("new", 2), ("history/batch_1", 4):
+        (tmp_path / split / "images").mkdir(parents=True)
+        (tmp_path / split / "labels").mkdir(parents=True)
+        for i in range(n):
+            shutil.copy(ASSETS / "bus.jpg", tmp_path / split / "images" / f"{split[-1]}{i}.jpg")
+            (tmp_path / split / "labels" / f"{split[-1]}{i}.txt").write_text("0 0.5 0.5 0.2 0.3\n")
+    data = {"path": str(tmp_path), "train": "new/images", "val": "new/images", "names": {0: "defect"}}
+    YAML.save(tmp_path / "new.yaml", data)
+    overrides = {"data": str(tmp_path / "new.yaml"), "model": "yolo11n.yaml", "imgsz": 32, "epochs": 1, "batch": 2}
+    trainer = detect.DetectionTrainer(overrides={**overrides, "project": str(tmp_path / "runs")})
+
+    stats = trainer.finetune(replay=tmp_path / "history", replay_ratio=1.0)
+    assert (stats["images"], stats["replay"]) == (2, 2) and trainer.best.exists()
+    model, optimizer = trainer.model, trainer.optimizer
+    stats = trainer.finetune(save_dir=tmp_path / "runs" / "cycle2", replay=[tmp_path / "history"], val=True)
+    assert trainer.model is model and trainer.optimizer is optimizer, "finetune() rebuilt the resident state"
+    assert trainer.best == tmp_path / "runs" / "cycle2" / "weights" / "best.pt" and trainer.best.exists()
+    assert stats["replay"] == 2 and stats["time_to_model"] > 0
+    YOLO(trainer.best)(ASSETS / "bus.jpg", imgsz=32)
+
+    stop = threading.Event()
+    stop.set()  # cancelled before the cycle starts
+    stats = trainer.finetune(save_dir=tmp_path / "runs" / "cycle3", replay=tmp_path / "missing", stop_event=stop)
+    assert stats["stopped"] and stats["replay"] == 0 and not trainer.best.exists()
+
+
+def test_sweeper(tmp_path):
+    """Test a concurrent grid sweep that logs every trial to one table and stops trials at successive-halving rungs."""
+    for split in "images", "labels":
+        (tmp_path / split).mkdir()
+    for i in range(4):
+        shutil.copy(ASSETS / "bus.jpg", tmp_path / "images" / f"{i}.jpg")
+        (tmp_path / "labels" / f"{i}.txt").write_text("0 0.5 0.5 0.2 0.3\n")
+    YAML.save(tmp_path / "data.yaml", {"path": str(tmp_path), "train": "images", "val": "images", "names": {0: "bus"}})
+    args = {"data": str(tmp_path / "data.yaml"), "model": "yolo11n.yaml", "imgsz": 32, "epochs": 3, "batch": 2}
+    sweeper = Sweeper(
+        args={**args, "project": str(tmp_path / "runs"), "cache": "ram", "plots": False, "workers": 0},
+        grid={"lr0": [0.01, 0.001, 0.0001], "mosaic": [1.0]},
+        devices=["cpu"],
+        per_device=3,
+        grace_period=1,
+        eta=2,
+        poll=0.5,
+    )
+    assert sweeper.rungs == [1, 2] and len(sweeper.grid) == 3
+    results = sweeper()
+    assert len(results) == 3 and {r["status"] for r in results} <= {"done", "stopped"}
+    assert all(r["epochs"] <= 3 and (sweeper.tune_dir / r["name"] / "results.csv").exists() for r in results)
+    assert sweeper.sweep_csv.read_text().count("\n") == 4 and len(sweeper.rung_fitness[1]) == 3
+    assert (sweeper.tune_dir / "best_hyperparameters.yaml").exists()
+
+
 def test_classify():
     """Test image classification including training, validation, and prediction phases."""
     overrides = {"data": "imagenet10", "model": "yolo11n-cls.yaml", "imgsz": 32, "epochs": 1, "save": False}
@@ -35,6 +35,16 @@ def test_export_onnx():
     YOLO(file)(SOURCE, imgsz=32)  # exported model inference
 
 
+def test_export_onnx_streams():
+    """Test ONNX Runtime CPU streams split batches across concurrent requests without changing predictions."""
+    file = YOLO(MODEL).export(format="onnx", dynamic=True, imgsz=32)
+    source = [SOURCE] * 3
+    a = YOLO(file)(source, imgsz=32, batch=3, conf=0.001)
+    b = YOLO(file)(source, imgsz=32, batch=3, conf=0.001, streams=2, pipeline=True)
+    for ra, rb in zip(a, b):
+        assert (ra.boxes.data - rb.boxes.data).abs().max() < 1e-4
+
+
 @pytest.mark.skipif(not TORCH_1_13, reason="OpenVINO requires torch>=1.13")
 def test_export_openvino():
     """Test YOLO export to OpenVINO format for model inference compatibility."""
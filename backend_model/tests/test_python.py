@@ -2,6 +2,7 @@
 
 import contextlib
 import csv
+import os
 import urllib
 from copy import copy
 from pathlib import Path
@@ -132,6 +133,89 @@ def test_predict_img(model_name):
     assert len(model(batch, imgsz=32, classes=0)) == len(batch)  # multiple sources in a batch
 
 
+def test_predict_pipeline():
+    """Test that pipelined prediction matches sequential prediction in content and order."""
+    model = YOLO(CFG)
+    source = [SOURCE, ASSETS / "zidane.jpg"] * 3
+    kwargs = dict(imgsz=64, batch=2, conf=0.001)
+    sequential = model(source, **kwargs)
+    pipelined = model(source, pipeline=3, **kwargs)
+    assert [r.path for r in pipelined] == [r.path for r in sequential]
+    for a, b in zip(sequential, pipelined):
+        assert torch.allclose(a.boxes.data, b.boxes.data)
+    stream = model(source, stream=True, pipeline=True, **kwargs)
+    next(stream)
+    stream.close()  # stopping early must release the pipeline threads
+
+
+def test_predict_static_input():
+    """Test that the static_input fast path matches regular preprocessing without allocating per batch."""
+    import tracemalloc
+
+    model = YOLO(CFG)
+    frames = [cv2.imread(str(SOURCE)) for _ in range(3)]
+    model(frames, imgsz=64)
+    predictor = model.predictor
+    ref = predictor.preprocess(frames)
+    predictor.args.static_input = True
+    assert torch.allclose(predictor.preprocess(frames), ref, atol=1e-6)  # allocates buffers
+    tracemalloc.start()
+    for _ in range(3):
+        predictor.preprocess(frames)
+    assert tracemalloc.get_traced_memory()[1] < ref.numel() // 10  # uint8 arrays alone would take ref.numel() bytes
+    tracemalloc.stop()
+    assert torch.allclose(predictor.preprocess(frames[:2]), ref[:2], atol=1e-6)
+    assert len(predictor._static_buffers) == 1  # smaller batches reuse views of the same buffers
+
+    kwargs = dict(imgsz=64, batch=2, conf=0.001)
+    for a, b in zip(model(frames * 2, **kwargs), model(frames * 2, static_input=True, pipeline=True, **kwargs)):
+        assert torch.allclose(a.boxes.data, b.boxes.data, atol=1e-4)
+
+
+def test_predict_batch_results():
+    """Test that BatchResults holds the same detections as per-image Results and only builds them on demand."""
+    model = YOLO(CFG)
+    source = [SOURCE, ASSETS / "zidane.jpg", SOURCE]  # mixed shapes scale boxes per image slice
+    kwargs = dict(imgsz=64, batch=3, conf=0.0, verbose=False)  # verbose output builds Results of every image
+    results = model(source, **kwargs)
+    batches = model(source, batch_results=True, **kwargs)
+    assert len(batches) == 1
+    batch = batches[0]
+    assert len(batch) == 3 and not batch._results and batch.speed["inference"] is not None
+    assert len(batch.data) == sum(len(r.boxes) for r in results) > 0
+    for i, (r, confs, xywhn) in enumerate(zip(results, batch.split(batch.conf), batch.split(batch.xywhn))):
+        assert torch.allclose(batch.boxes(i).data, r.boxes.data, atol=1e-4)
+        assert torch.allclose(confs, r.boxes.conf) and torch.allclose(xywhn, r.boxes.xywhn, atol=1e-5)
+    assert batch[1] is batch[1] and list(batch._results) == [1]  # built on first access, then cached
+    assert batch[-1].path == str(SOURCE) and batch[1].boxes.data.data_ptr() == batch.boxes(1).data.data_ptr()
+    assert [len(r) for r in batch.cpu().numpy()] == [len(r) for r in results]
+
+
+def test_predict_slice():
+    """Test sliced inference tiling, merging of boxes across tile seams and results in full image coordinates."""
+    from ultralytics.utils.ops import merge_sliced_boxes, slice_windows
+
+    windows = slice_windows((1000, 1500), tile=640, overlap=0.2)
+    covered = np.zeros((1000, 1500), dtype=bool)
+    for x1, y1, x2, y2 in windows:
+        assert x2 - x1 == y2 - y1 == 640
+        covered[y1:y2, x1:x2] = True
+    assert covered.all() and len(windows) == 6 and np.all(np.diff(windows[:3, 0]) <= 640 * 0.8)
+    assert slice_windows((300, 200), tile=640).tolist() == [[0, 0, 200, 300]]
+
+    x = torch.tensor([[0, 0, 100, 50, 0.9, 0], [60, 0, 100, 50, 0.8, 0], [60, 0, 100, 50, 0.7, 1]])  # cut at a seam
+    assert merge_sliced_boxes(x, 0.5, mode="nms").tolist() == x[[0, 2]].tolist()
+    assert len(merge_sliced_boxes(x, 0.5, mode="nms", agnostic=True)) == 1
+    fused = merge_sliced_boxes(x, 0.5, mode="wbf")
+    assert fused[0, 4] == 0.9 and 0 < fused[0, 0] < 60 and fused[0, 2] == 100
+
+    im = cv2.imread(str(SOURCE))
+    for merge in "nms", "wbf":
+        r = YOLO(CFG).predict(im, imgsz=64, conf=1e-5, slice=[256, 0.25], slice_merge=merge)[0]
+        assert r.orig_shape == im.shape[:2] and len(r.boxes) <= 300
+        assert (r.boxes.xyxy >= 0).all() and (r.boxes.xyxy[:, [2, 3]] <= torch.tensor(im.shape[1::-1])).all()
+
+
 @pytest.mark.parametrize("model", MODELS)
 def test_predict_visualize(model):
     """Test model prediction methods with 'visualize=True' to generate and display prediction visualizations."""
@@ -358,6 +442,138 @@ def test_data_converter():
     coco80_to_coco91_class()
 
 
+def test_data_label_store(tmp_path):
+    """Test LabelStore columnar labels round-trip through a memory-mapped *.cache.npy and YOLODataset caching."""
+    import pickle
+
+    from ultralytics.data import YOLODataset
+    from ultralytics.data.utils import LabelStore
+
+    rng = np.random.default_rng(0)
+    labels = []
+    for i, n in enumerate([3, 0, 2]):
+        labels.append(
+            {
+                "im_file": f"{i}.jpg",
+                "shape": (480 + i, 640),
+                "cls": rng.integers(0, 3, (n, 1)).astype(np.float32),
+                "bboxes": rng.random((n, 4), dtype=np.float32),
+                "segments": [rng.random((k + 3, 2), dtype=np.float32) for k in range(n)],
+                "keypoints": rng.random((n, 17, 3), dtype=np.float32),
+            }
+        )
+    file = tmp_path / "labels.cache.npy"
+    store = LabelStore.load(file, LabelStore.from_labels(labels).save(file))
+    assert store.file == file and not store.columns["bboxes"].flags.writeable  # read-only memory-mapped view
+    assert len(store) == 3
+    for a, b in zip(labels, store):
+        assert a["im_file"] == b["im_file"] and a["shape"] == b["shape"]
+        for k in "cls", "bboxes", "keypoints":
+            assert np.array_equal(a[k], b[k])
+        assert len(a["segments"]) == len(b["segments"])
+        assert all(np.array_equal(x, y) for x, y in zip(a["segments"], b["segments"]))
+
+    # Lazy class filtering, single_cls and reordering, preserved across pickling
+    store.filter(include_class=[1, 2], single_cls=True)
+    store = pickle.loads(pickle.dumps(store[[2, 0, 1]]))
+    for a, b in zip([labels[i] for i in (2, 0, 1)], store):
+        k = np.isin(a["cls"][:, 0], [1, 2])
+        assert np.array_equal(b["bboxes"], a["bboxes"][k]) and not b["cls"].any()
+        assert len(b["segments"]) == len(b["keypoints"]) == k.sum()
+
+    # YOLODataset writes a columnar cache and memory-maps it on the next run
+    (tmp_path / "images").mkdir()
+    (tmp_path / "labels").mkdir()
+    for i, lb in enumerate(["0 0.5 0.5 0.2 0.3\n1 0.3 0.3 0.1 0.1\n", "1 0.5 0.5 0.4 0.4\n", ""]):
+        Image.open(ASSETS / "bus.jpg").save(tmp_path / "images" / f"{i}.jpg")
+        (tmp_path / "labels" / f"{i}.txt").write_text(lb)
+    data = {"names": {0: "a", 1: "b"}, "channels": 3}
+    for _ in range(2):
+        dataset = YOLODataset(img_path=str(tmp_path / "images"), data=data, augment=False, imgsz=64, classes=[1])
+        assert [len(lb["cls"]) for lb in dataset.labels] == [1, 1, 0]
+        assert dataset[0]["cls"].tolist() == [[1.0]]
+    assert dataset.labels.file == tmp_path / "labels.cache.npy"
+
+
+def test_data_label_cache_incremental(tmp_path, monkeypatch):
+    """Test that label caches only re-verify images whose files were added or changed."""
+    import ultralytics.data.dataset as dataset_module
+    from ultralytics.data import YOLODataset
+    from ultralytics.data.utils import load_dataset_cache_file
+
+    (tmp_path / "images").mkdir()
+    (tmp_path / "labels").mkdir()
+    for i in range(4):
+        Image.open(ASSETS / "bus.jpg").save(tmp_path / "images" / f"{i}.jpg")
+        (tmp_path / "labels" / f"{i}.txt").write_text(f"{i % 2} 0.5 0.5 0.2 0.3\n")
+    data = {"names": {0: "a", 1: "b"}, "channels": 3}
+    YOLODataset(img_path=str(tmp_path / "images"), data=data, augment=False, imgsz=64)
+
+    verified = []
+    verify = dataset_module.verify_image_label
+    monkeypatch.setattr(dataset_module, "verify_image_label", lambda args: verified.append(args[0]) or verify(args))
+    (tmp_path / "images" / "0.jpg").unlink()  # dropped
+    (tmp_path / "labels" / "1.txt").write_text("0 0.5 0.5 0.2 0.3\n1 0.2 0.2 0.1 0.1\n")  # changed
+    Image.open(ASSETS / "zidane.jpg").save(tmp_path / "images" / "4.jpg")  # added, no label
+    dataset = YOLODataset(img_path=str(tmp_path / "images"), data=data, augment=False, imgsz=64)
+    assert sorted(Path(f).name for f in verified) == ["1.jpg", "4.jpg"]
+    assert [lb["cls"].ravel().tolist() for lb in dataset.labels] == [[0.0, 1.0], [0.0], [1.0], []]
+    cache = load_dataset_cache_file(tmp_path / "labels.cache")
+    assert [Path(f).name for f in cache["fingerprints"]] == ["1.jpg", "2.jpg", "3.jpg", "4.jpg"]
+    assert cache["results"] == (3, 1, 0, 0, 4)  # found, missing, empty, corrupt, total
+
+    verified.clear()
+    label = tmp_path / "labels" / "2.txt"
+    mtime = label.stat().st_mtime_ns
+    label.write_text("1 0.5 0.5 0.2 0.3\n")  # relabelled in place, same size so the cache hash is unchanged
+    os.utime(label, ns=(mtime + 10**9, mtime + 10**9))
+    dataset = YOLODataset(img_path=str(tmp_path / "images"), data=data, augment=False, imgsz=64)
+    assert [Path(f).name for f in verified] == ["2.jpg"]
+    assert dataset.labels[1]["cls"].ravel().tolist() == [1.0]
+
+
+def test_data_cache_shm(tmp_path):
+    """Test that cache='shm' serves the same images from one shared-memory arena attached by every dataset copy."""
+    import pickle
+
+    from ultralytics.data import YOLODataset
+
+    (tmp_path / "images").mkdir()
+    for i, f in enumerate(["bus.jpg", "zidane.jpg"]):
+        Image.open(ASSETS / f).save(tmp_path / "images" / f"{i}.jpg")
+    kwargs = dict(img_path=str(tmp_path / "images"), data={"names": {0: "a"}, "channels": 3}, imgsz=96)
+    ref = YOLODataset(**kwargs)
+    dataset = YOLODataset(cache="shm", **kwargs)
+    attached = YOLODataset(cache="shm", **kwargs)  # i.e. another DDP rank on the same node
+    assert attached.arena.name == dataset.arena.name and all(i in dataset.arena for i in range(dataset.ni))
+    for d in dataset, attached, pickle.loads(pickle.dumps(dataset)):
+        for i in range(ref.ni):
+            im, hw0, hw = d.load_image(i)
+            assert np.array_equal(im, ref.load_image(i)[0]) and (hw0, hw) == ref.load_image(i)[1:]
+    im = dataset.load_image(0)[0]
+    im[:] = 0  # in-place augmentation of a loaded image must not reach the arena shared by other processes
+    assert not dataset.arena[0].flags.writeable and np.array_equal(attached.load_image(0)[0], ref.load_image(0)[0])
+
+
+@pytest.mark.parametrize("cache", ["chunked", "chunked:zlib"])
+def test_data_cache_chunked(tmp_path, cache):
+    """Test that chunked disk caches return the same resized images as decoding, also when reloaded from the index."""
+    from ultralytics.data import YOLODataset
+
+    (tmp_path / "images").mkdir()
+    for i, f in enumerate(["bus.jpg", "zidane.jpg"]):
+        Image.open(ASSETS / f).save(tmp_path / "images" / f"{i}.jpg")
+    kwargs = dict(img_path=str(tmp_path / "images"), data={"names": {0: "a"}, "channels": 3}, imgsz=96)
+    ref = YOLODataset(**kwargs)
+    dataset = YOLODataset(cache=cache, **kwargs)
+    reloaded = YOLODataset(cache=cache, **kwargs)
+    assert dataset.chunks.path == tmp_path / "images.96.imcache" and reloaded.chunks.codec == dataset.chunks.codec
+    for d in dataset, reloaded:
+        for i in range(ref.ni):
+            im, hw0, hw = d.load_image(i)
+            assert np.array_equal(im, ref.load_image(i)[0]) and (hw0, hw) == ref.load_image(i)[1:]
+
+
 def test_data_annotator():
     """Test automatic annotation of data using detection and segmentation models."""
     from ultralytics.data.annotator import auto_annotate
@@ -421,6 +637,27 @@ def test_utils_benchmarks():
     ProfileModels(["yolo11n.yaml"], imgsz=32, min_time=1, num_timed_runs=3, num_warmup_runs=1).run()
 
 
+def test_utils_autotune(tmp_path, monkeypatch):
+    """Test that autotune saves a host profile and predict(autotune=True) loads its winner."""
+    from ultralytics.utils import autotune
+
+    monkeypatch.setattr(autotune, "PROFILE_DIR", tmp_path / "profiles")
+    weights = tmp_path / "tiny.pt"
+    YOLO("yolo11n.yaml").save(weights)
+    profile = autotune.autotune(weights, batch_sizes=(1, 2), imgsz=32, candidates=["torchscript"], runs=2, warmup=1)
+    assert {r["name"] for r in profile["results"]} == {"pytorch", "torchscript"}
+    assert all(r["parity"] for r in profile["results"])  # TorchScript traces the same model
+    assert autotune.load_profile(weights, 64) is None  # tuned at another image size
+    winner = autotune.load_profile(weights, 32)
+    if winner is None:
+        assert profile["winner"]["name"] == "pytorch"
+    else:
+        assert winner["name"] == "torchscript"
+        model = YOLO(weights)
+        model.predict(SOURCE, imgsz=32, autotune=True)
+        assert model.predictor.model.jit
+
+
 def test_utils_torchutils():
     """Test Torch utility functions including profiling and FLOP calculations."""
     from ultralytics.nn.modules.conv import Conv
@@ -463,6 +700,31 @@ def test_utils_ops():
     torch.allclose(boxes, xyxyxyxy2xywhr(xywhr2xyxyxyxy(boxes)), rtol=1e-3)
 
 
+@pytest.mark.parametrize("n", [20, 2100])  # single merged NMS call and per-image fallback
+def test_utils_ops_batched_nms(n):
+    """Test that batched NMS matches the per-image NMS loop, including padded outputs and kept indices."""
+    from ultralytics.utils.ops import batched_non_max_suppression, non_max_suppression
+
+    torch.manual_seed(0)
+    preds = torch.rand(4, 4 + 6, n)  # (batch, xywh + classes, anchors)
+    preds[:, :2] *= 640
+    preds[:, 2:4] *= 100
+    for kwargs in ({}, {"agnostic": True}, {"classes": [0, 2]}, {"max_det": 5}, {"max_nms": 50}):
+        expected = non_max_suppression(preds.clone(), 0.5, 0.5, **kwargs)
+        output = batched_non_max_suppression(preds.clone(), 0.5, 0.5, **kwargs)
+        for a, b in zip(expected, output):
+            assert torch.allclose(torch.unique(a, dim=0), torch.unique(b, dim=0))
+
+    expected, idxs = non_max_suppression(preds.clone(), 0.5, 0.5, return_idxs=True)
+    output, counts, keepi = batched_non_max_suppression(preds.clone(), 0.5, 0.5, padded=True, return_idxs=True)
+    assert output.shape == (4, 300, 6)
+    assert counts.tolist() == [len(x) for x in expected]
+    for i, c in enumerate(counts.tolist()):
+        assert torch.allclose(torch.unique(output[i, :c], dim=0), torch.unique(expected[i], dim=0))
+        assert sorted(keepi[i, :c].tolist()) == sorted(idxs[i].tolist())
+        assert not output[i, c:].any() and (keepi[i, c:] == -1).all()
+
+
 def test_utils_files():
     """Test file handling utilities including file age, date, and paths with spaces."""
     from ultralytics.utils.files import file_age, file_date, get_latest_run, spaces_in_path
@@ -580,6 +842,47 @@ def test_classify_transforms_train(image, auto_augment, erasing, force_color_jit
     assert transformed_image.dtype == torch.float32
 
 
+@pytest.mark.parametrize("perspective", [0.0, 0.0005])
+def test_batch_augment_bboxes(perspective):
+    """Test that BatchAugment transforms and filters boxes like RandomPerspective for the same matrices."""
+    from ultralytics.data.augment import BatchAugment, RandomPerspective
+    from ultralytics.utils.instance import Instances
+    from ultralytics.utils.ops import xywh2xyxy
+
+    b, h, w = 4, 96, 128
+    augment = BatchAugment(degrees=30, scale=0.5, shear=10, perspective=perspective, hgain=0, sgain=0, vgain=0)
+    augment.fliplr = 0.0
+    M, s = augment.affine_matrices(b, h, w)
+    augment.affine_matrices = lambda *args, **kwargs: (M, s)
+    xywh = torch.cat((torch.rand(40, 2) * 0.8 + 0.1, torch.rand(40, 2) * 0.3 + 0.01), 1)
+    batch_idx = torch.arange(40) % b
+    cls = torch.arange(40, dtype=torch.float32)[:, None]  # unique to match kept boxes
+    batch = augment({"img": torch.rand(b, 3, h, w), "bboxes": xywh, "cls": cls, "batch_idx": batch_idx.float()})
+
+    perspective_transform = RandomPerspective(perspective=perspective)
+    for i in range(b):
+        j = batch_idx == i
+        boxes = (xywh2xyxy(xywh[j]) * torch.tensor([w, h, w, h])).numpy()
+        assert np.allclose(
+            augment.apply_bboxes(torch.from_numpy(boxes), M, torch.full((len(boxes),), i)).numpy(),
+            perspective_transform.apply_bboxes(boxes, M[i].numpy()),
+            atol=1e-3,
+        )
+        perspective_transform.affine_transform = lambda img, border: (img, M[i].numpy(), s[i].item())
+        labels = perspective_transform(
+            {
+                "img": np.zeros((h, w, 3), dtype=np.uint8),
+                "cls": cls[j].numpy(),
+                "instances": Instances(boxes, np.zeros((0, 1000, 2)), bbox_format="xyxy", normalized=False),
+            }
+        )
+        k = batch["batch_idx"] == i
+        assert np.array_equal(batch["cls"][k].numpy(), labels["cls"])
+        labels["instances"].convert_bbox("xywh")
+        labels["instances"].normalize(w, h)
+        assert np.allclose(batch["bboxes"][k].numpy(), labels["instances"].bboxes, atol=1e-4)
+
+
 @pytest.mark.slow
 @pytest.mark.skipif(not ONLINE, reason="environment is offline")
 def test_model_tune():
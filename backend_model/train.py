@@ -1,7 +1,7 @@
 import os
 
 from ultralytics import YOLO
-from ultralytics.models.yolo.detect import DetectionTrainer
+from ultralytics.engine.tuner import Sweeper
 from pre import split_dataset, batch_convert
 import itertools
 
@@ -108,26 +108,19 @@ if __name__ == '__main__':
     param_list = Parameter_settings()
     #model = YOLO("./yolo11m.pt")
     #model = YOLO('./yolov8m.pt')
-    for param in param_list:
-
-        args = dict(
-            model="./yolo11m",
-            data="./BJ-PCB-data.yaml",
-            epochs=100,
-            batch=8,
-            project='runs/test',
-            name="lack_Missing_hole_20250710_201220",
-            hsv_h=param['hsv_h'],
-            hsv_s=param['hsv_s'],
-            hsv_v=param['hsv_v'],
-            degrees=param['degrees'],
-            translate=param['translate'],
-            scale=param['scale'],
-            shear=param['shear'],
-            perspective=param['perspective'],
-            mosaic=param['mosaic'],
-            conf=param['conf'],
-            iou=param['iou']
-        )
-        trainer = DetectionTrainer(overrides=args)
-        trainer.train()
+
+    # 所有参数组合并行训练：多块 GPU 各跑一组，显存足够时同一块 GPU 上叠加多组（per_device='auto'）。
+    # 数据集只检查、缓存一次（cache='ram' 时缓存到共享内存，各组训练直接挂载），
+    # 按 ASHA 在第 3、9、27、81 轮比较各组的 fitness，只保留前 1/3 继续训练，
+    # 所有结果汇总在 runs/test/<name>/sweep_results.csv
+    args = dict(
+        model="./yolo11m",
+        data="./BJ-PCB-data.yaml",
+        epochs=100,
+        batch=8,
+        cache="ram",
+        project='runs/test',
+        name="lack_Missing_hole_20250710_201220",
+    )
+    sweeper = Sweeper(args=args, grid=param_list, per_device='auto', grace_period=3, eta=3)
+    sweeper()
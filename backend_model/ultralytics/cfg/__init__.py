@@ -196,6 +196,7 @@ CFG_INT_KEYS = frozenset(
         "line_width",
         "nbs",
         "save_period",
+        "streams",
     }
 )
 CFG_BOOL_KEYS = frozenset(
@@ -233,6 +234,10 @@ CFG_BOOL_KEYS = frozenset(
         "nms",
         "profile",
         "multi_scale",
+        "batch_augment",
+        "autotune",
+        "static_input",
+        "batch_results",
     }
 )
 
@@ -16,7 +16,7 @@ from ultralytics.utils import LOGGER, colorstr
 from ultralytics.utils.checks import check_version
 from ultralytics.utils.instance import Instances
 from ultralytics.utils.metrics import bbox_ioa
-from ultralytics.utils.ops import segment2box, xywh2xyxy, xyxyxyxy2xywhr
+from ultralytics.utils.ops import segment2box, xywh2xyxy, xyxy2xywh, xyxyxyxy2xywhr
 from ultralytics.utils.torch_utils import TORCHVISION_0_10, TORCHVISION_0_11, TORCHVISION_0_13
 
 DEFAULT_MEAN = (0.0, 0.0, 0.0)
@@ -541,7 +541,7 @@ class Mosaic(BaseMixTransform):
         self.imgsz = imgsz
         self.border = (-imgsz // 2, -imgsz // 2)  # width, height
         self.n = n
-        self.buffer_enabled = self.dataset.cache != "ram"
+        self.buffer_enabled = self.dataset.cache not in {"ram", "shm"}
 
     def get_indexes(self):
         """
@@ -1633,7 +1633,7 @@ class LetterBox:
         self.stride = stride
         self.center = center  # Put the image in the middle or top-left
 
-    def __call__(self, labels=None, image=None):
+    def __call__(self, labels=None, image=None, out=None):
         """
         Resize and pad an image for object detection, instance segmentation, or pose estimation tasks.
 
@@ -1643,6 +1643,9 @@ class LetterBox:
         Args:
             labels (Dict | None): A dictionary containing image data and associated labels, or empty dict if None.
             image (np.ndarray | None): The input image as a numpy array. If None, the image is taken from 'labels'.
+            out (np.ndarray | None): Preallocated array of the letterboxed shape whose padding is already filled, e.g.
+                from an earlier call on an image of the same shape. The image is resized straight into its interior and
+                `out` is returned, without allocating. Only for images without labels.
 
         Returns:
             (Dict | Tuple): If 'labels' is provided, returns an updated dictionary with the resized and padded image,
@@ -1683,13 +1686,21 @@ class LetterBox:
             dw /= 2  # divide padding into 2 sides
             dh /= 2
 
+        top, bottom = int(round(dh - 0.1)) if self.center else 0, int(round(dh + 0.1))
+        left, right = int(round(dw - 0.1)) if self.center else 0, int(round(dw + 0.1))
+        if out is not None:  # padding is unchanged for same-shape images, only write the interior
+            dst = out[top : top + new_unpad[1], left : left + new_unpad[0]]
+            if shape[::-1] != new_unpad:
+                cv2.resize(img, new_unpad, dst=dst, interpolation=cv2.INTER_LINEAR)
+            else:
+                dst[:] = img
+            return out
+
         if shape[::-1] != new_unpad:  # resize
             img = cv2.resize(img, new_unpad, interpolation=cv2.INTER_LINEAR)
             if img.ndim == 2:
                 img = img[..., None]
 
-        top, bottom = int(round(dh - 0.1)) if self.center else 0, int(round(dh + 0.1))
-        left, right = int(round(dw - 0.1)) if self.center else 0, int(round(dw + 0.1))
         h, w, c = img.shape
         if c == 3:
             img = cv2.copyMakeBorder(img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
@@ -2484,6 +2495,249 @@ class RandomLoadText:
         return labels
 
 
+class BatchAugment:
+    """
+    Apply HSV, flip and random perspective augmentations to whole batches of images on the training device.
+
+    This is the batched counterpart of RandomPerspective, RandomHSV and RandomFlip for detection training. It runs on
+    preprocessed batches of float images in [0, 1] after the DataLoader, so workers only decode, crop and mosaic images
+    while the warps run as one tensor operation per batch. Boxes are transformed with vectorized box math matching
+    RandomPerspective.apply_bboxes(), then clipped and filtered with the same candidate criteria.
+
+    Attributes:
+        degrees (float): Maximum absolute degree range for random rotations.
+        translate (float): Maximum translation as a fraction of the image size.
+        scale (float): Scaling factor range, e.g., scale=0.1 means 0.9-1.1.
+        shear (float): Maximum shear angle in degrees.
+        perspective (float): Perspective distortion factor.
+        hgain (float): Maximum variation for hue, range [0, 1].
+        sgain (float): Maximum variation for saturation, range [0, 1].
+        vgain (float): Maximum variation for value, range [0, 1].
+        flipud (float): Probability of flipping images up-down.
+        fliplr (float): Probability of flipping images left-right.
+        border_value (float): Fill value for areas outside warped images.
+
+    Methods:
+        affine_matrices: Sample one random 3x3 perspective matrix per image.
+        apply_bboxes: Transform bounding boxes of all images with their perspective matrices.
+        warp: Warp images with their perspective matrices.
+        hsv: Apply random HSV gains per image.
+        __call__: Augment a preprocessed batch and its labels.
+
+    Examples:
+        >>> augment = BatchAugment(degrees=10.0, scale=0.5, hgain=0.015, sgain=0.7, vgain=0.4, fliplr=0.5)
+        >>> batch = {"img": torch.rand(8, 3, 640, 640), "bboxes": torch.rand(20, 4) * 0.5 + 0.25}
+        >>> batch.update(cls=torch.zeros(20, 1), batch_idx=torch.randint(0, 8, (20,)).float())
+        >>> batch = augment(batch)
+    """
+
+    def __init__(
+        self,
+        degrees=0.0,
+        translate=0.0,
+        scale=0.5,
+        shear=0.0,
+        perspective=0.0,
+        hgain=0.5,
+        sgain=0.5,
+        vgain=0.5,
+        flipud=0.0,
+        fliplr=0.5,
+        border_value=114 / 255,
+    ):
+        """
+        Initialize BatchAugment with the same ranges as RandomPerspective, RandomHSV and RandomFlip.
+
+        Args:
+            degrees (float): Degree range for random rotations.
+            translate (float): Fraction of total width and height for random translation.
+            scale (float): Scaling factor interval, e.g., a scale factor of 0.5 allows a resize between 50%-150%.
+            shear (float): Shear intensity (angle in degrees).
+            perspective (float): Perspective distortion factor.
+            hgain (float): Maximum variation for hue, range [0, 1].
+            sgain (float): Maximum variation for saturation, range [0, 1].
+            vgain (float): Maximum variation for value, range [0, 1].
+            flipud (float): Probability of flipping images up-down.
+            fliplr (float): Probability of flipping images left-right.
+            border_value (float): Fill value for areas outside warped images, images are in [0, 1].
+        """
+        self.degrees = degrees
+        self.translate = translate
+        self.scale = scale
+        self.shear = shear
+        self.perspective = perspective
+        self.hgain = hgain
+        self.sgain = sgain
+        self.vgain = vgain
+        self.flipud = flipud
+        self.fliplr = fliplr
+        self.border_value = border_value
+
+    def affine_matrices(self, n, h, w, device=None):
+        """
+        Sample one random perspective matrix per image, composed like RandomPerspective.affine_transform().
+
+        Args:
+            n (int): Number of images.
+            h (int): Image height in pixels.
+            w (int): Image width in pixels.
+            device (torch.device, optional): Device of the matrices.
+
+        Returns:
+            M (torch.Tensor): Perspective matrices of shape (n, 3, 3) mapping input to output pixel coordinates.
+            s (torch.Tensor): Scale factors of shape (n,).
+        """
+
+        def uniform(low, high):
+            return torch.rand(n, device=device) * (high - low) + low
+
+        def eye():
+            return torch.eye(3, device=device).repeat(n, 1, 1)
+
+        C = eye()  # center
+        C[:, 0, 2], C[:, 1, 2] = -w / 2, -h / 2
+        P = eye()  # perspective
+        P[:, 2, 0] = uniform(-self.perspective, self.perspective)  # x perspective (about y)
+        P[:, 2, 1] = uniform(-self.perspective, self.perspective)  # y perspective (about x)
+        R = eye()  # rotation and scale, as cv2.getRotationMatrix2D()
+        a = uniform(-self.degrees, self.degrees) * math.pi / 180
+        s = uniform(1 - self.scale, 1 + self.scale)
+        R[:, 0, 0], R[:, 0, 1], R[:, 1, 0], R[:, 1, 1] = s * a.cos(), s * a.sin(), -s * a.sin(), s * a.cos()
+        S = eye()  # shear
+        S[:, 0, 1] = torch.tan(uniform(-self.shear, self.shear) * math.pi / 180)
+        S[:, 1, 0] = torch.tan(uniform(-self.shear, self.shear) * math.pi / 180)
+        T = eye()  # translation
+        T[:, 0, 2] = uniform(0.5 - self.translate, 0.5 + self.translate) * w
+        T[:, 1, 2] = uniform(0.5 - self.translate, 0.5 + self.translate) * h
+        return T @ S @ R @ P @ C, s  # order of operations (right to left) is IMPORTANT
+
+    def apply_bboxes(self, bboxes, M, batch_idx):
+        """
+        Transform bounding boxes with the perspective matrix of their image, as RandomPerspective.apply_bboxes().
+
+        Args:
+            bboxes (torch.Tensor): Bounding boxes in pixel xyxy format with shape (N, 4).
+            M (torch.Tensor): Perspective matrices with shape (B, 3, 3).
+            batch_idx (torch.Tensor): Image index of each box with shape (N,).
+
+        Returns:
+            (torch.Tensor): Bounding boxes of the four transformed corners in xyxy format with shape (N, 4).
+
+        Examples:
+            >>> augment = BatchAugment()
+            >>> bboxes = torch.tensor([[10.0, 10.0, 20.0, 20.0], [30.0, 30.0, 40.0, 40.0]])
+            >>> augment.apply_bboxes(bboxes, torch.eye(3)[None], torch.zeros(2, dtype=torch.long))
+        """
+        n = len(bboxes)
+        if n == 0:
+            return bboxes
+        xy = torch.ones((n, 4, 3), dtype=bboxes.dtype, device=bboxes.device)
+        xy[..., :2] = bboxes[:, [0, 1, 2, 3, 0, 3, 2, 1]].view(n, 4, 2)  # x1y1, x2y2, x1y2, x2y1
+        xy = xy @ M[batch_idx].transpose(1, 2)  # transform
+        xy = xy[..., :2] / xy[..., 2:3] if self.perspective else xy[..., :2]  # perspective rescale or affine
+        return torch.cat((xy.amin(1), xy.amax(1)), 1)
+
+    def warp(self, img, M):
+        """
+        Warp images with their perspective matrices using bilinear sampling, as cv2.warpPerspective().
+
+        Args:
+            img (torch.Tensor): Images with shape (B, C, H, W).
+            M (torch.Tensor): Perspective matrices with shape (B, 3, 3) mapping input to output pixel coordinates.
+
+        Returns:
+            (torch.Tensor): Warped images of the same shape, filled with border_value outside the input images.
+        """
+        b, _, h, w = img.shape
+        y, x = torch.meshgrid(
+            torch.arange(h, device=img.device, dtype=M.dtype),
+            torch.arange(w, device=img.device, dtype=M.dtype),
+            indexing="ij",
+        )
+        xy = torch.stack((x, y, torch.ones_like(x)), -1).view(1, -1, 3) @ torch.linalg.inv(M).transpose(1, 2)
+        xy = xy[..., :2] / xy[..., 2:3]  # output pixel centers in input pixel coordinates
+        grid = (xy + 0.5) / xy.new_tensor([w, h]) * 2 - 1  # to grid_sample coordinates, align_corners=False
+        img = F.grid_sample(img - self.border_value, grid.view(b, h, w, 2).to(img.dtype), align_corners=False)
+        return img + self.border_value
+
+    def hsv(self, img):
+        """
+        Apply random hue, saturation and value gains per image, as RandomHSV on float RGB images in [0, 1].
+
+        Args:
+            img (torch.Tensor): RGB images with shape (B, 3, H, W) and values in [0, 1].
+
+        Returns:
+            (torch.Tensor): Augmented images of the same shape.
+        """
+        eps = 1e-8
+        gains = img.new_tensor([self.hgain, self.sgain, self.vgain])[:, None, None]
+        r = (torch.rand(len(img), 3, 1, 1, device=img.device) * 2 - 1) * gains  # random gains
+        # RGB to HSV
+        v, i = img.max(1)
+        delta = v - img.min(1).values
+        s = delta / (v + eps)
+        rc, gc, bc = ((v[:, None] - img) / (delta[:, None] + eps)).unbind(1)
+        h = torch.where(i == 0, bc - gc, torch.where(i == 1, 2 + rc - bc, 4 + gc - rc)) / 6
+        # Random gains
+        h = (h + r[:, 0]) % 1
+        s = (s * (1 + r[:, 1])).clamp(0, 1)
+        v = (v * (1 + r[:, 2])).clamp(0, 1)
+        # HSV to RGB
+        k = (img.new_tensor([5, 3, 1])[None, :, None, None] + h[:, None] * 6) % 6
+        return v[:, None] - (v * s)[:, None] * torch.minimum(k, 4 - k).clamp(0, 1)
+
+    def __call__(self, batch):
+        """
+        Augment a preprocessed batch with random perspective, HSV and flips, updating its labels.
+
+        Args:
+            batch (dict): Batch with 'img' (B, C, H, W) float images in [0, 1] and 'bboxes' (N, 4) normalized xywh,
+                'cls' (N, 1) and 'batch_idx' (N,) labels.
+
+        Returns:
+            (dict): The batch with augmented images and transformed, clipped and filtered labels.
+        """
+        img = batch["img"]
+        b, c, h, w = img.shape
+        bboxes, batch_idx = batch["bboxes"].to(img.device).clone(), batch["batch_idx"].to(img.device).long()
+
+        # Random perspective
+        M, s = self.affine_matrices(b, h, w, device=img.device)
+        if self.degrees or self.translate or self.scale or self.shear or self.perspective:
+            img = self.warp(img, M)
+            boxes = xywh2xyxy(bboxes * bboxes.new_tensor([w, h, w, h]))
+            new = self.apply_bboxes(boxes, M, batch_idx)
+            new[:, [0, 2]] = new[:, [0, 2]].clamp(0, w)
+            new[:, [1, 3]] = new[:, [1, 3]].clamp(0, h)
+            i = self.box_candidates(box1=(boxes * s[batch_idx, None]).T, box2=new.T)
+            bboxes, batch_idx = xyxy2xywh(new[i]) / bboxes.new_tensor([w, h, w, h]), batch_idx[i]
+            for k in "cls", "batch_idx":
+                batch[k] = batch[k][i.to(batch[k].device)]
+
+        # HSV
+        if c == 3 and (self.hgain or self.sgain or self.vgain):
+            img = self.hsv(img)
+
+        # Flips
+        for p, dim, j in (self.flipud, 2, 1), (self.fliplr, 3, 0):
+            if p > 0:
+                flip = torch.rand(b, device=img.device) < p
+                img = torch.where(flip[:, None, None, None], img.flip(dim), img)
+                bboxes[:, j] = torch.where(flip[batch_idx], 1 - bboxes[:, j], bboxes[:, j])
+
+        batch["img"], batch["bboxes"] = img, bboxes
+        return batch
+
+    @staticmethod
+    def box_candidates(box1, box2, wh_thr=2, ar_thr=100, area_thr=0.1, eps=1e-16):
+        """Return a boolean mask of boxes kept after augmentation, see RandomPerspective.box_candidates()."""
+        w1, h1 = box1[2] - box1[0], box1[3] - box1[1]
+        w2, h2 = box2[2] - box2[0], box2[3] - box2[1]
+        ar = torch.maximum(w2 / (h2 + eps), h2 / (w2 + eps))  # aspect ratio
+        return (w2 > wh_thr) & (h2 > wh_thr) & (w2 * h2 / (w1 * h1 + eps) > area_thr) & (ar < ar_thr)  # candidates
+
+
 def v8_transforms(dataset, imgsz, hyp, stretch=False):
     """
     Apply a series of image transformations for training.
@@ -2508,13 +2762,14 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
         >>> transforms = v8_transforms(dataset, imgsz=640, hyp=hyp)
         >>> augmented_data = transforms(dataset[0])
     """
+    batch_augment = hyp.batch_augment and hyp.task == "detect"  # warps, HSV and flips run in BatchAugment
     mosaic = Mosaic(dataset, imgsz=imgsz, p=hyp.mosaic)
     affine = RandomPerspective(
-        degrees=hyp.degrees,
-        translate=hyp.translate,
-        scale=hyp.scale,
-        shear=hyp.shear,
-        perspective=hyp.perspective,
+        degrees=0.0 if batch_augment else hyp.degrees,
+        translate=hyp.translate,  # random crop, kept in workers with batch_augment
+        scale=0.0 if batch_augment else hyp.scale,
+        shear=0.0 if batch_augment else hyp.shear,
+        perspective=0.0 if batch_augment else hyp.perspective,
         pre_transform=None if stretch else LetterBox(new_shape=(imgsz, imgsz)),
     )
 
@@ -2539,17 +2794,19 @@ def v8_transforms(dataset, imgsz, hyp, stretch=False):
         elif flip_idx and (len(flip_idx) != kpt_shape[0]):
             raise ValueError(f"data.yaml flip_idx={flip_idx} length must be equal to kpt_shape[0]={kpt_shape[0]}")
 
-    return Compose(
+    transforms = Compose(
         [
             pre_transform,
             MixUp(dataset, pre_transform=pre_transform, p=hyp.mixup),
             CutMix(dataset, pre_transform=pre_transform, p=hyp.cutmix),
             Albumentations(p=1.0),
-            RandomHSV(hgain=hyp.hsv_h, sgain=hyp.hsv_s, vgain=hyp.hsv_v),
-            RandomFlip(direction="vertical", p=hyp.flipud, flip_idx=flip_idx),
-            RandomFlip(direction="horizontal", p=hyp.fliplr, flip_idx=flip_idx),
         ]
-    )  # transforms
+    )
+    if not batch_augment:
+        transforms.append(RandomHSV(hgain=hyp.hsv_h, sgain=hyp.hsv_s, vgain=hyp.hsv_v))
+        transforms.append(RandomFlip(direction="vertical", p=hyp.flipud, flip_idx=flip_idx))
+        transforms.append(RandomFlip(direction="horizontal", p=hyp.fliplr, flip_idx=flip_idx))
+    return transforms
 
 
 # Classification augmentations -----------------------------------------------------------------------------------------
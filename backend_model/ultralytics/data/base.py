@@ -1,9 +1,12 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
 import glob
+import hashlib
+import inspect
 import math
 import os
 import random
+from collections import deque
 from copy import deepcopy
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
@@ -11,10 +14,21 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
+from PIL import Image
 from torch.utils.data import Dataset
 
-from ultralytics.data.utils import FORMATS_HELP_MSG, HELP_URL, IMG_FORMATS, check_file_speeds
-from ultralytics.utils import DEFAULT_CFG, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
+from ultralytics.data.utils import (
+    FORMATS_HELP_MSG,
+    ChunkedImageCache,
+    HELP_URL,
+    IMG_FORMATS,
+    LabelStore,
+    SharedImageArena,
+    check_file_speeds,
+    exif_size,
+    get_hash,
+)
+from ultralytics.utils import DEFAULT_CFG, LINUX, LOCAL_RANK, LOGGER, NUM_THREADS, TQDM
 from ultralytics.utils.patches import imread
 
 
@@ -35,19 +49,21 @@ class BaseDataset(Dataset):
         channels (int): Number of channels in the images (1 for grayscale, 3 for RGB).
         cv2_flag (int): OpenCV flag for reading images.
         im_files (List[str]): List of image file paths.
-        labels (List[Dict]): List of label data dictionaries.
+        labels (List[Dict] | LabelStore): List of label data dictionaries.
         ni (int): Number of images in the dataset.
         rect (bool): Whether to use rectangular training.
         batch_size (int): Size of batches.
         stride (int): Stride used in the model.
         pad (float): Padding value.
-        buffer (list): Buffer for mosaic images.
+        buffer (deque): Buffer for mosaic images.
         max_buffer_length (int): Maximum buffer size.
         ims (list): List of loaded images.
         im_hw0 (list): List of original image dimensions (h, w).
         im_hw (list): List of resized image dimensions (h, w).
         npy_files (List[Path]): List of numpy file paths.
-        cache (str): Cache images to RAM or disk during training.
+        arena (SharedImageArena | None): Shared-memory arena of cached images for cache='shm'.
+        chunks (ChunkedImageCache | None): Chunked on-disk cache of resized images for cache='chunked'.
+        cache (str): Cache images to RAM, shared memory or disk during training.
         transforms (callable): Image transformation function.
         batch_shapes (np.ndarray): Batch shapes for rectangular training.
         batch (np.ndarray): Batch index of each image.
@@ -58,6 +74,8 @@ class BaseDataset(Dataset):
         load_image: Load an image from the dataset.
         cache_images: Cache images to memory or disk.
         cache_images_to_disk: Save an image as an *.npy file for faster loading.
+        cache_images_to_shm: Cache images into a shared-memory arena shared by all processes on the node.
+        get_image_shapes: Read original and resized image shapes from image headers.
         check_cache_disk: Check image caching requirements vs available disk space.
         check_cache_ram: Check image caching requirements vs available memory.
         set_rectangle: Set the shape of bounding boxes as rectangles.
@@ -90,7 +108,8 @@ class BaseDataset(Dataset):
         Args:
             img_path (str | List[str]): Path to the folder containing images or list of image paths.
             imgsz (int): Image size for resizing.
-            cache (bool | str): Cache images to RAM or disk during training.
+            cache (bool | str): Cache images to RAM, shared memory ('shm') or disk during training. 'chunked' caches
+                resized images to disk in large chunk files, 'chunked:lz4', 'chunked:zstd' or 'chunked:zlib' compressed.
             augment (bool): If True, data augmentation is applied.
             hyp (Dict[str, Any]): Hyperparameters to apply data augmentation.
             prefix (str): Prefix to print in log messages.
@@ -125,22 +144,29 @@ class BaseDataset(Dataset):
             self.set_rectangle()
 
         # Buffer thread for mosaic images
-        self.buffer = []  # buffer size = batch size
+        self.buffer = deque()  # buffer size = batch size
         self.max_buffer_length = min((self.ni, self.batch_size * 8, 1000)) if self.augment else 0
 
-        # Cache images (options are cache = True, False, None, "ram", "disk")
+        # Cache images (options are cache = True, False, None, "ram", "shm", "disk", "chunked[:lz4|:zstd|:zlib]")
         self.ims, self.im_hw0, self.im_hw = [None] * self.ni, [None] * self.ni, [None] * self.ni
         self.npy_files = [Path(f).with_suffix(".npy") for f in self.im_files]
+        self.arena = None
+        self.chunks = None
         self.cache = cache.lower() if isinstance(cache, str) else "ram" if cache is True else None
+        self.cache, _, self.cache_codec = self.cache.partition(":") if self.cache else (self.cache, "", "")
+        if self.cache in {"ram", "shm"} and hyp.deterministic:
+            LOGGER.warning(
+                f"cache='{self.cache}' may produce non-deterministic training results. "
+                "Consider cache='disk' as a deterministic alternative if your disk space allows."
+            )
         if self.cache == "ram" and self.check_cache_ram():
-            if hyp.deterministic:
-                LOGGER.warning(
-                    "cache='ram' may produce non-deterministic training results. "
-                    "Consider cache='disk' as a deterministic alternative if your disk space allows."
-                )
             self.cache_images()
+        elif self.cache == "shm":
+            self.cache_images_to_shm()
         elif self.cache == "disk" and self.check_cache_disk():
             self.cache_images()
+        elif self.cache == "chunked":
+            self.cache_images_to_chunks()
 
         # Transforms
         self.transforms = self.build_transforms(hyp=hyp)
@@ -190,6 +216,9 @@ class BaseDataset(Dataset):
         Args:
             include_class (List[int], optional): List of classes to include. If None, all classes are included.
         """
+        if isinstance(self.labels, LabelStore):  # filtered lazily on access
+            self.labels.filter(include_class, self.single_cls)
+            return
         include_class_array = np.array(include_class).reshape(1, -1)
         for i in range(len(self.labels)):
             if include_class is not None:
@@ -223,37 +252,43 @@ class BaseDataset(Dataset):
         Raises:
             FileNotFoundError: If the image file is not found.
         """
+        if self.arena is not None and i in self.arena:  # copy of the read-only shared view, augmentations write in place
+            im = self.arena[i].copy()
+            return im, tuple(int(x) for x in self.arena.shapes[i, :2]), im.shape[:2]
         im, f, fn = self.ims[i], self.im_files[i], self.npy_files[i]
         if im is None:  # not cached in RAM
-            if fn.exists():  # load npy
-                try:
-                    im = np.load(fn)
-                except Exception as e:
-                    LOGGER.warning(f"{self.prefix}Removing corrupt *.npy image file {fn} due to: {e}")
-                    Path(fn).unlink(missing_ok=True)
+            if self.chunks is not None and i in self.chunks:  # already resized in the chunked disk cache
+                im, (h0, w0) = self.chunks[i], self.chunks.original_shape(i)
+            else:
+                if fn.exists():  # load npy
+                    try:
+                        im = np.load(fn)
+                    except Exception as e:
+                        LOGGER.warning(f"{self.prefix}Removing corrupt *.npy image file {fn} due to: {e}")
+                        Path(fn).unlink(missing_ok=True)
+                        im = imread(f, flags=self.cv2_flag)  # BGR
+                else:  # read image
                     im = imread(f, flags=self.cv2_flag)  # BGR
-            else:  # read image
-                im = imread(f, flags=self.cv2_flag)  # BGR
-            if im is None:
-                raise FileNotFoundError(f"Image Not Found {f}")
-
-            h0, w0 = im.shape[:2]  # orig hw
-            if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
-                r = self.imgsz / max(h0, w0)  # ratio
-                if r != 1:  # if sizes are not equal
-                    w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
-                    im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
-            elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
-                im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
-            if im.ndim == 2:
-                im = im[..., None]
-
-            # Add to buffer if training with augmentations
-            if self.augment:
+                if im is None:
+                    raise FileNotFoundError(f"Image Not Found {f}")
+
+                h0, w0 = im.shape[:2]  # orig hw
+                if rect_mode:  # resize long side to imgsz while maintaining aspect ratio
+                    r = self.imgsz / max(h0, w0)  # ratio
+                    if r != 1:  # if sizes are not equal
+                        w, h = (min(math.ceil(w0 * r), self.imgsz), min(math.ceil(h0 * r), self.imgsz))
+                        im = cv2.resize(im, (w, h), interpolation=cv2.INTER_LINEAR)
+                elif not (h0 == w0 == self.imgsz):  # resize by stretching image to square imgsz
+                    im = cv2.resize(im, (self.imgsz, self.imgsz), interpolation=cv2.INTER_LINEAR)
+                if im.ndim == 2:
+                    im = im[..., None]
+
+            # Add to buffer if training with augmentations, mosaic samples the whole dataset with cache='shm'
+            if self.augment and self.cache != "shm":
                 self.ims[i], self.im_hw0[i], self.im_hw[i] = im, (h0, w0), im.shape[:2]  # im, hw_original, hw_resized
                 self.buffer.append(i)
                 if 1 < len(self.buffer) >= self.max_buffer_length:  # prevent empty buffer
-                    j = self.buffer.pop(0)
+                    j = self.buffer.popleft()
                     if self.cache != "ram":
                         self.ims[j], self.im_hw0[j], self.im_hw[j] = None, None, None
 
@@ -277,18 +312,112 @@ class BaseDataset(Dataset):
                 pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB {storage})"
             pbar.close()
 
+    def get_image_shapes(self, rect_mode: bool = True) -> np.ndarray:
+        """
+        Read the original and load_image() resized shape of every image from image headers without decoding.
+
+        Args:
+            rect_mode (bool): Whether load_image() resizes the long side to imgsz, otherwise images are stretched square.
+
+        Returns:
+            (np.ndarray): Shapes (h0, w0, h, w, c) of shape (ni, 5), all -1 for images whose header can not be read.
+        """
+
+        def shape(f):
+            try:
+                with Image.open(f) as im:
+                    w0, h0 = exif_size(im)  # cv2.imread() applies EXIF orientation as well
+            except Exception:
+                return -1, -1, -1, -1, -1
+            r = self.imgsz / max(h0, w0)  # ratio
+            if not rect_mode:
+                h, w = self.imgsz, self.imgsz
+            elif r != 1:
+                h, w = min(math.ceil(h0 * r), self.imgsz), min(math.ceil(w0 * r), self.imgsz)
+            else:
+                h, w = h0, w0
+            return h0, w0, h, w, self.channels
+
+        with ThreadPool(NUM_THREADS) as pool:
+            return np.array(pool.map(shape, self.im_files), dtype=np.int64).reshape(-1, 5)
+
+    def cache_images_to_shm(self) -> None:
+        """
+        Cache resized images into one shared-memory arena with an (offset, shape) index.
+
+        All DataLoader workers and DDP ranks on the node share the same arena instead of each holding a RAM cache, and
+        `load_image` copies images out of its read-only views so augmentations never modify it. The arena is named
+        after the dataset files and image size, so ranks that build the dataset after the first one attach to its arena
+        instead of decoding images again. Images whose decoded shape differs from their header are kept in RAM instead.
+        """
+        rect_mode = inspect.signature(self.load_image).parameters["rect_mode"].default  # subclass default
+        shapes = self.get_image_shapes(rect_mode)
+        key = f"{get_hash(self.im_files)}{self.imgsz}{self.channels}{rect_mode}"
+        name = f"yolo_{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+        gb = 1 << 30
+        if arena := SharedImageArena.attach(name, shapes):
+            self.arena = arena
+            LOGGER.info(f"{self.prefix}Attached to shared memory image cache '{name}' ({arena.nbytes / gb:.1f}GB)")
+            return
+        if not self.check_cache_ram(nbytes=SharedImageArena.layout(shapes)[1]):
+            return
+        arena = SharedImageArena.create(name, shapes)
+        b = 0  # bytes of cached images
+        with ThreadPool(NUM_THREADS) as pool:
+            results = pool.imap(self.load_image, range(self.ni))
+            pbar = TQDM(enumerate(results), total=self.ni, disable=LOCAL_RANK > 0)
+            for i, (im, hw0, hw) in pbar:
+                if not arena.write(i, im):  # header shape mismatch, keep in RAM
+                    self.ims[i], self.im_hw0[i], self.im_hw[i] = im, hw0, hw
+                b += im.nbytes
+                pbar.desc = f"{self.prefix}Caching images ({b / gb:.1f}GB shared memory)"
+            pbar.close()
+        arena.set_ready()
+        self.arena = arena
+
+    def cache_images_to_chunks(self) -> None:
+        """
+        Cache resized images to disk in a few large chunk files with an index, optionally compressed.
+
+        The cache is written next to the image directory as '<dir>.<imgsz>.imcache' and keyed by the dataset files,
+        image size, channels, resize mode and codec, so it is rebuilt only when one of these changes. Unlike
+        cache='disk' images are stored already resized, and each is read back with a single positional read.
+        """
+        codec = self.cache_codec or None
+        rect_mode = inspect.signature(self.load_image).parameters["rect_mode"].default  # subclass default
+        im_dir = Path(self.im_files[0]).parent
+        path = im_dir.with_name(f"{im_dir.name}.{self.imgsz}.imcache")
+        key = get_hash(self.im_files) + f"{self.imgsz}{self.channels}{rect_mode}{codec}"
+        gb = 1 << 30
+        if chunks := ChunkedImageCache.load(path, key):
+            self.chunks = chunks
+            LOGGER.info(f"{self.prefix}Using image cache {path} ({chunks.nbytes / gb:.1f}GB Disk)")
+            return
+        shapes = self.get_image_shapes(rect_mode)
+        nbytes = int(np.prod(shapes[:, 2:], axis=1).clip(0).sum())  # uncompressed size, upper bound for codecs
+        if not self.check_cache_disk(nbytes=nbytes, path=path.parent):
+            return
+        self.chunks = ChunkedImageCache.build(
+            path, key, lambda i: self.load_image(i, rect_mode), self.ni, codec=codec, prefix=self.prefix
+        )
+
     def cache_images_to_disk(self, i: int) -> None:
         """Save an image as an *.npy file for faster loading."""
         f = self.npy_files[i]
         if not f.exists():
             np.save(f.as_posix(), imread(self.im_files[i]), allow_pickle=False)
 
-    def check_cache_disk(self, safety_margin: float = 0.5) -> bool:
+    def check_cache_disk(
+        self, safety_margin: float = 0.5, nbytes: Optional[int] = None, path: Optional[Path] = None
+    ) -> bool:
         """
         Check if there's enough disk space for caching images.
 
         Args:
             safety_margin (float): Safety margin factor for disk space calculation.
+            nbytes (int, optional): Exact cache size in bytes, e.g. of a chunked image cache. If None, the size is
+                extrapolated from 30 random images.
+            path (Path, optional): Directory the cache is written to, defaults to the directory of the first image.
 
         Returns:
             (bool): True if there's enough disk space, False otherwise.
@@ -296,19 +425,27 @@ class BaseDataset(Dataset):
         import shutil
 
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
-        n = min(self.ni, 30)  # extrapolate from 30 random images
-        for _ in range(n):
-            im_file = random.choice(self.im_files)
-            im = imread(im_file)
-            if im is None:
-                continue
-            b += im.nbytes
-            if not os.access(Path(im_file).parent, os.W_OK):
+        path = path or Path(self.im_files[0]).parent
+        if nbytes is None:
+            n = min(self.ni, 30)  # extrapolate from 30 random images
+            for _ in range(n):
+                im_file = random.choice(self.im_files)
+                im = imread(im_file)
+                if im is None:
+                    continue
+                b += im.nbytes
+                if not os.access(Path(im_file).parent, os.W_OK):
+                    self.cache = None
+                    LOGGER.warning(f"{self.prefix}Skipping caching images to disk, directory not writeable")
+                    return False
+            disk_required = b * self.ni / n * (1 + safety_margin)  # bytes required to cache dataset to disk
+        else:
+            if not os.access(path, os.W_OK):
                 self.cache = None
                 LOGGER.warning(f"{self.prefix}Skipping caching images to disk, directory not writeable")
                 return False
-        disk_required = b * self.ni / n * (1 + safety_margin)  # bytes required to cache dataset to disk
-        total, used, free = shutil.disk_usage(Path(self.im_files[0]).parent)
+            disk_required = nbytes * (1 + safety_margin)
+        total, used, free = shutil.disk_usage(path)
         if disk_required > free:
             self.cache = None
             LOGGER.warning(
@@ -319,32 +456,41 @@ class BaseDataset(Dataset):
             return False
         return True
 
-    def check_cache_ram(self, safety_margin: float = 0.5) -> bool:
+    def check_cache_ram(self, safety_margin: float = 0.5, nbytes: Optional[int] = None) -> bool:
         """
         Check if there's enough RAM for caching images.
 
         Args:
             safety_margin (float): Safety margin factor for RAM calculation.
+            nbytes (int, optional): Exact cache size in bytes, e.g. of a shared-memory arena. If None, the size is
+                extrapolated from 30 random images.
 
         Returns:
             (bool): True if there's enough RAM, False otherwise.
         """
         b, gb = 0, 1 << 30  # bytes of cached images, bytes per gigabytes
-        n = min(self.ni, 30)  # extrapolate from 30 random images
-        for _ in range(n):
-            im = imread(random.choice(self.im_files))  # sample image
-            if im is None:
-                continue
-            ratio = self.imgsz / max(im.shape[0], im.shape[1])  # max(h, w)  # ratio
-            b += im.nbytes * ratio**2
-        mem_required = b * self.ni / n * (1 + safety_margin)  # GB required to cache dataset into RAM
+        if nbytes is None:
+            n = min(self.ni, 30)  # extrapolate from 30 random images
+            for _ in range(n):
+                im = imread(random.choice(self.im_files))  # sample image
+                if im is None:
+                    continue
+                ratio = self.imgsz / max(im.shape[0], im.shape[1])  # max(h, w)  # ratio
+                b += im.nbytes * ratio**2
+            mem_required = b * self.ni / n * (1 + safety_margin)  # GB required to cache dataset into RAM
+        else:
+            mem_required = nbytes  # exact size, no margin needed
         mem = __import__("psutil").virtual_memory()
-        if mem_required > mem.available:
+        available, total = mem.available, mem.total
+        if self.cache == "shm" and LINUX and os.path.isdir("/dev/shm"):  # shared memory is limited by /dev/shm size
+            shm = __import__("shutil").disk_usage("/dev/shm")
+            available, total = min(available, shm.free), min(total, shm.total)
+        if mem_required > available:
             self.cache = None
             LOGGER.warning(
                 f"{self.prefix}{mem_required / gb:.1f}GB RAM required to cache images "
-                f"with {int(safety_margin * 100)}% safety margin but only "
-                f"{mem.available / gb:.1f}/{mem.total / gb:.1f}GB available, not caching images"
+                f"{'' if nbytes else f'with {int(safety_margin * 100)}% safety margin '}but only "
+                f"{available / gb:.1f}/{total / gb:.1f}GB available, not caching images"
             )
             return False
         return True
@@ -358,7 +504,7 @@ class BaseDataset(Dataset):
         ar = s[:, 0] / s[:, 1]  # aspect ratio
         irect = ar.argsort()
         self.im_files = [self.im_files[i] for i in irect]
-        self.labels = [self.labels[i] for i in irect]
+        self.labels = self.labels[irect] if isinstance(self.labels, LabelStore) else [self.labels[i] for i in irect]
         ar = ar[irect]
 
         # Set training image shapes
@@ -31,7 +31,9 @@ from .base import BaseDataset
 from .converter import merge_multi_segment
 from .utils import (
     HELP_URL,
+    LabelStore,
     check_file_speeds,
+    get_file_fingerprint,
     get_hash,
     img2label_paths,
     load_dataset_cache_file,
@@ -41,7 +43,7 @@ from .utils import (
 )
 
 # Ultralytics dataset *.cache version, >= 1.0.0 for Ultralytics YOLO models
-DATASET_CACHE_VERSION = "1.0.3"
+DATASET_CACHE_VERSION = "1.1.0"
 
 
 class YOLODataset(BaseDataset):
@@ -87,32 +89,60 @@ class YOLODataset(BaseDataset):
         assert not (self.use_segments and self.use_keypoints), "Can not use both segments and keypoints."
         super().__init__(*args, channels=self.data["channels"], **kwargs)
 
-    def cache_labels(self, path: Path = Path("./labels.cache")) -> Dict:
+    def cache_labels(self, path: Path = Path("./labels.cache"), previous: Optional[Dict] = None) -> Dict:
         """
         Cache dataset labels, check images and read shapes.
 
+        Each image is fingerprinted by its label file path and the (size, mtime) of both files. When a previous cache
+        is given, only images that were added or whose fingerprint changed are verified again, the labels of all other
+        images are reused from it.
+
         Args:
             path (Path): Path where to save the cache file.
+            previous (dict, optional): Previously saved cache to update incrementally.
 
         Returns:
-            (dict): Dictionary containing cached labels and related information.
+            (dict): Dictionary containing cached labels as a columnar LabelStore and related information.
         """
-        x = {"labels": []}
+        x = {"labels": [], "fingerprints": {}}
         nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number missing, found, empty, corrupt, messages
         desc = f"{self.prefix}Scanning {path.parent / path.stem}..."
-        total = len(self.im_files)
         nkpt, ndim = self.data.get("kpt_shape", (0, 0))
         if self.use_keypoints and (nkpt <= 0 or ndim not in {2, 3}):
             raise ValueError(
                 "'kpt_shape' in data.yaml missing or incorrect. Should be a list with [number of "
                 "keypoints, number of dims (2 for x,y or 3 for x,y,visible)], i.e. 'kpt_shape: [17, 3]'"
             )
+
+        # Reuse labels of unchanged images from the previous cache
+        fingerprints = [
+            (lb_file, get_file_fingerprint(im_file), get_file_fingerprint(lb_file))
+            for im_file, lb_file in zip(self.im_files, self.label_files)
+        ]
+        prev_labels = previous["labels"] if previous else []
+        prev_fingerprints = previous.get("fingerprints", {}) if previous else {}
+        prev_index = {f: i for i, f in enumerate(prev_labels.im_files)} if previous else {}
+        labels = [None] * len(self.im_files)
+        todo = []  # indices of images to verify
+        for i, (im_file, fp) in enumerate(zip(self.im_files, fingerprints)):
+            if prev_fingerprints.get(im_file) == fp and im_file in prev_index:
+                labels[i] = prev_labels[prev_index[im_file]]
+                found = fp[2] is not None
+                nf += found
+                nm += not found
+                ne += found and not len(labels[i]["cls"])
+            else:
+                todo.append(i)
+        n_reused = len(self.im_files) - len(todo)
+        n_added = sum(self.im_files[i] not in prev_fingerprints for i in todo)
+        n_dropped = len(set(prev_fingerprints) - set(self.im_files))
+
         with ThreadPool(NUM_THREADS) as pool:
             results = pool.imap(
                 func=verify_image_label,
                 iterable=zip(
-                    self.im_files,
-                    self.label_files,
+                    (self.im_files[i] for i in todo),
+                    (self.label_files[i] for i in todo),
                     repeat(self.prefix),
                     repeat(self.use_keypoints),
                     repeat(len(self.data["names"])),
@@ -121,25 +151,24 @@ class YOLODataset(BaseDataset):
                     repeat(self.single_cls),
                 ),
             )
-            pbar = TQDM(results, desc=desc, total=total)
-            for im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg in pbar:
+            pbar = TQDM(zip(todo, results), desc=desc, total=len(self.im_files), initial=n_reused)
+            for i, (im_file, lb, shape, segments, keypoint, nm_f, nf_f, ne_f, nc_f, msg) in pbar:
                 nm += nm_f
                 nf += nf_f
                 ne += ne_f
                 nc += nc_f
                 if im_file:
-                    x["labels"].append(
-                        {
-                            "im_file": im_file,
-                            "shape": shape,
-                            "cls": lb[:, 0:1],  # n, 1
-                            "bboxes": lb[:, 1:],  # n, 4
-                            "segments": segments,
-                            "keypoints": keypoint,
-                            "normalized": True,
-                            "bbox_format": "xywh",
-                        }
-                    )
+                    labels[i] = {
+                        "im_file": im_file,
+                        "shape": shape,
+                        "cls": lb[:, 0:1],  # n, 1
+                        "bboxes": lb[:, 1:],  # n, 4
+                        "segments": segments,
+                        "keypoints": keypoint,
+                        "normalized": True,
+                        "bbox_format": "xywh",
+                    }
+                    fingerprints[i] = (fingerprints[i][0], get_file_fingerprint(im_file), fingerprints[i][2])
                 if msg:
                     msgs.append(msg)
                 pbar.desc = f"{desc} {nf} images, {nm + ne} backgrounds, {nc} corrupt"
@@ -149,29 +178,60 @@ class YOLODataset(BaseDataset):
             LOGGER.info("\n".join(msgs))
         if nf == 0:
             LOGGER.warning(f"{self.prefix}No labels found in {path}. {HELP_URL}")
+        if previous:
+            LOGGER.info(
+                f"{self.prefix}Updated {path}: {n_reused} reused, {n_added} added, "
+                f"{len(todo) - n_added} changed, {n_dropped} dropped"
+            )
+        x["labels"] = LabelStore.from_labels([lb for lb in labels if lb is not None])
+        x["fingerprints"] = {lb["im_file"]: fp for lb, fp in zip(labels, fingerprints) if lb is not None}  # valid only
         x["hash"] = get_hash(self.label_files + self.im_files)
         x["results"] = nf, nm, ne, nc, len(self.im_files)
         x["msgs"] = msgs  # warnings
         save_dataset_cache_file(self.prefix, path, x, DATASET_CACHE_VERSION)
         return x
 
+    def _fingerprints_changed(self, cache: Dict) -> bool:
+        """
+        Check whether any cached image or label file was modified since the cache was written.
+
+        The cache hash only covers paths and file sizes, so in-place edits that keep the size, e.g. relabelling class 0
+        as class 1, are detected by comparing the stored (size, mtime) fingerprints, at the cost of a stat per file.
+
+        Args:
+            cache (dict): Loaded label cache.
+
+        Returns:
+            (bool): True if a fingerprint of a cached image differs from the files on disk.
+        """
+        fingerprints = cache.get("fingerprints", {})
+        return any(
+            im_file in fingerprints
+            and fingerprints[im_file] != (lb_file, get_file_fingerprint(im_file), get_file_fingerprint(lb_file))
+            for im_file, lb_file in zip(self.im_files, self.label_files)
+        )
+
     def get_labels(self) -> List[Dict]:
         """
         Return dictionary of labels for YOLO training.
 
-        This method loads labels from disk or cache, verifies their integrity, and prepares them for training.
+        This method loads labels from disk or cache, verifies their integrity, and prepares them for training. Labels
+        are returned as a columnar LabelStore memory-mapped from the *.cache.npy file next to the *.cache file, so
+        DataLoader workers share them instead of each holding a copy of a list of per-image dictionaries.
 
         Returns:
-            (List[dict]): List of label dictionaries, each containing information about an image and its annotations.
+            (LabelStore): Sequence of label dictionaries with information about each image and its annotations.
         """
         self.label_files = img2label_paths(self.im_files)
         cache_path = Path(self.label_files[0]).parent.with_suffix(".cache")
         try:
             cache, exists = load_dataset_cache_file(cache_path), True  # attempt to load a *.cache file
             assert cache["version"] == DATASET_CACHE_VERSION  # matches current version
-            assert cache["hash"] == get_hash(self.label_files + self.im_files)  # identical hash
         except (FileNotFoundError, AssertionError, AttributeError):
             cache, exists = self.cache_labels(cache_path), False  # run cache ops
+        else:
+            if cache["hash"] != get_hash(self.label_files + self.im_files) or self._fingerprints_changed(cache):
+                cache, exists = self.cache_labels(cache_path, previous=cache), False  # re-verify changed files only
 
         # Display cache
         nf, nm, ne, nc, n = cache.pop("results")  # found, missing, empty, corrupt, total
@@ -184,23 +244,22 @@ class YOLODataset(BaseDataset):
         # Read cache
         [cache.pop(k) for k in ("hash", "version", "msgs")]  # remove items
         labels = cache["labels"]
-        if not labels:
+        if not len(labels):
             raise RuntimeError(
                 f"No valid images found in {cache_path}. Images with incorrectly formatted labels are ignored. {HELP_URL}"
             )
-        self.im_files = [lb["im_file"] for lb in labels]  # update im_files
+        self.im_files = list(labels.im_files)  # update im_files
 
         # Check if the dataset is all boxes or all segments
-        lengths = ((len(lb["cls"]), len(lb["bboxes"]), len(lb["segments"])) for lb in labels)
-        len_cls, len_boxes, len_segments = (sum(x) for x in zip(*lengths))
+        len_cls = len_boxes = labels.num_instances
+        len_segments = labels.num_segments
         if len_segments and len_boxes != len_segments:
             LOGGER.warning(
                 f"Box and segment counts should be equal, but got len(segments) = {len_segments}, "
                 f"len(boxes) = {len_boxes}. To resolve this only boxes will be used and all segments will be removed. "
                 "To avoid this please supply either a detect or segment dataset, not a detect-segment mixed dataset."
             )
-            for lb in labels:
-                lb["segments"] = []
+            labels.drop_segments()
         if len_cls == 0:
             LOGGER.warning(f"Labels are missing or empty in {cache_path}, training may not work correctly. {HELP_URL}")
         return labels
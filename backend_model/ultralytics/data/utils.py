@@ -1,10 +1,13 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import contextlib
 import json
 import os
 import random
 import subprocess
+import sys
 import time
+import weakref
 import zipfile
 from multiprocessing.pool import ThreadPool
 from pathlib import Path
@@ -18,6 +21,7 @@ from PIL import Image, ImageOps
 from ultralytics.nn.autobackend import check_class_names
 from ultralytics.utils import (
     DATASETS_DIR,
+    LOCAL_RANK,
     LOGGER,
     MACOS,
     NUM_THREADS,
@@ -138,6 +142,15 @@ def get_hash(paths: List[str]) -> str:
     return h.hexdigest()  # return hash
 
 
+def get_file_fingerprint(path: str) -> Union[Tuple[int, int], None]:
+    """Return the (size, mtime_ns) fingerprint of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
 def exif_size(img: Image.Image) -> Tuple[int, int]:
     """Return exif-corrected PIL size."""
     s = img.size  # (width, height)
@@ -774,22 +787,597 @@ def compress_one_image(f: str, f_new: str = None, max_dim: int = 1920, quality:
         cv2.imwrite(str(f_new or f), im)
 
 
+class LabelStore:
+    """
+    Columnar store of YOLO dataset labels with per-image offsets.
+
+    Instead of one dictionary of small arrays per image, the classes, boxes, segments and keypoints of the whole dataset
+    are kept in flat contiguous arrays indexed by per-image offset arrays. When loaded from a *.cache.npy file the
+    columns are memory-mapped read-only views of a single buffer, so DataLoader workers share the same pages zero-copy
+    and a label dictionary is only built when an image is requested. Class filtering, single-class mode and image
+    reordering are stored as index arrays and applied lazily on access.
+
+    Attributes:
+        im_files (List[str]): Image file paths in original cache order.
+        columns (Dict[str, np.ndarray]): Flat label columns and offset arrays.
+        index (np.ndarray | None): Image order applied on access, None for cache order.
+        keep (np.ndarray | None): Boolean mask over all instances, None to keep all instances.
+        single_cls (bool): Whether to return all classes as 0.
+        use_segments (bool): Whether to return segments.
+        file (Path | None): Memory-mapped *.cache.npy file backing the columns, None if held in RAM.
+
+    Methods:
+        from_labels: Build a LabelStore from a list of per-image label dictionaries.
+        save: Write columns to a memory-mappable *.cache.npy file and return the layout.
+        load: Memory-map columns from a *.cache.npy file.
+        filter: Keep only the instances of the given classes and optionally collapse classes to 0.
+        drop_segments: Stop returning segments.
+
+    Examples:
+        >>> store = LabelStore.from_labels(labels)
+        >>> layout = store.save(Path("labels.cache.npy"))
+        >>> store = LabelStore.load(Path("labels.cache.npy"), layout)
+        >>> label = store[0]  # dict with 'im_file', 'shape', 'cls', 'bboxes', 'segments', 'keypoints'
+    """
+
+    def __init__(self, im_files: List[str], columns: Dict[str, np.ndarray], file: Path = None, layout: Dict = None):
+        """
+        Initialize LabelStore from label columns.
+
+        Args:
+            im_files (List[str]): Image file paths.
+            columns (Dict[str, np.ndarray]): Columns 'shape', 'lb_idx', 'cls', 'bboxes', 'seg_idx', 'seg_pt_idx',
+                'segments' and optionally 'keypoints'.
+            file (Path, optional): Memory-mapped file backing the columns.
+            layout (dict, optional): Layout of the columns in file, used to re-open it after pickling.
+        """
+        self.im_files = im_files
+        self.columns = columns
+        self.file = file
+        self.layout = layout
+        self.index = None
+        self.keep = None
+        self.single_cls = False
+        self.use_segments = True
+
+    @classmethod
+    def from_labels(cls, labels: List[Dict]) -> "LabelStore":
+        """
+        Build a LabelStore from a list of per-image label dictionaries as produced by verify_image_label().
+
+        Args:
+            labels (List[dict]): Label dictionaries with 'im_file', 'shape', 'cls', 'bboxes', 'segments' and
+                'keypoints' keys.
+
+        Returns:
+            (LabelStore): Columnar labels held in RAM.
+        """
+        segments = [s for lb in labels for s in lb["segments"]]
+        keypoints = [lb["keypoints"] for lb in labels if lb["keypoints"] is not None]
+        columns = {
+            "shape": np.array([lb["shape"] for lb in labels], dtype=np.int32).reshape(-1, 2),
+            "lb_idx": np.cumsum([0] + [len(lb["cls"]) for lb in labels], dtype=np.int64),
+            "cls": np.concatenate([lb["cls"] for lb in labels] or [np.zeros((0, 1))], 0).astype(np.float32),
+            "bboxes": np.concatenate([lb["bboxes"] for lb in labels] or [np.zeros((0, 4))], 0).astype(np.float32),
+            "seg_idx": np.cumsum([0] + [len(lb["segments"]) for lb in labels], dtype=np.int64),
+            "seg_pt_idx": np.cumsum([0] + [len(s) for s in segments], dtype=np.int64),
+            "segments": np.concatenate(segments or [np.zeros((0, 2))], 0).astype(np.float32),
+        }
+        if keypoints:
+            columns["keypoints"] = np.concatenate(keypoints, 0).astype(np.float32)
+        return cls([lb["im_file"] for lb in labels], columns)
+
+    def save(self, file: Path) -> Dict:
+        """
+        Write all columns into one memory-mappable uint8 *.npy buffer, each column aligned to 64 bytes.
+
+        Args:
+            file (Path): Output *.cache.npy file.
+
+        Returns:
+            (dict): Layout with image files and each column's (dtype, shape, byte offset), stored in the *.cache file.
+        """
+        layout, offset = {}, 0
+        for k, v in self.columns.items():
+            layout[k] = (v.dtype.str, v.shape, offset)
+            offset += -(-v.nbytes // 64) * 64
+        tmp = Path(f"{file}.tmp")  # write then rename, other processes may still map the previous file
+        buf = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8, shape=(offset,))
+        for k, v in self.columns.items():
+            buf[layout[k][2] : layout[k][2] + v.nbytes] = np.ascontiguousarray(v).view(np.uint8).reshape(-1)
+        buf.flush()
+        del buf
+        os.replace(tmp, file)
+        return {"im_files": self.im_files, "columns": layout, "nbytes": offset}
+
+    @classmethod
+    def load(cls, file: Path, layout: Dict) -> "LabelStore":
+        """
+        Memory-map label columns from a *.cache.npy file written by save().
+
+        Args:
+            file (Path): The *.cache.npy file.
+            layout (dict): Layout returned by save().
+
+        Returns:
+            (LabelStore): Columnar labels backed by read-only memory-mapped views.
+        """
+        buf = np.load(file, mmap_mode="r")
+        assert buf.dtype == np.uint8 and buf.size == layout["nbytes"], f"{file} does not match its *.cache layout"
+        columns = {}
+        for k, (dtype, shape, offset) in layout["columns"].items():
+            dtype = np.dtype(dtype)
+            nbytes = int(np.prod(shape)) * dtype.itemsize
+            columns[k] = np.asarray(buf[offset : offset + nbytes]).view(dtype).reshape(shape)
+        return cls(layout["im_files"], columns, file=file, layout=layout)
+
+    def filter(self, include_class: List[int] = None, single_cls: bool = False) -> None:
+        """
+        Keep only instances of the included classes and optionally return all classes as 0.
+
+        Args:
+            include_class (List[int], optional): Classes to keep. If None, all instances are kept.
+            single_cls (bool): Whether to return all classes as 0.
+        """
+        if include_class is not None:
+            keep = np.isin(self.columns["cls"][:, 0], include_class)
+            self.keep = keep if self.keep is None else self.keep & keep
+        self.single_cls = self.single_cls or single_cls
+
+    def drop_segments(self) -> None:
+        """Stop returning segments, e.g. for datasets mixing box and segment labels."""
+        self.use_segments = False
+
+    @property
+    def num_instances(self) -> int:
+        """Return the number of instances kept across all images."""
+        return int(self.keep.sum()) if self.keep is not None else len(self.columns["cls"])
+
+    @property
+    def num_segments(self) -> int:
+        """Return the number of segments across all images."""
+        return len(self.columns["seg_pt_idx"]) - 1 if self.use_segments else 0
+
+    def __len__(self) -> int:
+        """Return the number of images."""
+        return len(self.index) if self.index is not None else len(self.im_files)
+
+    def __getitem__(self, i: Union[int, np.ndarray, List[int]]) -> Union[Dict, "LabelStore"]:
+        """
+        Return the label dictionary of image i, or a reordered LabelStore when i is an array of image indices.
+
+        Returned arrays may be read-only views of the memory-mapped columns, copy them before modifying in place.
+        """
+        if not isinstance(i, (int, np.integer)):
+            store = self.__class__(self.im_files, self.columns, self.file, self.layout)
+            store.index = np.asarray(i, dtype=np.int64) if self.index is None else self.index[i]
+            store.keep, store.single_cls, store.use_segments = self.keep, self.single_cls, self.use_segments
+            return store
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"image index {i} out of range for {len(self)} images")
+        c = self.columns
+        j = int(self.index[i]) if self.index is not None else i
+        a, b = c["lb_idx"][j : j + 2]
+        cls, bboxes = c["cls"][a:b], c["bboxes"][a:b]
+        keypoints = c["keypoints"][a:b] if "keypoints" in c else None
+        s0, s1 = c["seg_idx"][j : j + 2] if self.use_segments else (0, 0)
+        segments = [c["segments"][p0:p1] for p0, p1 in zip(c["seg_pt_idx"][s0:s1], c["seg_pt_idx"][s0 + 1 : s1 + 1])]
+        if self.keep is not None:
+            k = self.keep[a:b]
+            if not k.all():
+                cls, bboxes = cls[k], bboxes[k]
+                keypoints = keypoints[k] if keypoints is not None else None
+                segments = [s for s, ki in zip(segments, k) if ki] if segments else segments
+        if self.single_cls:
+            cls = np.zeros_like(cls)
+        return {
+            "im_file": self.im_files[j],
+            "shape": tuple(int(x) for x in c["shape"][j]),
+            "cls": cls,
+            "bboxes": bboxes,
+            "segments": segments,
+            "keypoints": keypoints,
+            "normalized": True,
+            "bbox_format": "xywh",
+        }
+
+    def __iter__(self):
+        """Iterate over the label dictionaries of all images."""
+        return (self[i] for i in range(len(self)))
+
+    def __getstate__(self) -> Dict:
+        """Drop memory-mapped columns when pickled, e.g. for spawned DataLoader workers, they are re-opened instead."""
+        state = self.__dict__.copy()
+        if self.file is not None:
+            state["columns"] = None
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        """Re-open memory-mapped columns after unpickling."""
+        self.__dict__.update(state)
+        if self.columns is None:
+            self.columns = self.load(self.file, self.layout).columns
+
+
+class SharedImageArena:
+    """
+    Decoded uint8 images packed into one named shared-memory block with an (offset, shape) index.
+
+    The first process to use an arena name creates and fills it, other processes on the same node (DDP ranks, spawned
+    DataLoader workers) attach to the same block by name and read images as read-only zero-copy views. A ready flag
+    in the block header marks arenas that were completely filled. The creating process unlinks the block when the
+    arena is garbage collected or at exit.
+
+    Attributes:
+        name (str): Shared memory block name.
+        shapes (np.ndarray): Image shapes (h0, w0, h, w, c) of original and cached images, h = -1 if not cached.
+        offsets (np.ndarray): Byte offset of each image in the block.
+        nbytes (int): Size of the block in bytes.
+
+    Examples:
+        >>> arena = SharedImageArena.attach("yolo_arena", shapes)
+        >>> if arena is None:
+        ...     arena = SharedImageArena.create("yolo_arena", shapes)
+        ...     arena.write(0, im)
+        ...     arena.set_ready()
+        >>> im = arena[0]
+    """
+
+    HEADER = 64  # bytes reserved for the ready flag, images start aligned after it
+    created = set()  # names of blocks created by this process
+
+    def __init__(self, name: str, shapes: np.ndarray, create: bool):
+        """
+        Create or attach to the shared memory block of an arena.
+
+        Args:
+            name (str): Shared memory block name.
+            shapes (np.ndarray): Image shapes (h0, w0, h, w, c), h = -1 for images kept out of the arena.
+            create (bool): Whether to create the block, otherwise attach to an existing one.
+        """
+        import multiprocessing
+        from multiprocessing import shared_memory
+
+        self.name = name
+        self.shapes = np.asarray(shapes, dtype=np.int64)
+        self.offsets, self.nbytes = self.layout(self.shapes)
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.nbytes)
+            self.shm.buf[0] = 0  # not ready
+            self.created.add(name)
+            self._finalizer = weakref.finalize(self, self._release, self.shm, os.getpid())
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            main = multiprocessing.current_process().name == "MainProcess"  # already set while unpickling in spawn
+            if sys.version_info < (3, 13) and name not in self.created and main:
+                # Top-level processes such as DDP ranks have their own resource tracker, which would unlink the block
+                # at exit. Multiprocessing children share the creator's tracker and must not unregister it.
+                from multiprocessing import resource_tracker
+
+                resource_tracker.unregister(self.shm._name, "shared_memory")  # noqa
+            assert self.shm.size >= self.nbytes, f"shared memory '{name}' is smaller than its arena layout"
+        self.buf = np.ndarray((self.nbytes,), dtype=np.uint8, buffer=self.shm.buf)
+
+    @classmethod
+    def layout(cls, shapes: np.ndarray) -> Tuple[np.ndarray, int]:
+        """Return byte offsets of each image and the total arena size in bytes for image shapes (h0, w0, h, w, c)."""
+        sizes = np.where(shapes[:, 2] > 0, shapes[:, 2:].prod(1), 0)
+        sizes = -(-sizes // 64) * 64  # align images to 64 bytes
+        offsets = cls.HEADER + np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64)
+        return offsets, int(cls.HEADER + sizes.sum())
+
+    @classmethod
+    def attach(cls, name: str, shapes: np.ndarray) -> Union["SharedImageArena", None]:
+        """
+        Attach to a completely filled arena with the same layout, e.g. one created by another DDP rank on this node.
+
+        Args:
+            name (str): Shared memory block name, identical for all processes sharing the arena.
+            shapes (np.ndarray): Image shapes (h0, w0, h, w, c).
+
+        Returns:
+            (SharedImageArena | None): The attached arena, or None if no filled arena with this name and layout exists.
+        """
+        try:
+            arena = cls(name, shapes, create=False)
+        except (FileNotFoundError, AssertionError):
+            return None
+        if arena.ready and np.array_equal(arena.shapes, shapes):
+            return arena
+        arena.close()  # stale or still being filled by another process
+        return None
+
+    @classmethod
+    def create(cls, name: str, shapes: np.ndarray) -> "SharedImageArena":
+        """Create a new arena to fill, under a process-private name if the shared name is already taken."""
+        try:
+            return cls(name, shapes, create=True)
+        except FileExistsError:
+            return cls(f"{name[:20]}_{os.getpid()}", shapes, create=True)
+
+    @property
+    def ready(self) -> bool:
+        """Return whether the arena has been completely filled."""
+        return self.shm.buf[0] == 1
+
+    def set_ready(self) -> None:
+        """Mark the arena as completely filled."""
+        self.shm.buf[0] = 1
+
+    def __contains__(self, i: int) -> bool:
+        """Return whether image i is stored in the arena."""
+        return self.shapes[i, 2] > 0
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        """Return image i as a read-only zero-copy (h, w, c) view of the shared block, copy it before modifying."""
+        im = self._view(i)
+        im.setflags(write=False)  # in-place writes would change the image for every process attached to the block
+        return im
+
+    def _view(self, i: int) -> np.ndarray:
+        """Return image i as a writable (h, w, c) view of the shared block."""
+        h, w, c = self.shapes[i, 2:]
+        return self.buf[self.offsets[i] : self.offsets[i] + h * w * c].reshape(h, w, c)
+
+    def write(self, i: int, im: np.ndarray) -> bool:
+        """Copy image i into the arena, return False if its shape or dtype does not match the arena layout."""
+        if i not in self or im.dtype != np.uint8 or im.shape != tuple(self.shapes[i, 2:]):
+            return False
+        self._view(i)[:] = im
+        return True
+
+    def close(self) -> None:
+        """Release this process' mapping of the shared block."""
+        self.buf = None
+        self.shm.close()
+
+    @staticmethod
+    def _release(shm, pid: int) -> None:
+        """Close and unlink the shared block, only in the creating process and not in forked children."""
+        if os.getpid() == pid:
+            SharedImageArena.created.discard(shm.name.lstrip("/"))
+            with contextlib.suppress(Exception):
+                shm.close()
+            with contextlib.suppress(FileNotFoundError):
+                shm.unlink()
+
+    def __getstate__(self) -> Dict:
+        """Pickle by name so spawned workers attach to the same block instead of copying it."""
+        return {"name": self.name, "shapes": self.shapes}
+
+    def __setstate__(self, state: Dict) -> None:
+        """Attach to the shared block after unpickling."""
+        self.__init__(state["name"], state["shapes"], create=False)
+
+
+class ChunkedImageCache:
+    """
+    On-disk cache of resized images packed into a few large chunk files with an index, optionally compressed.
+
+    Images are stored already resized by load_image(), one after another in chunk files of about `chunk_size` bytes,
+    either raw or losslessly compressed with lz4, zstd or zlib. An index.cache file maps each image to its chunk, byte
+    offset and size together with its original and resized shape. Each read is a single positional read (preadv/pread)
+    into a new array, so processes share file descriptors safely and no per-image files are needed.
+
+    Attributes:
+        path (Path): Cache directory holding the chunk files and index.cache.
+        codec (str | None): Compression codec, one of 'lz4', 'zstd', 'zlib', or None for raw images.
+        index (np.ndarray): Structured array with chunk, offset, nbytes, h0, w0, h, w, c per image, chunk = -1 if
+            the image is not cached.
+
+    Examples:
+        >>> cache = ChunkedImageCache.load(Path("images/train.640.imcache"), key)
+        >>> if cache is None:
+        ...     cache = ChunkedImageCache.build(Path("images/train.640.imcache"), key, load_image, n, codec="lz4")
+        >>> im, hw0 = cache[0], cache.original_shape(0)
+    """
+
+    VERSION = "1.0.0"
+    CODECS = {"lz4", "zstd", "zlib"}
+    INDEX_DTYPE = np.dtype(
+        [(k, "<i8") for k in ("chunk", "offset", "nbytes")] + [(k, "<i4") for k in ("h0", "w0", "h", "w", "c")]
+    )
+
+    def __init__(self, path: Path, codec: Union[str, None], index: np.ndarray):
+        """
+        Initialize the cache reader.
+
+        Args:
+            path (Path): Cache directory.
+            codec (str | None): Compression codec of the chunks.
+            index (np.ndarray): Image index with INDEX_DTYPE.
+        """
+        self.path = Path(path)
+        self.codec = codec
+        self.index = index
+        self._decompress = self.codec_functions(codec)[1]
+        self._fds = {}  # chunk -> file descriptor, opened lazily per process
+
+    @staticmethod
+    def codec_functions(codec: Union[str, None]) -> Tuple:
+        """Return (compress, decompress) functions for a codec, (None, None) for raw images."""
+        if codec is None:
+            return None, None
+        codecs = ChunkedImageCache.CODECS
+        assert codec in codecs, f"invalid image cache codec '{codec}', valid codecs are {codecs}"
+        if codec == "lz4":
+            from ultralytics.utils.checks import check_requirements
+
+            check_requirements("lz4")
+            import lz4.frame
+
+            return lz4.frame.compress, lz4.frame.decompress
+        if codec == "zstd":
+            from ultralytics.utils.checks import check_requirements
+
+            check_requirements("zstandard")
+            import zstandard
+
+            return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+        import zlib
+
+        return lambda b: zlib.compress(b, 1), zlib.decompress
+
+    @classmethod
+    def build(
+        cls,
+        path: Path,
+        key: str,
+        load: callable,
+        n: int,
+        codec: Union[str, None] = None,
+        chunk_size: int = 1 << 30,
+        prefix: str = "",
+    ) -> "ChunkedImageCache":
+        """
+        Load, optionally compress and write n images into chunk files, then save the index.
+
+        Images are decoded and compressed in a thread pool and appended by the calling thread. Chunks are written to a
+        temporary directory which replaces `path` when complete, so readers of a previous cache are not disturbed.
+
+        Args:
+            path (Path): Cache directory.
+            key (str): Key identifying the dataset files and resize settings, checked by load().
+            load (callable): Function returning (im, hw_original, hw_resized) for an image index, i.e. load_image.
+            n (int): Number of images.
+            codec (str, optional): Compression codec, None for raw images.
+            chunk_size (int): Approximate size of each chunk file in bytes.
+            prefix (str): Prefix for log messages.
+
+        Returns:
+            (ChunkedImageCache): Reader for the new cache.
+        """
+        import shutil
+
+        compress = cls.codec_functions(codec)[0]
+
+        def encode(i):
+            try:
+                im, hw0, _ = load(i)
+            except Exception as e:
+                return None, None, str(e)
+            data = np.ascontiguousarray(im).tobytes()
+            return im.shape, hw0, compress(data) if compress else data
+
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        index = np.zeros(n, dtype=cls.INDEX_DTYPE)
+        index["chunk"] = -1
+        chunk, offset, raw, gb, f = 0, 0, 0, 1 << 30, None
+        with ThreadPool(NUM_THREADS) as pool:
+            pbar = TQDM(enumerate(pool.imap(encode, range(n))), total=n, disable=LOCAL_RANK > 0)
+            for i, (shape, hw0, data) in pbar:
+                if shape is None:
+                    LOGGER.warning(f"{prefix}Skipping image {i} in disk cache: {data}")
+                    continue
+                if f is None or offset >= chunk_size:  # start a new chunk
+                    if f is not None:
+                        f.close()
+                        chunk += 1
+                    f, offset = open(tmp / f"{chunk}.bin", "wb"), 0
+                f.write(data)
+                h, w = shape[:2]
+                index[i] = (chunk, offset, len(data), *hw0, h, w, shape[2])
+                offset += len(data)
+                raw += h * w * shape[2]
+                size = chunk * chunk_size + offset
+                pbar.desc = f"{prefix}Caching images ({size / gb:.1f}GB Disk, {raw / gb:.1f}GB uncompressed)"
+            pbar.close()
+        if f is not None:
+            f.close()
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+        save_dataset_cache_file(prefix, path / "index.cache", {"key": key, "codec": codec, "index": index}, cls.VERSION)
+        return cls(path, codec, index)
+
+    @classmethod
+    def load(cls, path: Path, key: str) -> Union["ChunkedImageCache", None]:
+        """Return a reader for an existing cache built with the same key and version, or None."""
+        try:
+            x = load_dataset_cache_file(path / "index.cache")
+            assert x["version"] == cls.VERSION and x["key"] == key
+            assert all((path / f"{c}.bin").is_file() for c in np.unique(x["index"]["chunk"]) if c >= 0)
+        except (FileNotFoundError, AssertionError, AttributeError, KeyError):
+            return None
+        return cls(path, x["codec"], x["index"])
+
+    @property
+    def nbytes(self) -> int:
+        """Return the total size of the chunk files in bytes."""
+        return int(self.index["nbytes"][self.index["chunk"] >= 0].sum())
+
+    def __contains__(self, i: int) -> bool:
+        """Return whether image i is stored in the cache."""
+        return bool(self.index["chunk"][i] >= 0)
+
+    def original_shape(self, i: int) -> Tuple[int, int]:
+        """Return the original (h, w) of image i before resizing."""
+        return int(self.index["h0"][i]), int(self.index["w0"][i])
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        """Read image i from its chunk with one positional read and return it as a new (h, w, c) array."""
+        chunk, offset, nbytes, _, _, h, w, c = self.index[i].tolist()
+        fd = self._fds.get(chunk)
+        if fd is None:
+            fd = self._fds[chunk] = os.open(self.path / f"{chunk}.bin", os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        if self._decompress is None:
+            im = np.empty((h, w, c), dtype=np.uint8)
+            if hasattr(os, "preadv"):
+                os.preadv(fd, [im], offset)
+            else:
+                im.reshape(-1)[:] = np.frombuffer(self._pread(fd, nbytes, offset), dtype=np.uint8)
+            return im
+        data = self._decompress(self._pread(fd, nbytes, offset))
+        return np.frombuffer(data, dtype=np.uint8).reshape(h, w, c).copy()  # writeable like decoded images
+
+    @staticmethod
+    def _pread(fd: int, nbytes: int, offset: int) -> bytes:
+        """Read nbytes at offset without moving the shared file position where os.pread is available."""
+        if hasattr(os, "pread"):
+            return os.pread(fd, nbytes, offset)
+        with open(fd, "rb", closefd=False) as f:  # Windows
+            f.seek(offset)
+            return f.read(nbytes)
+
+    def close(self) -> None:
+        """Close all chunk file descriptors of this process."""
+        for fd in self._fds.values():
+            with contextlib.suppress(OSError):
+                os.close(fd)
+        self._fds = {}
+
+    def __getstate__(self) -> Dict:
+        """Drop file descriptors and codec functions when pickled, e.g. for spawned DataLoader workers."""
+        return {"path": self.path, "codec": self.codec, "index": self.index}
+
+    def __setstate__(self, state: Dict) -> None:
+        """Re-initialize the reader after unpickling."""
+        self.__init__(**state)
+
+
 def load_dataset_cache_file(path: Path) -> Dict:
-    """Load an Ultralytics *.cache dictionary from path."""
+    """Load an Ultralytics *.cache dictionary from path, memory-mapping columnar labels from its *.cache.npy file."""
     import gc
 
     gc.disable()  # reduce pickle load time https://github.com/ultralytics/ultralytics/pull/1585
     cache = np.load(str(path), allow_pickle=True).item()  # load dict
     gc.enable()
+    if isinstance(cache.get("labels"), dict):  # LabelStore layout
+        cache["labels"] = LabelStore.load(Path(f"{path}.npy"), cache["labels"])
     return cache
 
 
 def save_dataset_cache_file(prefix: str, path: Path, x: Dict, version: str):
-    """Save an Ultralytics dataset *.cache dictionary x to path."""
+    """Save an Ultralytics dataset *.cache dictionary x to path, writing LabelStore columns to a *.cache.npy file."""
     x["version"] = version  # add cache version
     if is_dir_writeable(path.parent):
         if path.exists():
             path.unlink()  # remove *.cache file if exists
+        if isinstance(x.get("labels"), LabelStore):
+            x = {**x, "labels": x["labels"].save(Path(f"{path}.npy"))}  # store layout only, columns in *.cache.npy
         with open(str(path), "wb") as file:  # context manager here fixes windows async np.save bug
             np.save(file, x)
         LOGGER.info(f"{prefix}New cache created: {path}")
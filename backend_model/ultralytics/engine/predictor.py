@@ -32,9 +32,12 @@ Usage - formats:
                               yolo11n_rknn_model         # Rockchip RKNN
 """
 
+import itertools
 import platform
+import queue
 import re
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
@@ -45,6 +48,7 @@ import torch
 from ultralytics.cfg import get_cfg, get_save_dir
 from ultralytics.data import load_inference_source
 from ultralytics.data.augment import LetterBox
+from ultralytics.engine.results import BatchResults
 from ultralytics.nn.autobackend import AutoBackend
 from ultralytics.utils import DEFAULT_CFG, LOGGER, MACOS, WINDOWS, callbacks, colorstr, ops
 from ultralytics.utils.checks import check_imgsz, check_imshow
@@ -90,14 +94,18 @@ class BasePredictor:
         callbacks (Dict[str, List[callable]]): Callback functions for different events.
         txt_path (Path): Path to save text results.
         _lock (threading.Lock): Lock for thread-safe inference.
+        _static_buffers (dict): Preallocated input buffers of the `static_input` fast path, by image shape.
 
     Methods:
         preprocess: Prepare input image before inference.
+        static_preprocess: Letterbox same-size images into preallocated input buffers.
+        static_transform: Return the letterbox shared by all images of a batch, if any.
         inference: Run inference on a given image.
         postprocess: Process raw predictions into structured results.
         predict_cli: Run prediction for command line interface.
         setup_source: Set up input source and inference mode.
         stream_inference: Stream inference on input source.
+        pipelined_batches: Run decode/preprocess, inference and postprocess as overlapping stages.
         setup_model: Initialize and configure the model.
         write_results: Write inference results to files.
         save_predicted_images: Save prediction visualizations.
@@ -145,6 +153,8 @@ class BasePredictor:
         self.callbacks = _callbacks or callbacks.get_default_callbacks()
         self.txt_path = None
         self._lock = threading.Lock()  # for automatic thread-safe inference
+        self._static_buffers = {}  # {(shape, device, dtype): (buffer sets, counter, largest batch)}
+        self._static_lock = threading.Lock()
         callbacks.add_integration_callbacks(self)
 
     def preprocess(self, im: Union[torch.Tensor, List[np.ndarray]]) -> torch.Tensor:
@@ -158,6 +168,10 @@ class BasePredictor:
             (torch.Tensor): Preprocessed image tensor of shape (N, 3, H, W).
         """
         not_tensor = not isinstance(im, torch.Tensor)
+        if not_tensor and self.args.static_input:
+            x = self.static_preprocess(im)
+            if x is not None:
+                return x
         if not_tensor:
             im = np.stack(self.pre_transform(im))
             if im.shape[-1] == 3:
@@ -172,6 +186,57 @@ class BasePredictor:
             im /= 255  # 0 - 255 to 0.0 - 1.0
         return im
 
+    def static_preprocess(self, im: List[np.ndarray]) -> Optional[torch.Tensor]:
+        """
+        Letterbox a batch of same-size images into preallocated input buffers, for fixed-resolution streams.
+
+        Buffers are allocated once per image shape for the largest batch seen, at least `batch`: a uint8 (N, H, W, 3)
+        host staging array, pinned for CUDA, and the (N, 3, H, W) input tensor on the model device. Smaller batches use
+        views of the first rows, so varying batch sizes share one buffer set. Images are resized straight into the
+        staging array, whose letterbox padding is filled once, and the BGR to RGB swap, BHWC to BCHW transpose, dtype
+        conversion and /255 normalization are fused into one multiply per channel writing the input tensor. With
+        `pipeline`, several buffer sets are used in rotation so that batches in flight never share one.
+
+        Args:
+            im (List[np.ndarray]): List of images with shape [(H, W, 3) x N].
+
+        Returns:
+            (torch.Tensor | None): Preprocessed image tensor of shape (N, 3, H, W), or None to fall back to the regular
+                path if the images differ in shape, are not 3-channel uint8 or `static_transform` returns None.
+        """
+        shape = im[0].shape
+        if len(shape) != 3 or shape[2] != 3 or any(x.shape != shape or x.dtype != np.uint8 for x in im):
+            return None
+        letterbox = self.static_transform()
+        if letterbox is None:
+            return None
+
+        dtype = torch.float16 if self.model.fp16 else torch.float32
+        n, key = len(im), (shape, self.device, dtype)
+        with self._static_lock:
+            if key not in self._static_buffers or self._static_buffers[key][2] < n:
+                (h, w, c), size = letterbox(image=im[0]).shape, max(n, self.args.batch)
+                pipeline = 2 if self.args.pipeline is True else max(int(self.args.pipeline), 1)
+                count = 2 * pipeline + 3 if self.args.pipeline else 1  # batches queued, preprocessing and in flight
+                cuda = self.device.type == "cuda"
+                buffers = []
+                for _ in range(count):
+                    host = torch.full((size, h, w, c), 114, dtype=torch.uint8, pin_memory=cuda)
+                    staged = host.to(self.device) if cuda else host
+                    out = torch.empty((size, c, h, w), dtype=dtype, device=self.device)
+                    buffers.append((host.numpy(), host, staged, out))
+                self._static_buffers[key] = (buffers, itertools.count(), size)
+            buffers, counter, _ = self._static_buffers[key]
+            array, host, staged, out = (x[:n] for x in buffers[next(counter) % len(buffers)])
+
+        for x, dst in zip(im, array):
+            letterbox(image=x, out=dst)
+        if self.device.type == "cuda":
+            staged.copy_(host, non_blocking=True)
+        for i in range(3):  # BGR to RGB, BHWC to BCHW, uint8 to fp16/32 and 0 - 255 to 0.0 - 1.0 in one pass
+            torch.mul(staged[..., 2 - i], 1 / 255, out=out[:, i])
+        return out
+
     def inference(self, im: torch.Tensor, *args, **kwargs):
         """Run inference on a given image using the specified model and arguments."""
         visualize = (
@@ -191,15 +256,30 @@ class BasePredictor:
         Returns:
             (List[np.ndarray]): List of transformed images.
         """
-        same_shapes = len({x.shape for x in im}) == 1
-        letterbox = LetterBox(
+        letterbox = self._letterbox(same_shapes=len({x.shape for x in im}) == 1)
+        return [letterbox(image=x) for x in im]
+
+    def _letterbox(self, same_shapes: bool) -> LetterBox:
+        """Return the LetterBox of `pre_transform`, with minimum rectangles only for same-shape batches."""
+        return LetterBox(
             self.imgsz,
             auto=same_shapes
             and self.args.rect
             and (self.model.pt or (getattr(self.model, "dynamic", False) and not self.model.imx)),
             stride=self.model.stride,
         )
-        return [letterbox(image=x) for x in im]
+
+    def static_transform(self) -> Optional[LetterBox]:
+        """
+        Return the LetterBox that `pre_transform` applies to every image of a same-shape batch, for `static_preprocess`.
+
+        Subclasses whose `pre_transform` does more than a shared letterbox return their own transform, or None to
+        disable the `static_input` fast path.
+
+        Returns:
+            (LetterBox | None): Shared letterbox, or None if `pre_transform` is overridden.
+        """
+        return self._letterbox(same_shapes=True) if type(self).pre_transform is BasePredictor.pre_transform else None
 
     def postprocess(self, preds, img, orig_imgs):
         """Post-process predictions for an image and return them."""
@@ -286,7 +366,8 @@ class BasePredictor:
             **kwargs (Any): Additional keyword arguments for the inference method.
 
         Yields:
-            (ultralytics.engine.results.Results): Results objects.
+            (ultralytics.engine.results.Results | ultralytics.engine.results.BatchResults): Results objects, or one
+                BatchResults per batch if the predictor postprocesses into BatchResults (`batch_results=True`).
         """
         if self.args.verbose:
             LOGGER.info("")
@@ -317,47 +398,41 @@ class BasePredictor:
                 ops.Profile(device=self.device),
             )
             self.run_callbacks("on_predict_start")
-            for self.batch in self.dataset:
-                self.run_callbacks("on_predict_batch_start")
-                paths, im0s, s = self.batch
-
-                # Preprocess
-                with profilers[0]:
-                    im = self.preprocess(im0s)
-
-                # Inference
-                with profilers[1]:
-                    preds = self.inference(im, *args, **kwargs)
-                    if self.args.embed:
-                        yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
-                        continue
-
-                # Postprocess
-                with profilers[2]:
-                    self.results = self.postprocess(preds, im, im0s)
-                self.run_callbacks("on_predict_postprocess_end")
-
-                # Visualize, save, write results
-                n = len(im0s)
-                try:
-                    for i in range(n):
-                        self.seen += 1
-                        self.results[i].speed = {
-                            "preprocess": profilers[0].dt * 1e3 / n,
-                            "inference": profilers[1].dt * 1e3 / n,
-                            "postprocess": profilers[2].dt * 1e3 / n,
-                        }
-                        if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
-                            s[i] += self.write_results(i, Path(paths[i]), im, s)
-                except StopIteration:
-                    break
-
-                # Print batch results
-                if self.args.verbose:
-                    LOGGER.info("\n".join(s))
-
-                self.run_callbacks("on_predict_batch_end")
-                yield from self.results
+            if self.args.pipeline and not (self.args.embed or self.args.visualize):
+                for self.batch, im, self.results in self.pipelined_batches(profilers, *args, **kwargs):
+                    self.run_callbacks("on_predict_batch_start")
+                    self.run_callbacks("on_predict_postprocess_end")
+                    if not self._write_batch_results(im, profilers):
+                        break
+                    self.run_callbacks("on_predict_batch_end")
+                    yield from (self.results,) if isinstance(self.results, BatchResults) else self.results
+            else:
+                for self.batch in self.dataset:
+                    self.run_callbacks("on_predict_batch_start")
+                    paths, im0s, s = self.batch
+
+                    # Preprocess
+                    with profilers[0]:
+                        im = self.preprocess(im0s)
+
+                    # Inference
+                    with profilers[1]:
+                        preds = self.inference(im, *args, **kwargs)
+                        if self.args.embed:
+                            yield from [preds] if isinstance(preds, torch.Tensor) else preds  # yield embedding tensors
+                            continue
+
+                    # Postprocess
+                    with profilers[2]:
+                        self.results = self.postprocess(preds, im, im0s)
+                    self.run_callbacks("on_predict_postprocess_end")
+
+                    # Visualize, save, write results
+                    if not self._write_batch_results(im, profilers):
+                        break
+
+                    self.run_callbacks("on_predict_batch_end")
+                    yield from (self.results,) if isinstance(self.results, BatchResults) else self.results
 
         # Release assets
         for v in self.vid_writer.values():
@@ -380,6 +455,138 @@ class BasePredictor:
             LOGGER.info(f"Results saved to {colorstr('bold', self.save_dir)}{s}")
         self.run_callbacks("on_predict_end")
 
+    def _write_batch_results(self, im: torch.Tensor, profilers) -> bool:
+        """
+        Attach per-image speeds to the current batch results and visualize, save or write them.
+
+        Args:
+            im (torch.Tensor): Preprocessed image tensor of the current batch.
+            profilers (tuple): Preprocess, inference and postprocess profilers holding the batch timings in `dt`.
+
+        Returns:
+            (bool): False if the user requested to stop (e.g. pressed 'q' in a show window), True otherwise.
+        """
+        paths, im0s, s = self.batch
+        n = len(im0s)
+        speed = {
+            "preprocess": profilers[0].dt * 1e3 / n,
+            "inference": profilers[1].dt * 1e3 / n,
+            "postprocess": profilers[2].dt * 1e3 / n,
+        }
+        batched = isinstance(self.results, BatchResults)
+        if batched:
+            self.results.speed = speed  # shared by the per-image Results built on demand
+        try:
+            for i in range(n):
+                self.seen += 1
+                if not batched:
+                    self.results[i].speed = dict(speed)
+                if self.args.verbose or self.args.save or self.args.save_txt or self.args.show:
+                    s[i] += self.write_results(i, Path(paths[i]), im, s)
+        except StopIteration:
+            return False
+
+        # Print batch results
+        if self.args.verbose:
+            LOGGER.info("\n".join(s))
+        return True
+
+    @staticmethod
+    @smart_inference_mode()
+    def _timed(fn: callable, *args):
+        """Run fn in inference mode (worker threads do not inherit it) and return its output and elapsed seconds."""
+        with ops.Profile() as dt:
+            out = fn(*args)
+        return out, dt.dt
+
+    def pipelined_batches(self, profilers, *args, **kwargs):
+        """
+        Run decode/preprocess, inference and postprocess as overlapping stages and yield batches in input order.
+
+        A producer thread iterates the dataset (image decode) and hands every batch to a thread pool for `preprocess`
+        (LetterBox, stacking, channel swap and device transfer), keeping at most N batches in flight through a bounded
+        queue, where N is `args.pipeline` (True means 2). The calling thread runs inference, while postprocessing of
+        batch k runs on a single worker thread concurrently with inference of batch k+1. `self.batch` is only
+        reassigned while the postprocess worker is idle, so subclasses relying on it in `postprocess` stay correct.
+
+        Args:
+            profilers (tuple): Preprocess, inference and postprocess profilers, updated with per-batch timings.
+            *args (Any): Additional arguments for the inference method.
+            **kwargs (Any): Additional keyword arguments for the inference method.
+
+        Yields:
+            (tuple): Batch (paths, im0s, s), preprocessed image tensor and list of Results for each batch.
+        """
+        depth = 2 if self.args.pipeline is True else max(int(self.args.pipeline), 1)
+        in_flight = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        pre_pool = ThreadPoolExecutor(max_workers=depth, thread_name_prefix="predict-pre")
+        post_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict-post")
+
+        def put(item):
+            """Put item on the bounded queue, giving up if the consumer has stopped."""
+            while not stop.is_set():
+                try:
+                    in_flight.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            """Decode batches from the dataset and submit them for preprocessing."""
+            try:
+                for batch in self.dataset:
+                    if not put((batch, pre_pool.submit(self._timed, self.preprocess, batch[1]))):
+                        return
+            except Exception as e:
+                put(e)
+                return
+            put(None)
+
+        def collect(pending):
+            """Wait for a submitted postprocess task and load the timings of its batch into the profilers."""
+            batch, im, dts, future = pending
+            results, dt = future.result()
+            profilers[2].t += dt
+            for p, t in zip(profilers, (*dts, dt)):
+                p.dt = t
+            return batch, im, results
+
+        producer = threading.Thread(target=produce, daemon=True, name="predict-decode")
+        producer.start()
+        pending = None
+        try:
+            while True:
+                item = in_flight.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                batch, future = item
+                im, pre_dt = future.result()
+                profilers[0].t += pre_dt
+
+                # Inference of this batch overlaps postprocessing of the previous one
+                with profilers[1]:
+                    preds = self.inference(im, *args, **kwargs)
+                dts = (pre_dt, profilers[1].dt)
+                if pending is not None:
+                    yield collect(pending)
+
+                self.batch = batch  # postprocess worker is idle here
+                pending = (batch, im, dts, post_pool.submit(self._timed, self.postprocess, preds, im, batch[1]))
+            if pending is not None:
+                yield collect(pending)
+        finally:
+            stop.set()
+            while not in_flight.empty():  # unblock the producer and drop queued work
+                item = in_flight.get_nowait()
+                if isinstance(item, tuple):
+                    item[1].cancel()
+            pre_pool.shutdown(wait=False)
+            post_pool.shutdown(wait=True)
+
     def setup_model(self, model, verbose: bool = True):
         """
         Initialize YOLO model with given parameters and set it to evaluation mode.
@@ -397,6 +604,8 @@ class BasePredictor:
             batch=self.args.batch,
             fuse=True,
             verbose=verbose,
+            autotune=self.args.imgsz if self.args.autotune else False,
+            streams=self.args.streams,
         )
 
         self.device = self.model.device  # update device
@@ -1,10 +1,11 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 """
-Ultralytics Results, Boxes and Masks classes for handling inference results.
+Ultralytics Results, BatchResults, Boxes and Masks classes for handling inference results.
 
 Usage: See https://docs.ultralytics.com/modes/predict/
 """
 
+import itertools
 from copy import deepcopy
 from functools import lru_cache
 from pathlib import Path
@@ -853,6 +854,186 @@ class Results(SimpleClass, DataExportMixin):
         return results
 
 
+class BatchResults(SimpleClass):
+    """
+    Detections of a whole batch in a single tensor, with per-image Results built only on demand.
+
+    High-rate detection loops usually read a few fields of every image, e.g. confidences to route the image, and only
+    occasionally need a full Results object to plot or save. All detections of the batch are kept in one (N, 6)
+    tensor grouped by image, per-image Boxes are zero-copy views of it, and coordinate conversions are computed once
+    for the whole batch. Results objects are only built when an image is indexed, and then cached.
+
+    Attributes:
+        data (torch.Tensor | numpy.ndarray): Detections of all images with shape (N, 6) as [x1, y1, x2, y2, conf, cls]
+            in original image pixels, grouped by image.
+        offsets (List[int]): Start index of each image's detections in `data`, followed by N.
+        orig_imgs (List[numpy.ndarray]): Original images.
+        orig_shapes (List[Tuple[int, int]]): Original image shapes in (height, width) format.
+        paths (List[str]): Image file paths.
+        names (Dict[int, str]): Class names.
+        speed (Dict[str, float]): Preprocess, inference and postprocess speeds in ms per image.
+
+    Methods:
+        boxes: Return the Boxes of one image as a view of `data`, without building Results.
+        split: Split any per-detection tensor of the batch into per-image views.
+        cpu: Return a copy with `data` on CPU memory, moved in a single transfer.
+        numpy: Return a copy with `data` as a numpy array.
+        cuda: Return a copy with `data` on GPU memory.
+        to: Return a copy with `data` on the specified device and dtype.
+
+    Examples:
+        >>> batch = next(model.predict(["a.jpg", "b.jpg"], stream=True, batch=2, batch_results=True))
+        >>> batch = batch.cpu()  # one device to host copy for the whole batch
+        >>> for i, confs in enumerate(batch.split(batch.conf)):
+        ...     if len(confs) and confs.min() < 0.5:
+        ...         batch[i].save(f"low_conf_{i}.jpg")  # Results built for this image only
+    """
+
+    def __init__(
+        self,
+        data: Union[torch.Tensor, np.ndarray],
+        counts: List[int],
+        orig_imgs: List[np.ndarray],
+        paths: List[str],
+        names: Dict[int, str],
+        speed: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        Initialize BatchResults with the detections of all images and the number of detections per image.
+
+        Args:
+            data (torch.Tensor | numpy.ndarray): Detections of all images with shape (N, 6), grouped by image.
+            counts (List[int]): Number of detections of each image, summing to N.
+            orig_imgs (List[numpy.ndarray]): Original images.
+            paths (List[str]): Image file paths.
+            names (Dict[int, str]): Class names.
+            speed (Dict | None): Preprocess, inference and postprocess speeds in ms per image.
+        """
+        self.data = data
+        self.offsets = [0, *itertools.accumulate(counts)]
+        self.orig_imgs = orig_imgs
+        self.orig_shapes = [im.shape[:2] for im in orig_imgs]
+        self.paths = paths
+        self.names = names
+        self.speed = speed if speed is not None else {"preprocess": None, "inference": None, "postprocess": None}
+        self._results = {}
+
+    def __len__(self) -> int:
+        """Return the number of images in the batch."""
+        return len(self.orig_imgs)
+
+    def __getitem__(self, idx: int) -> "Results":
+        """
+        Return the Results of one image, built on first access and cached.
+
+        Args:
+            idx (int): Image index in the batch.
+
+        Returns:
+            (Results): Results whose boxes are a view of `data`.
+        """
+        idx = range(len(self))[idx]  # support negative indices and raise IndexError
+        if idx not in self._results:
+            a, b = self.offsets[idx], self.offsets[idx + 1]
+            r = Results(self.orig_imgs[idx], path=self.paths[idx], names=self.names, boxes=self.data[a:b])
+            r.speed = self.speed
+            self._results[idx] = r
+        return self._results[idx]
+
+    def __iter__(self):
+        """Iterate over the Results of all images, building each one on demand."""
+        return (self[i] for i in range(len(self)))
+
+    def boxes(self, idx: int) -> "Boxes":
+        """Return the Boxes of one image as a view of `data`, without building Results."""
+        return Boxes(self.data[self.offsets[idx] : self.offsets[idx + 1]], self.orig_shapes[idx])
+
+    def split(self, x: Union[torch.Tensor, np.ndarray]) -> List[Union[torch.Tensor, np.ndarray]]:
+        """
+        Split a per-detection tensor of the batch into per-image views.
+
+        Args:
+            x (torch.Tensor | numpy.ndarray): Tensor whose first dimension indexes the detections in `data`, e.g.
+                `batch.conf` or `batch.xywhn`.
+
+        Returns:
+            (List[torch.Tensor | numpy.ndarray]): Views of `x` with the rows of each image.
+        """
+        return [x[a:b] for a, b in zip(self.offsets, self.offsets[1:])]
+
+    @property
+    def xyxy(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return boxes of all images in [x1, y1, x2, y2] pixel format."""
+        return self.data[:, :4]
+
+    @property
+    def conf(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return confidence scores of all detections."""
+        return self.data[:, 4]
+
+    @property
+    def cls(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return class indices of all detections."""
+        return self.data[:, 5]
+
+    @property
+    @lru_cache(maxsize=2)
+    def image_index(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return the image index of every detection, computed once."""
+        counts = np.diff(self.offsets)
+        if isinstance(self.data, np.ndarray):
+            return np.repeat(np.arange(len(self)), counts)
+        return torch.repeat_interleave(torch.arange(len(self), device=self.data.device), torch.as_tensor(counts))
+
+    @property
+    @lru_cache(maxsize=2)
+    def xywh(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return boxes of all images in [x_center, y_center, width, height] pixel format, computed once."""
+        return ops.xyxy2xywh(self.xyxy)
+
+    @property
+    @lru_cache(maxsize=2)
+    def _whwh(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return the original image [width, height, width, height] of every detection, for normalization."""
+        whwh = [[w, h, w, h] for h, w in self.orig_shapes]
+        if isinstance(self.data, np.ndarray):
+            return np.asarray(whwh, dtype=self.data.dtype)[self.image_index]
+        return torch.tensor(whwh, dtype=self.data.dtype, device=self.data.device)[self.image_index]
+
+    @property
+    @lru_cache(maxsize=2)
+    def xyxyn(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return boxes of all images in [x1, y1, x2, y2] format normalized by their image size, computed once."""
+        return self.xyxy / self._whwh
+
+    @property
+    @lru_cache(maxsize=2)
+    def xywhn(self) -> Union[torch.Tensor, np.ndarray]:
+        """Return boxes of all images in [x, y, width, height] format normalized by their image size, computed once."""
+        return self.xywh / self._whwh
+
+    def _apply(self, data: Union[torch.Tensor, np.ndarray]) -> "BatchResults":
+        """Return a copy holding `data`, sharing images, paths, names and speed."""
+        counts = np.diff(self.offsets).tolist()
+        return BatchResults(data, counts, self.orig_imgs, self.paths, self.names, self.speed)
+
+    def cpu(self) -> "BatchResults":
+        """Return a copy with `data` on CPU memory, moved in a single transfer."""
+        return self if isinstance(self.data, np.ndarray) else self._apply(self.data.cpu())
+
+    def numpy(self) -> "BatchResults":
+        """Return a copy with `data` as a numpy array."""
+        return self if isinstance(self.data, np.ndarray) else self._apply(self.data.numpy())
+
+    def cuda(self) -> "BatchResults":
+        """Return a copy with `data` on GPU memory."""
+        return self._apply(torch.as_tensor(self.data).cuda())
+
+    def to(self, *args, **kwargs) -> "BatchResults":
+        """Return a copy with `data` on the specified device and dtype."""
+        return self._apply(torch.as_tensor(self.data).to(*args, **kwargs))
+
+
 class Boxes(BaseTensor):
     """
     A class for managing and manipulating detection boxes.
@@ -7,8 +7,10 @@ Usage:
 """
 
 import gc
+import glob
 import math
 import os
+import random
 import subprocess
 import time
 import warnings
@@ -23,7 +25,7 @@ from torch import nn, optim
 
 from ultralytics import __version__
 from ultralytics.cfg import get_cfg, get_save_dir
-from ultralytics.data.utils import check_cls_dataset, check_det_dataset
+from ultralytics.data.utils import IMG_FORMATS, check_cls_dataset, check_det_dataset
 from ultralytics.nn.tasks import attempt_load_one_weight, attempt_load_weights
 from ultralytics.utils import (
     DEFAULT_CFG,
@@ -95,6 +97,7 @@ class BaseTrainer:
 
     Methods:
         train: Execute the training process.
+        finetune: Incrementally fine-tune the resident model on a new batch of labeled data.
         validate: Run validation on the test set.
         save_model: Save model training checkpoints.
         get_dataset: Get train and validation datasets.
@@ -502,6 +505,170 @@ class BaseTrainer:
         unset_deterministic()
         self.run_callbacks("teardown")
 
+    def finetune(
+        self, data=None, epochs=None, replay=None, replay_ratio=1.0, save_dir=None, val=False, stop_event=None
+    ):
+        """
+        Incrementally fine-tune the resident model on a new batch of labeled data.
+
+        The first call runs the usual training setup (model, AMP check, optimizer, EMA). Later calls on the same trainer
+        reuse the model, optimizer and EMA held in memory and only build a dataloader for the new batch, mixed with a
+        random replay sample of previously labeled images to limit forgetting. Plots and the final evaluation are
+        skipped, and the updated weights are written as soon as the last epoch ends.
+
+        Args:
+            data (str | dict, optional): Dataset of the new batch, with the same class names as the trainer's dataset.
+                Defaults to the trainer's dataset.
+            epochs (int, optional): Epochs for this cycle. Defaults to `args.epochs`.
+            replay (str | Path | List[str], optional): Directory searched recursively for replay images, or a list of
+                image files. Images with the same file name as a new image are excluded.
+            replay_ratio (float): Number of replay images sampled per new image.
+            save_dir (str | Path, optional): Directory for this cycle's weights, args.yaml and results.csv. Defaults to
+                the trainer's save_dir.
+            val (bool): Validate the updated model on the dataset's val split.
+            stop_event (threading.Event, optional): Event that cancels the cycle when set, also if it is set during
+                setup or before the call.
+
+        Returns:
+            (dict): Cycle statistics with the number of new and replay images, per-stage times in seconds and
+                'time_to_model', the time from the call until the updated weights are saved. Setting `stop` or
+                `stop_event` returns early with 'stopped': True and leaves the saved weights untouched. `stop` is not
+                reset by this method, callers clear it before starting a new cycle.
+
+        Examples:
+            >>> trainer = DetectionTrainer(overrides={"model": "best.pt", "data": "next_train.yaml", "epochs": 3})
+            >>> stats = trainer.finetune(replay="datasets/history")
+            >>> stats = trainer.finetune(save_dir="runs/next")  # second cycle reuses the resident model and optimizer
+        """
+        t0 = time.time()
+        if not getattr(self, "_finetune_ready", False):
+            self.args.plots = False
+            self.train_time_start = t0
+            self._setup_train(world_size=1 if self.device.type == "cuda" else 0)
+            self._finetune_ready = True
+        t_setup = time.time()
+
+        if data is not None:
+            names = self.data["names"]
+            self.args.data = data
+            self.data = self.get_dataset()
+            if self.data["names"] != names:
+                raise ValueError(f"finetune() data names {self.data['names']} do not match the model names {names}")
+            if val:
+                self.test_loader = self.get_dataloader(
+                    self.data.get("val") or self.data.get("test"), batch_size=self.batch_size * 2, rank=-1, mode="val"
+                )
+                self.validator = self.get_validator()
+        if save_dir is not None:
+            self.save_dir = Path(save_dir)
+            self.wdir = self.save_dir / "weights"
+            self.wdir.mkdir(parents=True, exist_ok=True)
+            self.last, self.best = self.wdir / "last.pt", self.wdir / "best.pt"
+            self.csv = self.save_dir / "results.csv"
+            self.args.save_dir, self.args.name = str(self.save_dir), self.save_dir.name
+            YAML.save(self.save_dir / "args.yaml", vars(self.args))
+
+        # New batch plus replay sample, passed to the dataset as one image list file
+        new = self._image_files(self.data["train"])
+        if replay:
+            missing = [p for p in (replay if isinstance(replay, (list, tuple)) else [replay]) if not Path(p).exists()]
+            if missing:
+                LOGGER.warning(f"finetune() replay path {', '.join(map(str, missing))} not found")
+            replay = self._image_files(replay)
+            if not replay:
+                LOGGER.warning("finetune() found no replay images, training on the new batch alone")
+        else:
+            replay = []
+        names = {Path(f).name for f in new}
+        replay = [f for f in replay if Path(f).name not in names]
+        replay = random.sample(replay, min(len(replay), round(len(new) * replay_ratio)))
+        image_list = self.save_dir / "finetune.txt"
+        image_list.write_text("\n".join(str(Path(f).resolve()) for f in new + replay) + "\n", encoding="utf-8")
+        self.train_loader = self.get_dataloader(str(image_list), batch_size=self.batch_size, rank=LOCAL_RANK)
+        t_data = time.time()
+
+        self.epochs = epochs or self.args.epochs
+        for g in self.optimizer.param_groups:  # restart this cycle's LR schedule from the initial LR
+            g["lr"] = g.get("initial_lr", g["lr"])
+        self._setup_scheduler()
+        self.scheduler.last_epoch = -1
+        nb, last_opt_step = len(self.train_loader), -1
+        accumulate = min(self.accumulate, nb)  # small incremental batches still step at least once per epoch
+        for epoch in range(self.epochs):
+            self.epoch = epoch
+            self.run_callbacks("on_train_epoch_start")
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # suppress 'Detected lr_scheduler.step() before optimizer.step()'
+                self.scheduler.step()
+            self._model_train()
+            self.tloss = None
+            for i, batch in enumerate(self.train_loader):
+                if self.stop or (stop_event is not None and stop_event.is_set()):  # cancelled from another thread
+                    self.stop = True
+                    break
+                ni = i + nb * epoch
+                with autocast(self.amp):
+                    batch = self.preprocess_batch(batch)
+                    loss, self.loss_items = self.model(batch)
+                    self.loss = loss.sum()
+                    self.tloss = (
+                        (self.tloss * i + self.loss_items) / (i + 1) if self.tloss is not None else self.loss_items
+                    )
+                self.scaler.scale(self.loss).backward()
+                if ni - last_opt_step >= accumulate:
+                    self.optimizer_step()
+                    last_opt_step = ni
+            self.lr = {f"lr/pg{ir}": x["lr"] for ir, x in enumerate(self.optimizer.param_groups)}  # for loggers
+            self.run_callbacks("on_train_epoch_end")
+            self.run_callbacks("on_fit_epoch_end")
+            if self.stop:
+                LOGGER.warning("finetune() cycle stopped, weights not saved")
+                self.optimizer.zero_grad()
+                return {"images": len(new), "replay": len(replay), "epochs": epoch, "stopped": True}
+        if last_opt_step < ni:  # apply gradients left over from the last accumulation window
+            self.optimizer_step()
+        t_train = time.time()
+
+        self.ema.update_attr(self.model, include=["yaml", "nc", "args", "names", "stride", "class_weights"])
+        if val:
+            self.metrics, self.fitness = self.validate()
+        self.save_metrics(metrics={**self.label_loss_items(self.tloss), **self.metrics, **self.lr})
+        self.best_fitness = self.fitness  # every cycle deploys its own updated weights
+        self.save_model()
+        strip_optimizer(self.best)
+        self._clear_memory(0.5)
+        t_end = time.time()
+
+        stats = {
+            "images": len(new),
+            "replay": len(replay),
+            "epochs": self.epochs,
+            "setup": round(t_setup - t0, 3),
+            "data": round(t_data - t_setup, 3),
+            "train": round(t_train - t_data, 3),
+            "save": round(t_end - t_train, 3),
+            "time_to_model": round(t_end - t0, 3),
+        }
+        LOGGER.info(
+            f"{colorstr('finetune:')} {len(new)} new + {len(replay)} replay images, {self.epochs} epochs, "
+            f"updated model {self.best} in {stats['time_to_model']:.1f}s (setup {stats['setup']:.1f}s)"
+        )
+        return stats
+
+    @staticmethod
+    def _image_files(path):
+        """Return the image files in a directory (recursive), an image list file, or a list of either."""
+        files = []
+        for p in path if isinstance(path, (list, tuple)) else [path]:
+            p = Path(p)
+            if p.is_dir():
+                files += glob.glob(str(p / "**" / "*.*"), recursive=True)
+            elif p.suffix == ".txt":
+                files += [x if not x.startswith("./") else str(p.parent / x[2:]) for x in p.read_text().splitlines()]
+            else:
+                files.append(str(p))
+        return sorted(f for f in files if f.rpartition(".")[-1].lower() in IMG_FORMATS)
+
     def auto_batch(self, max_num_obj=0):
         """Calculate optimal batch size based on model and device memory constraints."""
         return check_train_batch_size(
@@ -12,12 +12,21 @@ Examples:
     >>> from ultralytics import YOLO
     >>> model = YOLO("yolo11n.pt")
     >>> model.tune(data="coco8.yaml", epochs=10, iterations=300, optimizer="AdamW", plots=False, save=False, val=False)
+
+    Run a grid of trials concurrently on all GPUs and stop poor trials early with successive halving.
+    >>> from ultralytics.engine.tuner import Sweeper
+    >>> Sweeper(args={"model": "yolo11n.pt", "data": "coco8.yaml", "epochs": 30}, grid={"lr0": [0.01, 0.001]})()
 """
 
+import csv
+import itertools
+import os
 import random
 import shutil
 import subprocess
+import sys
 import time
+from pathlib import Path
 from typing import Dict, List, Optional
 
 import numpy as np
@@ -108,7 +117,12 @@ class Tuner:
         )
 
     def _mutate(
-        self, parent: str = "single", n: int = 5, mutation: float = 0.8, sigma: float = 0.2
+        self,
+        parent: str = "single",
+        n: int = 5,
+        mutation: float = 0.8,
+        sigma: float = 0.2,
+        seed_defaults: bool = False,
     ) -> Dict[str, float]:
         """
         Mutate hyperparameters based on bounds and scaling factors specified in `self.space`.
@@ -118,26 +132,31 @@ class Tuner:
             n (int): Number of parents to consider.
             mutation (float): Probability of a parameter mutation in any given iteration.
             sigma (float): Standard deviation for Gaussian random number generator.
+            seed_defaults (bool): Mutate the default hyperparameters while no results are logged yet, instead of
+                returning them unchanged. Used when several trials start before the first one finishes.
 
         Returns:
             (Dict[str, float]): A dictionary containing mutated hyperparameters.
         """
-        if self.tune_csv.exists():  # if CSV file exists: select best hyps and mutate
+        if self.tune_csv.exists() or seed_defaults:  # if CSV file exists: select best hyps and mutate
             # Select parent(s)
-            x = np.loadtxt(self.tune_csv, ndmin=2, delimiter=",", skiprows=1)
-            fitness = x[:, 0]  # first column
-            n = min(n, len(x))  # number of previous results to consider
-            x = x[np.argsort(-fitness)][:n]  # top n mutations
-            w = x[:, 0] - x[:, 0].min() + 1e-6  # weights (sum > 0)
-            if parent == "single" or len(x) == 1:
-                # x = x[random.randint(0, n - 1)]  # random selection
-                x = x[random.choices(range(n), weights=w)[0]]  # weighted selection
-            elif parent == "weighted":
-                x = (x * w.reshape(n, 1)).sum(0) / w.sum()  # weighted combination
+            if self.tune_csv.exists():
+                x = np.loadtxt(self.tune_csv, ndmin=2, delimiter=",", skiprows=1)
+                fitness = x[:, 0]  # first column
+                n = min(n, len(x))  # number of previous results to consider
+                x = x[np.argsort(-fitness)][:n]  # top n mutations
+                w = x[:, 0] - x[:, 0].min() + 1e-6  # weights (sum > 0)
+                if parent == "single" or len(x) == 1:
+                    # x = x[random.randint(0, n - 1)]  # random selection
+                    x = x[random.choices(range(n), weights=w)[0]]  # weighted selection
+                elif parent == "weighted":
+                    x = (x * w.reshape(n, 1)).sum(0) / w.sum()  # weighted combination
+            else:
+                x = np.array([0.0] + [getattr(self.args, k) for k in self.space.keys()], dtype=float)
 
             # Mutate
             r = np.random  # method
-            r.seed(int(time.time()))
+            r.seed(time.time_ns() % 2**32)  # sub-second seed, concurrent mutations must differ
             g = np.array([v[2] if len(v) == 3 else 1.0 for v in self.space.values()])  # gains 0-1
             ng = len(self.space)
             v = np.ones(ng)
@@ -244,3 +263,339 @@ class Tuner:
                 header=remove_colorstr(header.replace(self.prefix, "# ")) + "\n",
             )
             YAML.print(self.tune_dir / "best_hyperparameters.yaml")
+
+
+class Sweeper(Tuner):
+    """
+    A class for running hyperparameter trials concurrently with asynchronous successive halving (ASHA).
+
+    Trials come either from an explicit grid or from mutation of the best logged results as in `Tuner`. Each trial
+    trains in its own subprocess pinned to one device through CUDA_VISIBLE_DEVICES, and several trials share a GPU when
+    `per_device` allows it. The dataset is checked and cached once before the first trial starts, so concurrent trials
+    reuse the same label cache and image cache instead of building their own. While trials run, their results.csv files
+    are polled; whenever a trial reaches a rung epoch it is stopped unless its best fitness so far is in the top 1/eta
+    of all fitnesses recorded at that rung. Every trial is logged as one row of a shared results table.
+
+    Attributes:
+        grid (List[dict] | None): Explicit trial overrides, or None to mutate the search space.
+        devices (List[str]): Devices trials are distributed over, NVML/PCI bus indices or 'cpu'.
+        per_device (int | str): Maximum concurrent trials per device, or 'auto' to pack trials onto a GPU while its
+            free memory can hold another trial of the size measured so far.
+        rungs (List[int]): Epochs at which trials are compared.
+        eta (int): Reduction factor, only the top 1/eta trials at each rung keep training.
+        poll (float): Interval in seconds between polls of the running trials.
+        sweep_csv (Path): Path to the CSV file with one row per trial.
+        rung_fitness (Dict[int, List[float]]): Fitnesses recorded at each rung.
+
+    Methods:
+        __call__: Run the sweep until all trials have finished or were stopped.
+
+    Examples:
+        Run an explicit grid on all GPUs, stopping poor trials at epochs 3, 9, 27 and 81.
+        >>> sweeper = Sweeper(
+        ...     args={"model": "yolo11n.pt", "data": "coco8.yaml", "epochs": 100, "cache": "ram"},
+        ...     grid={"degrees": [5, 15], "mosaic": [True, False]},
+        ...     grace_period=3,
+        ...     eta=3,
+        ... )
+        >>> results = sweeper()
+
+        Mutate the default search space for 20 trials, packing trials onto each GPU by free memory.
+        >>> results = Sweeper(args={"data": "coco8.yaml", "epochs": 30}, per_device="auto")(iterations=20)
+    """
+
+    def __init__(
+        self,
+        args=DEFAULT_CFG,
+        grid=None,
+        devices: Optional[List[str]] = None,
+        per_device=1,
+        grace_period: int = 3,
+        eta: int = 3,
+        poll: float = 2.0,
+        _callbacks: Optional[List] = None,
+    ):
+        """
+        Initialize the Sweeper with configurations.
+
+        Args:
+            args (dict): Configuration shared by all trials.
+            grid (dict | List[dict], optional): Explicit trials, either a dict mapping arguments to lists of values
+                whose cartesian product is swept, or a list of override dicts. A 'name' entry names the trial's run
+                directory. If None, trials are mutated from the search space.
+            devices (List[str], optional): Devices to run trials on. Defaults to `args.device`, then all CUDA devices,
+                then 'cpu'.
+            per_device (int | str): Maximum concurrent trials per device, or 'auto' to pack by free GPU memory.
+            grace_period (int): First rung, the number of epochs every trial trains before it can be stopped.
+            eta (int): Reduction factor between rungs and of the trials kept at each rung.
+            poll (float): Interval in seconds between polls of the running trials.
+            _callbacks (List, optional): Callback functions to be executed during tuning.
+        """
+        args = {**args} if isinstance(args, dict) else vars(get_cfg(args))
+        args["name"] = args.get("name") or "sweep"
+        super().__init__(args, _callbacks)
+        if isinstance(grid, dict):
+            grid = [dict(zip(grid.keys(), v)) for v in itertools.product(*grid.values())]
+        self.grid = grid
+        self.devices = [str(d) for d in devices] if devices else self._detect_devices(self.args.device)
+        self.per_device = per_device
+        self.rungs = [grace_period * eta**k for k in range(32) if grace_period * eta**k < self.args.epochs]
+        self.eta = eta
+        self.poll = poll
+        self.sweep_csv = self.tune_dir / "sweep_results.csv"
+        self.rung_fitness = {r: [] for r in self.rungs}
+        self.keys = list(dict.fromkeys(k for g in grid for k in g if k != "name")) if grid else list(self.space)
+        self._gpu_info = None
+        self._datasets = []  # datasets holding the shared image caches for the duration of the sweep
+
+    @staticmethod
+    def _detect_devices(device) -> List[str]:
+        """Return the devices to distribute trials over from a device argument like '0,1', 'cpu' or None."""
+        if device not in {None, ""}:
+            return [d.strip() for d in str(device).split(",") if d.strip()]
+        return [str(i) for i in range(torch.cuda.device_count())] or ["cpu"]
+
+    def _prepare_data(self) -> Optional[str]:
+        """
+        Check the dataset and build its label and image caches once for all trials.
+
+        With cache=True or cache='ram' every trial would decode its own copy of the images, so the images are cached
+        once into a shared-memory arena ('shm') kept alive by this process, which trials attach to by name.
+
+        Returns:
+            (str | None): Cache mode to pass to the trials.
+        """
+        from ultralytics.data.build import build_yolo_dataset
+        from ultralytics.data.utils import check_cls_dataset, check_det_dataset
+
+        cache = self.args.cache
+        cache = "shm" if cache is True or cache == "ram" else cache or None
+        if self.args.task == "classify":
+            check_cls_dataset(self.args.data)
+            return cache
+        data = check_det_dataset(self.args.data)
+        cfg = get_cfg(self.args, {"cache": cache})
+        for mode in ("train", "val"):
+            if data.get(mode):
+                self._datasets.append(build_yolo_dataset(cfg, data[mode], max(int(self.args.batch), 1), data, mode=mode))
+        return cache
+
+    @staticmethod
+    def _fitness(row: Dict[str, str]) -> float:
+        """Return the fitness of one results.csv row, weighted like the task's Metric.fitness()."""
+        if "metrics/accuracy_top1" in row:
+            return (float(row["metrics/accuracy_top1"]) + float(row["metrics/accuracy_top5"])) / 2
+        w = {"metrics/mAP50(": 0.1, "metrics/mAP50-95(": 0.9}
+        return sum(w[k[: k.index("(") + 1]] * float(v) for k, v in row.items() if k[: k.find("(") + 1] in w)
+
+    def _curve(self, save_dir: Path) -> List[float]:
+        """Return the best fitness so far after each epoch logged in a trial's results.csv."""
+        try:
+            with open(save_dir / "results.csv", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+        except FileNotFoundError:
+            return []
+        curve = []
+        for row in rows:
+            row = {k.strip(): v for k, v in row.items() if k and v not in {None, ""}}
+            if "epoch" in row:  # skip a row that is still being written
+                curve.append(max(curve[-1] if curve else 0.0, self._fitness(row)))
+        return curve
+
+    def _promote(self, rung: int, fitness: float) -> bool:
+        """Record a trial's fitness at a rung and return whether it is in the top 1/eta there."""
+        recorded = self.rung_fitness[rung]
+        recorded.append(fitness)
+        if len(recorded) < self.eta:  # too few trials reached this rung to compare against
+            return True
+        k = max(1, len(recorded) // self.eta)
+        return fitness >= sorted(recorded, reverse=True)[k - 1]
+
+    def _device_stats(self, device: str) -> Optional[Dict]:
+        """Return NVML stats of a GPU, or None for CPU devices or when NVML is unavailable."""
+        if self._gpu_info is None or not device.isdigit():
+            return None
+        self._gpu_info.refresh_stats()
+        return next((s for s in self._gpu_info.gpu_stats if s["index"] == int(device)), None)
+
+    def _has_slot(self, device: str, running: List[dict], baseline: Dict[str, int]) -> bool:
+        """Return whether another trial can start on a device."""
+        trials = [t for t in running if t["device"] == device]
+        if self.per_device != "auto":
+            return len(trials) < self.per_device
+        if not trials:
+            return True
+        stats = self._device_stats(device)
+        if stats is None or not all(t["curve"] for t in trials):  # no NVML, or trial memory not measured yet
+            return False
+        per_trial = max(stats["memory_used"] - baseline[device], 1) / len(trials)
+        return stats["memory_free"] > 1.2 * per_trial
+
+    def _launch(self, i: int, overrides: dict, device: str, cache) -> dict:
+        """Start trial i as a training subprocess on a device and return its state."""
+        overrides = dict(overrides)
+        name = str(overrides.pop("name", f"trial{i + 1}"))
+        train_args = {
+            **vars(self.args),
+            **overrides,
+            "project": str(self.tune_dir),
+            "name": name,
+            "exist_ok": True,
+            "val": True,  # rungs compare per-epoch validation fitness
+            "cache": cache,
+            "device": "cpu" if device == "cpu" else 0,
+        }
+        save_dir = self.tune_dir / name
+        save_dir.mkdir(parents=True, exist_ok=True)
+        (save_dir / "results.csv").unlink(missing_ok=True)
+        env = os.environ.copy()
+        if device != "cpu":  # trial only sees its GPU, numbered like NVML
+            env["CUDA_DEVICE_ORDER"] = "PCI_BUS_ID"
+            env["CUDA_VISIBLE_DEVICES"] = device
+        launch = [sys.executable, "-m", "ultralytics.cfg.__init__"]  # workaround yolo not found
+        cmd = [*launch, "train", *(f"{k}={v}" for k, v in train_args.items())]
+        log = open(save_dir / "train.log", "w", encoding="utf-8")
+        LOGGER.info(f"{self.prefix}Starting trial {i + 1} '{name}' on device {device}: {overrides}")
+        return {
+            "trial": i + 1,
+            "name": name,
+            "device": device,
+            "hyp": overrides,
+            "save_dir": save_dir,
+            "process": subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT),
+            "log": log,
+            "curve": [],
+            "rung": 0,  # index of the next rung to check
+            "t0": time.time(),
+        }
+
+    def _log(self, trial: dict, status: str) -> dict:
+        """Append a finished trial to the results table and, in mutation mode, to the tune CSV."""
+        fitness = round(trial["curve"][-1], 5) if trial["curve"] else 0.0
+        row = {
+            "trial": trial["trial"],
+            "name": trial["name"],
+            "status": status,
+            "device": trial["device"],
+            "epochs": len(trial["curve"]),
+            "fitness": fitness,
+            "wall_time_s": round(time.time() - trial["t0"], 1),
+            **{k: trial["hyp"].get(k, getattr(self.args, k, None)) for k in self.keys},
+            "save_dir": str(trial["save_dir"]),
+        }
+        header = "" if self.sweep_csv.exists() else ",".join(row) + "\n"
+        with open(self.sweep_csv, "a", encoding="utf-8") as f:
+            f.write(header + ",".join(map(str, row.values())) + "\n")
+        if self.grid is None:
+            headers = "" if self.tune_csv.exists() else (",".join(["fitness"] + list(self.space.keys())) + "\n")
+            with open(self.tune_csv, "a", encoding="utf-8") as f:
+                f.write(headers + ",".join(map(str, [fitness] + [trial["hyp"][k] for k in self.space])) + "\n")
+        LOGGER.info(
+            f"{self.prefix}Trial {row['trial']} '{row['name']}' {status} after {row['epochs']} epochs, "
+            f"fitness={fitness} ({row['wall_time_s']}s)"
+        )
+        return row
+
+    def __call__(self, model=None, iterations: int = 10, cleanup: bool = True) -> List[dict]:
+        """
+        Run all trials of the sweep, stopping poor trials at each rung.
+
+        Args:
+            model (Model): Unused, trials build the model from `args.model`.
+            iterations (int): Number of mutated trials, ignored when a grid is given.
+            cleanup (bool): Whether to delete the weights of all trials except the best one.
+
+        Returns:
+            (List[dict]): One row per trial of the results table, including trials of a resumed sweep.
+        """
+        t0 = time.time()
+        results = []
+        if self.sweep_csv.exists():  # resume, finished trials keep their rows and seed the rung statistics
+            with open(self.sweep_csv, encoding="utf-8") as f:
+                results = list(csv.DictReader(f))
+            for row in results:
+                curve = self._curve(Path(row["save_dir"]))
+                for rung in self.rungs:
+                    if len(curve) >= rung:
+                        self.rung_fitness[rung].append(curve[rung - 1])
+            LOGGER.info(f"{self.prefix}Resuming sweep {self.tune_dir} after {len(results)} finished trials...")
+        done = {row["name"] for row in results}
+        if self.grid is not None:
+            pending = [(i, g) for i, g in enumerate(self.grid) if str(g.get("name", f"trial{i + 1}")) not in done]
+        else:
+            pending = [(i, None) for i in range(len(results), iterations)]
+        if self.per_device == "auto" and any(d.isdigit() for d in self.devices):
+            from ultralytics.utils.autodevice import GPUInfo
+
+            self._gpu_info = GPUInfo()
+        baseline = {d: (self._device_stats(d) or {}).get("memory_used", 0) for d in self.devices}
+        cache = self._prepare_data()
+        LOGGER.info(
+            f"{self.prefix}Sweeping {len(pending)} trials on devices {self.devices} (per_device={self.per_device}), "
+            f"rungs at epochs {self.rungs} with eta={self.eta}"
+        )
+
+        running = []
+        try:
+            while pending or running:
+                while pending:
+                    slots = [d for d in self.devices if self._has_slot(d, running, baseline)]
+                    if not slots:
+                        break
+                    device = min(slots, key=lambda d: sum(t["device"] == d for t in running))
+                    i, overrides = pending.pop(0)
+                    if overrides is None:
+                        overrides = self._mutate(seed_defaults=bool(running or results))
+                    running.append(self._launch(i, overrides, device, cache))
+                time.sleep(self.poll)
+                for trial in list(running):
+                    trial["curve"] = self._curve(trial["save_dir"])
+                    status = None
+                    while trial["rung"] < len(self.rungs) and len(trial["curve"]) >= self.rungs[trial["rung"]]:
+                        rung = self.rungs[trial["rung"]]
+                        trial["rung"] += 1
+                        if not self._promote(rung, trial["curve"][rung - 1]):
+                            trial["process"].terminate()
+                            status = "stopped"
+                            break
+                    if status is None and trial["process"].poll() is not None:
+                        status = "done" if trial["process"].returncode == 0 else "failed"
+                    if status:
+                        trial["process"].wait()
+                        trial["log"].close()
+                        trial["curve"] = self._curve(trial["save_dir"])
+                        running.remove(trial)
+                        results.append(self._log(trial, status))
+        finally:
+            for trial in running:
+                trial["process"].terminate()
+                trial["process"].wait()
+                trial["log"].close()
+            self._datasets.clear()  # release shared image caches
+            if self._gpu_info is not None:
+                self._gpu_info.shutdown()
+
+        if not results:
+            return results
+        best = max(results, key=lambda r: float(r["fitness"]))
+        if cleanup:
+            for row in results:
+                if row["name"] != best["name"]:
+                    shutil.rmtree(Path(row["save_dir"]) / "weights", ignore_errors=True)
+        if self.grid is None and self.args.plots:
+            plot_tune_results(self.tune_csv)
+        header = (
+            f"{self.prefix}{len(results)} trials complete ✅ ({time.time() - t0:.2f}s)\n"
+            f"{self.prefix}Results saved to {colorstr('bold', self.sweep_csv)}\n"
+            f"{self.prefix}Best fitness={best['fitness']} observed at trial {best['trial']} '{best['name']}'\n"
+            f"{self.prefix}Best fitness model is {best['save_dir']}\n"
+            f"{self.prefix}Best fitness hyperparameters are printed below.\n"
+        )
+        LOGGER.info("\n" + header)
+        YAML.save(
+            self.tune_dir / "best_hyperparameters.yaml",
+            data={k: best[k] for k in self.keys},
+            header=remove_colorstr(header.replace(self.prefix, "# ")) + "\n",
+        )
+        YAML.print(self.tune_dir / "best_hyperparameters.yaml")
+        return results
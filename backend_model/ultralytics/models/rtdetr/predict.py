@@ -24,6 +24,7 @@ class RTDETRPredictor(BasePredictor):
     Methods:
         postprocess: Postprocess raw model predictions to generate bounding boxes and confidence scores.
         pre_transform: Pre-transform input images before feeding them into the model for inference.
+        static_transform: Return the square scale-fill letterbox shared by all images.
 
     Examples:
         >>> from ultralytics.utils import ASSETS
@@ -89,3 +90,7 @@ class RTDETRPredictor(BasePredictor):
         """
         letterbox = LetterBox(self.imgsz, auto=False, scale_fill=True)
         return [letterbox(image=x) for x in im]
+
+    def static_transform(self):
+        """Return the square scale-fill LetterBox of `pre_transform`, shared by all images of a batch."""
+        return LetterBox(self.imgsz, auto=False, scale_fill=True)
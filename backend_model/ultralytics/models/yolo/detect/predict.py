@@ -1,7 +1,11 @@
 # Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
 
+import numpy as np
+import torch
+
+from ultralytics.data.augment import LetterBox
 from ultralytics.engine.predictor import BasePredictor
-from ultralytics.engine.results import Results
+from ultralytics.engine.results import BatchResults, Results
 from ultralytics.utils import ops
 
 
@@ -18,8 +22,13 @@ class DetectionPredictor(BasePredictor):
         batch (list): Batch of images and metadata for processing.
 
     Methods:
+        pre_transform: Letterbox input images, or their tiles if `slice` is set.
+        static_transform: Return the letterbox shared by all images of a batch, unless sliced.
+        slice_windows: Return the tile windows of an image for sliced inference.
         postprocess: Process raw model predictions into detection results.
+        merge_slices: Build Results objects by merging the predictions of all tiles of each image.
         construct_results: Build Results objects from processed predictions.
+        construct_batch_results: Build one BatchResults from the detections of the whole batch.
         construct_result: Create a single Result object from a prediction.
         get_obj_feats: Extract object features from the feature maps.
 
@@ -29,14 +38,74 @@ class DetectionPredictor(BasePredictor):
         >>> args = dict(model="yolo11n.pt", source=ASSETS)
         >>> predictor = DetectionPredictor(overrides=args)
         >>> predictor.predict_cli()
+
+        Sliced inference on large images, tiles of 640 pixels overlapping by 20% in one forward pass:
+        >>> args = dict(model="yolo11n.pt", source="panel.jpg", slice=(640, 0.2))
+        >>> predictor = DetectionPredictor(overrides=args)
+        >>> predictor.predict_cli()
     """
 
+    @property
+    def sliced(self) -> bool:
+        """Whether images are cut into tiles for sliced inference, only supported for axis-aligned detection."""
+        return bool(self.args.slice) and self.args.task == "detect"
+
+    @property
+    def batched_results(self) -> bool:
+        """Whether detections are returned as one BatchResults per batch, not supported when tracking or slicing."""
+        return (
+            bool(self.args.batch_results)
+            and self.args.task == "detect"
+            and not self.sliced
+            and not hasattr(self, "trackers")  # trackers update Results of each image in place
+        )
+
+    def slice_windows(self, shape) -> np.ndarray:
+        """
+        Return the tile windows of an image for sliced inference, followed by the full image if it has several tiles.
+
+        Args:
+            shape (tuple): Image shape (height, width, ...).
+
+        Returns:
+            (np.ndarray): Windows in xyxy pixel format with shape (num_windows, 4).
+        """
+        tile, overlap = (self.args.slice, 0.2) if isinstance(self.args.slice, int) else self.args.slice
+        windows = ops.slice_windows(shape[:2], int(tile), float(overlap))
+        if len(windows) > 1:  # full image pass for objects larger than a tile
+            windows = np.concatenate((windows, [[0, 0, shape[1], shape[0]]]))
+        return windows
+
+    def pre_transform(self, im):
+        """
+        Pre-transform input images before inference.
+
+        With `slice` set every image is cut into overlapping tiles, each letterboxed to imgsz, so all tiles of the
+        batch run through the model in a single forward pass.
+
+        Args:
+            im (List[np.ndarray]): List of images with shape [(H, W, 3) x N].
+
+        Returns:
+            (List[np.ndarray]): List of transformed images, or tiles of all images in order if sliced.
+        """
+        if not self.sliced:
+            return super().pre_transform(im)
+        letterbox = LetterBox(self.imgsz, auto=False, stride=self.model.stride)
+        return [letterbox(image=x[y1:y2, x1:x2]) for x in im for x1, y1, x2, y2 in self.slice_windows(x.shape)]
+
+    def static_transform(self):
+        """Return the letterbox of unsliced same-shape batches, or None if sliced or `pre_transform` is overridden."""
+        if self.sliced or type(self).pre_transform is not DetectionPredictor.pre_transform:
+            return None
+        return self._letterbox(same_shapes=True)
+
     def postprocess(self, preds, img, orig_imgs, **kwargs):
         """
         Post-process predictions and return a list of Results objects.
 
         This method applies non-maximum suppression to raw model predictions and prepares them for visualization and
-        further analysis.
+        further analysis. Axis-aligned boxes use the loop-free batched NMS, OBB and end-to-end models the per-image path.
 
         Args:
             preds (torch.Tensor): Raw predictions from the model.
@@ -45,7 +114,8 @@ class DetectionPredictor(BasePredictor):
             **kwargs (Any): Additional keyword arguments.
 
         Returns:
-            (list): List of Results objects containing the post-processed predictions.
+            (list | BatchResults): List of Results objects containing the post-processed predictions, or a single
+                BatchResults if `batch_results` is set.
 
         Examples:
             >>> predictor = DetectionPredictor(overrides=dict(model="yolo11n.pt"))
@@ -53,21 +123,30 @@ class DetectionPredictor(BasePredictor):
             >>> processed_results = predictor.postprocess(preds, img, orig_imgs)
         """
         save_feats = getattr(self, "_feats", None) is not None
-        preds = ops.non_max_suppression(
-            preds,
-            self.args.conf,
-            self.args.iou,
-            self.args.classes,
-            self.args.agnostic_nms,
+        nms_args = dict(
+            conf_thres=self.args.conf,
+            iou_thres=self.args.iou,
+            classes=self.args.classes,
+            agnostic=self.args.agnostic_nms,
             max_det=self.args.max_det,
             nc=0 if self.args.task == "detect" else len(self.model.names),
-            end2end=getattr(self.model, "end2end", False),
-            rotated=self.args.task == "obb",
             return_idxs=save_feats,
         )
+        end2end = getattr(self.model, "end2end", False)
+        if end2end or self.args.task == "obb":
+            preds = ops.non_max_suppression(preds, end2end=end2end, rotated=self.args.task == "obb", **nms_args)
+        elif self.batched_results and not save_feats:
+            x, counts = ops.batched_non_max_suppression(preds, flat=True, **nms_args)
+            if not isinstance(orig_imgs, list):
+                orig_imgs = ops.convert_torch2numpy_batch(orig_imgs)
+            return self.construct_batch_results(x, counts, img, orig_imgs)
+        else:
+            preds = ops.batched_non_max_suppression(preds, **nms_args)
 
         if not isinstance(orig_imgs, list):  # input images are a torch.Tensor, not a list
             orig_imgs = ops.convert_torch2numpy_batch(orig_imgs)
+        elif self.sliced:  # predictions are per tile
+            return self.merge_slices(preds[0] if save_feats else preds, img, orig_imgs)
 
         if save_feats:
             obj_feats = self.get_obj_feats(self._feats, preds[1])
@@ -81,6 +160,37 @@ class DetectionPredictor(BasePredictor):
 
         return results
 
+    def merge_slices(self, preds, img, orig_imgs):
+        """
+        Shift tile predictions back to image coordinates and merge them across tile seams for each image.
+
+        Args:
+            preds (List[torch.Tensor]): Post-NMS predictions of every tile of the batch with shape (N, 6).
+            img (torch.Tensor): Batch of preprocessed tiles used for inference.
+            orig_imgs (List[np.ndarray]): List of original images before slicing.
+
+        Returns:
+            (List[Results]): List of Results objects with the merged detections of each image.
+        """
+        results, k = [], 0
+        for orig_img, img_path in zip(orig_imgs, self.batch[0]):
+            dets = []
+            for x1, y1, x2, y2 in self.slice_windows(orig_img.shape).tolist():
+                pred = preds[k][:, :6]
+                pred[:, :4] = ops.scale_boxes(img.shape[2:], pred[:, :4], (y2 - y1, x2 - x1))
+                pred[:, :4] += pred.new_tensor([x1, y1, x1, y1])
+                dets.append(pred)
+                k += 1
+            pred = ops.merge_sliced_boxes(
+                torch.cat(dets),
+                iou_thres=self.args.iou,
+                mode=self.args.slice_merge,
+                agnostic=self.args.agnostic_nms,
+                max_det=self.args.max_det,
+            )
+            results.append(Results(orig_img, path=img_path, names=self.model.names, boxes=pred))
+        return results
+
     def get_obj_feats(self, feat_maps, idxs):
         """Extract object features from the feature maps."""
         import torch
@@ -108,6 +218,31 @@ class DetectionPredictor(BasePredictor):
             for pred, orig_img, img_path in zip(preds, orig_imgs, self.batch[0])
         ]
 
+    def construct_batch_results(self, x, counts, img, orig_imgs):
+        """
+        Construct a single BatchResults object from the detections of the whole batch.
+
+        Boxes are scaled to original image coordinates in one call when all images share a shape, else per image slice.
+
+        Args:
+            x (torch.Tensor): Detections of all images with shape (N, 6), grouped by image.
+            counts (List[int]): Number of detections of each image.
+            img (torch.Tensor): Batch of preprocessed images used for inference.
+            orig_imgs (List[np.ndarray]): List of original images before preprocessing.
+
+        Returns:
+            (BatchResults): Detections of the batch, with per-image Results built on demand.
+        """
+        shapes = [orig_img.shape for orig_img in orig_imgs]
+        if all(shape[:2] == shapes[0][:2] for shape in shapes):
+            x[:, :4] = ops.scale_boxes(img.shape[2:], x[:, :4], shapes[0])
+        else:
+            a = 0
+            for n, shape in zip(counts, shapes):
+                x[a : a + n, :4] = ops.scale_boxes(img.shape[2:], x[a : a + n, :4], shape)
+                a += n
+        return BatchResults(x[:, :6], counts, orig_imgs, paths=self.batch[0], names=self.model.names)
+
     def construct_result(self, pred, img, orig_img, img_path):
         """
         Construct a single Results object from one image prediction.
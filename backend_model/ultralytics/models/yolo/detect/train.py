@@ -9,6 +9,7 @@ import numpy as np
 import torch.nn as nn
 
 from ultralytics.data import build_dataloader, build_yolo_dataset
+from ultralytics.data.augment import BatchAugment
 from ultralytics.engine.trainer import BaseTrainer
 from ultralytics.models import yolo
 from ultralytics.nn.tasks import DetectionModel
@@ -29,6 +30,7 @@ class DetectionTrainer(BaseTrainer):
         model (DetectionModel): The YOLO detection model being trained.
         data (Dict): Dictionary containing dataset information including class names and number of classes.
         loss_names (tuple): Names of the loss components used in training (box_loss, cls_loss, dfl_loss).
+        batch_augment (BatchAugment | None): Batch augmentation applied on the training device if batch_augment=True.
 
     Methods:
         build_dataset: Build YOLO dataset for training or validation.
@@ -87,11 +89,28 @@ class DetectionTrainer(BaseTrainer):
             LOGGER.warning("'rect=True' is incompatible with DataLoader shuffle, setting shuffle=False")
             shuffle = False
         workers = self.args.workers if mode == "train" else self.args.workers * 2
+        if mode == "train":
+            self.batch_augment = None
+            if self.args.batch_augment and self.args.task != "detect":
+                LOGGER.warning(f"batch_augment=True is only supported for task=detect, not {self.args.task}, ignoring")
+            elif self.args.batch_augment:
+                self.batch_augment = BatchAugment(
+                    degrees=self.args.degrees,
+                    translate=0.0,  # applied by the dataset as a random crop
+                    scale=self.args.scale,
+                    shear=self.args.shear,
+                    perspective=self.args.perspective,
+                    hgain=self.args.hsv_h,
+                    sgain=self.args.hsv_s,
+                    vgain=self.args.hsv_v,
+                    flipud=self.args.flipud,
+                    fliplr=self.args.fliplr,
+                )
         return build_dataloader(dataset, batch_size, workers, shuffle, rank)  # return dataloader
 
     def preprocess_batch(self, batch: Dict) -> Dict:
         """
-        Preprocess a batch of images by scaling and converting to float.
+        Preprocess a batch of images by scaling and converting to float, then apply batch augmentation if enabled.
 
         Args:
             batch (Dict): Dictionary containing batch data with 'img' tensor.
@@ -100,6 +119,8 @@ class DetectionTrainer(BaseTrainer):
             (Dict): Preprocessed batch with normalized images.
         """
         batch["img"] = batch["img"].to(self.device, non_blocking=True).float() / 255
+        if self.batch_augment is not None:
+            batch = self.batch_augment(batch)
         if self.args.multi_scale:
             imgs = batch["img"]
             sz = (
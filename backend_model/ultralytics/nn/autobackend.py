@@ -2,9 +2,11 @@
 
 import ast
 import json
+import os
 import platform
 import zipfile
 from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -67,6 +69,26 @@ def default_class_names(data: Optional[Union[str, Path]] = None) -> Dict[int, st
     return {i: f"class{i}" for i in range(999)}  # return default if above errors
 
 
+def cpu_core_groups(streams: int) -> List[List[int]]:
+    """
+    Split the CPU cores available to this process into contiguous groups, one per inference stream.
+
+    Args:
+        streams (int): Number of groups wanted, capped at the number of available cores.
+
+    Returns:
+        (List[List[int]]): Logical core IDs of each group, with sizes differing by at most one.
+    """
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    return [g.tolist() for g in np.array_split(cores, max(min(streams, len(cores)), 1))]
+
+
+def _pin_thread(cores: List[int]) -> None:
+    """Pin the calling thread, and threads it creates later, to the given cores where supported (Linux)."""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+
 class AutoBackend(nn.Module):
     """
     Handle dynamic backend selection for running inference using Ultralytics YOLO models.
@@ -142,6 +164,8 @@ class AutoBackend(nn.Module):
         batch: int = 1,
         fuse: bool = True,
         verbose: bool = True,
+        autotune: Union[bool, int, List[int], Dict] = False,
+        streams: int = 0,
     ):
         """
         Initialize the AutoBackend for inference.
@@ -155,10 +179,30 @@ class AutoBackend(nn.Module):
             batch (int): Batch-size to assume for inference.
             fuse (bool): Fuse Conv2D + BatchNorm layers for optimization.
             verbose (bool): Enable verbose logging.
+            autotune (bool | int | List[int] | dict): Load the fastest backend measured for *.pt weights on this host
+                by `ultralytics.utils.autotune.autotune()` if a profile exists. True accepts a profile tuned at any
+                image size, an image size only a profile tuned at that size. A profile winner dict is loaded directly.
+            streams (int): CPU inference streams for dynamic ONNX Runtime and OpenVINO models. Each stream runs its share
+                of a batch as a separate in-flight request on its own group of cores, 0 runs batches as one request.
         """
         super().__init__()
         w = str(weights[0] if isinstance(weights, list) else weights)
         nn_module = isinstance(weights, torch.nn.Module)
+        ov_mode = None  # OpenVINO performance hint chosen by autotune
+        if autotune is not False:
+            from ultralytics.utils.autotune import load_profile
+
+            if isinstance(autotune, dict):
+                tuned = autotune
+            else:
+                src = getattr(weights, "pt_path", None) if nn_module else w
+                tuned = load_profile(src, autotune, device.type if isinstance(device, torch.device) else "cpu")
+            if tuned:
+                if verbose and not isinstance(autotune, dict):
+                    LOGGER.info(f"Loading autotuned {tuned['name']} backend {tuned['file']}...")
+                weights = w = str(tuned["file"])
+                nn_module = False
+                ov_mode = tuned.get("ov_mode")
         (
             pt,
             jit,
@@ -183,6 +227,7 @@ class AutoBackend(nn.Module):
         stride, ch = 32, 3  # default stride and channels
         end2end, dynamic = False, False
         model, metadata, task = None, None, None
+        ort_streams, ov_queue = [], None  # CPU inference streams
 
         # Set device
         cuda = isinstance(device, torch.device) and torch.cuda.is_available() and device.type != "cpu"  # use CUDA
@@ -294,6 +339,25 @@ class AutoBackend(nn.Module):
                         buffer_ptr=y_tensor.data_ptr(),
                     )
                     bindings.append(y_tensor)
+            if streams and onnx and dynamic and not cuda:
+                # One session per stream, created on a worker thread pinned to the stream's cores so that its intra-op
+                # threads inherit the pinning. session.run releases the GIL, so all streams' requests run concurrently
+                for group in cpu_core_groups(streams):
+                    options = onnxruntime.SessionOptions()
+                    options.intra_op_num_threads = len(group)
+                    options.inter_op_num_threads = 1
+                    if len(group) > 1 and LINUX:  # ORT pins the extra intra-op threads, logical processors count from 1
+                        cores = ",".join(str(c + 1) for c in group)
+                        options.add_session_config_entry(
+                            "session.intra_op_thread_affinities", ";".join([cores] * (len(group) - 1))
+                        )
+                    pool = ThreadPoolExecutor(1, "ort-stream", initializer=_pin_thread, initargs=(group,))
+                    stream = pool.submit(onnxruntime.InferenceSession, w, options, providers=providers).result()
+                    ort_streams.append((pool, stream))
+                session = ort_streams[0][1]
+                LOGGER.info(f"Using {len(ort_streams)} ONNX Runtime CPU streams on cores {cpu_core_groups(streams)}")
+            elif streams:
+                LOGGER.warning("ONNX Runtime CPU streams require a CPU device and a dynamic model, ignoring 'streams'.")
 
         # OpenVINO
         elif xml:
@@ -317,13 +381,17 @@ class AutoBackend(nn.Module):
                 ov_model.get_parameters()[0].set_layout(ov.Layout("NCHW"))
 
             # OpenVINO inference modes are 'LATENCY', 'THROUGHPUT' (not recommended), or 'CUMULATIVE_THROUGHPUT'
-            inference_mode = "CUMULATIVE_THROUGHPUT" if batch > 1 else "LATENCY"
+            inference_mode = ov_mode or ("CUMULATIVE_THROUGHPUT" if batch > 1 else "LATENCY")
+            config = {"PERFORMANCE_HINT": inference_mode}
+            if streams and device_name in {"AUTO", "CPU"}:  # pinned CPU streams, one async infer request in flight each
+                inference_mode = "THROUGHPUT"
+                device_name = "CPU"
+                n = len(cpu_core_groups(streams))
+                config = {"PERFORMANCE_HINT": inference_mode, "NUM_STREAMS": n, "ENABLE_CPU_PINNING": True}
             LOGGER.info(f"Using OpenVINO {inference_mode} mode for batch={batch} inference...")
-            ov_compiled_model = core.compile_model(
-                ov_model,
-                device_name=device_name,
-                config={"PERFORMANCE_HINT": inference_mode},
-            )
+            ov_compiled_model = core.compile_model(ov_model, device_name=device_name, config=config)
+            if "NUM_STREAMS" in config:
+                ov_queue = ov.AsyncInferQueue(ov_compiled_model, config["NUM_STREAMS"])
             input_name = ov_compiled_model.input().get_any_name()
             metadata = w.parent / "metadata.yaml"
 
@@ -651,7 +719,16 @@ class AutoBackend(nn.Module):
 
         # ONNX Runtime
         elif self.onnx or self.imx:
-            if self.dynamic:
+            if self.ort_streams:
+                im = im.cpu().numpy()  # torch to numpy
+                name = self.session.get_inputs()[0].name
+                chunks = np.array_split(im, min(len(self.ort_streams), len(im)))
+                futures = [
+                    pool.submit(session.run, self.output_names, {name: x})
+                    for (pool, session), x in zip(self.ort_streams, chunks)
+                ]
+                y = [np.concatenate(x) for x in zip(*(f.result() for f in futures))]
+            elif self.dynamic:
                 im = im.cpu().numpy()  # torch to numpy
                 y = self.session.run(self.output_names, {self.session.get_inputs()[0].name: im})
             else:
@@ -684,7 +761,7 @@ class AutoBackend(nn.Module):
                     results[userdata] = request.results
 
                 # Create AsyncInferQueue, set the callback and start asynchronous inference for each input image
-                async_queue = self.ov.AsyncInferQueue(self.ov_compiled_model)
+                async_queue = self.ov_queue or self.ov.AsyncInferQueue(self.ov_compiled_model)
                 async_queue.set_callback(callback)
                 for i in range(n):
                     # Start async inference with userdata=i to specify the position in results list
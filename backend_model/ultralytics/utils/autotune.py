@@ -0,0 +1,255 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""
+Functions for measuring which inference backend is fastest for a model on this host and loading it automatically.
+
+Examples:
+    Export best.pt to every format available offline, benchmark them at the production batch sizes and save a profile.
+    >>> from ultralytics.utils.autotune import autotune
+    >>> profile = autotune("runs/detect/train/weights/best.pt", source="datasets/pcb/images", batch_sizes=(1, 8))
+
+    Predictions with autotune=True then load the winner instead of the PyTorch weights.
+    >>> from ultralytics import YOLO
+    >>> results = YOLO("runs/detect/train/weights/best.pt").predict("image.jpg", autotune=True)
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import torch
+
+from ultralytics.utils import ASSETS, LOGGER, USER_CONFIG_DIR, colorstr
+
+PREFIX = colorstr("AutoTune: ")
+PROFILE_DIR = USER_CONFIG_DIR / "autotune"  # host-local, one profile per weights file content
+
+# name: (export format, export arguments, OpenVINO performance hint, static batch)
+CANDIDATES = {
+    "torchscript": ("torchscript", {}, None, False),
+    "onnx": ("onnx", {"dynamic": True}, None, False),  # dynamic shapes, session.run() per call
+    "onnx-iobinding": ("onnx", {"dynamic": False}, None, True),  # static shapes, IO binding on CUDA
+    "openvino-latency": ("openvino", {"dynamic": True}, "LATENCY", False),
+    "openvino-throughput": ("openvino", {"dynamic": True}, "THROUGHPUT", False),  # async infer requests per image
+}
+REQUIREMENTS = {"torchscript": (), "onnx": ("onnx", "onnxruntime"), "openvino": ("openvino",)}
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def profile_path(weights: Union[str, Path]) -> Path:
+    """Return the path of this host's autotune profile for a weights file."""
+    return PROFILE_DIR / f"{file_hash(weights)[:16]}.json"
+
+
+def _same_imgsz(a, b) -> bool:
+    """Compare image sizes given as int or [h, w]."""
+    a, b = ([x, x] if isinstance(x, int) else list(x) for x in (a, b))
+    return a == b
+
+
+def load_profile(
+    weights: Union[str, Path], imgsz: Union[bool, int, Sequence[int]] = True, device: str = "cpu"
+) -> Optional[Dict]:
+    """
+    Return the winning backend of this host's autotune profile for a weights file, if one applies.
+
+    Args:
+        weights (str | Path): Path to the *.pt weights the profile was tuned for.
+        imgsz (bool | int | Sequence[int]): Image size inference will run at, or True to accept any tuned size.
+        device (str): Device type inference will run on, 'cpu' or 'cuda'.
+
+    Returns:
+        (dict | None): Winner with 'name', 'format', 'file' and 'ov_mode' keys, or None if there is no profile, it was
+            tuned for another image size or device, the winner is PyTorch itself or its exported file is missing.
+    """
+    if not weights or not str(weights).endswith(".pt") or not Path(weights).is_file():
+        return None
+    f = profile_path(weights)
+    if not f.is_file():
+        return None
+    profile = json.loads(f.read_text())
+    winner = profile.get("winner")
+    if (
+        not winner
+        or winner["name"] == "pytorch"
+        or profile["device"] != device
+        or (imgsz is not True and not _same_imgsz(imgsz, profile["imgsz"]))
+        or not Path(winner["file"]).exists()
+    ):
+        return None
+    return winner
+
+
+def _sample_batch(source, imgsz: int, n: int) -> torch.Tensor:
+    """Letterbox up to n images from a directory or list of files into a float BCHW tensor, repeating if needed."""
+    import cv2
+
+    from ultralytics.data.augment import LetterBox
+    from ultralytics.data.utils import IMG_FORMATS
+
+    files = [Path(source)] if Path(source).is_file() else sorted(Path(source).rglob("*"))
+    files = [f for f in files if f.suffix[1:].lower() in IMG_FORMATS][:n]
+    assert files, f"no images found in {source}"
+    letterbox = LetterBox((imgsz, imgsz), auto=False)
+    ims = [letterbox(image=cv2.imread(str(f)))[..., ::-1].transpose(2, 0, 1) for f in files]
+    ims = [ims[i % len(ims)] for i in range(n)]
+    return torch.from_numpy(np.ascontiguousarray(np.stack(ims))).float() / 255
+
+
+def _time(backend, im: torch.Tensor, runs: int, warmup: int):
+    """Return the first output of a backend on im and its median latency in ms over several runs."""
+    for _ in range(warmup):
+        backend(im)
+    dt = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        y = backend(im)
+        dt.append(time.perf_counter() - t)
+    y = y[0] if isinstance(y, (list, tuple)) else y
+    return torch.as_tensor(y).float().cpu().clone(), float(np.median(dt) * 1e3)
+
+
+def autotune(
+    weights: Union[str, Path],
+    source=ASSETS,
+    batch_sizes: Sequence[int] = (1,),
+    imgsz: int = 640,
+    device: str = "cpu",
+    candidates: Optional[List[str]] = None,
+    rtol: float = 1e-3,
+    runs: int = 20,
+    warmup: int = 3,
+) -> Dict:
+    """
+    Export weights to every backend available offline, benchmark them and save the fastest as this host's profile.
+
+    Every candidate is benchmarked at each batch size on images from `source` and its first output is compared against
+    PyTorch. Candidates whose maximum absolute error exceeds `rtol` times the largest PyTorch output magnitude are
+    rejected. The winner is the candidate that ran and matched at every batch size with the lowest mean latency per
+    image, so it can serve any of these batch sizes, with PyTorch as the fallback. Exports are written next to the
+    weights in a '<stem>_autotune' directory, the profile to the user config directory keyed by the weights content.
+
+    Args:
+        weights (str | Path): Path to the *.pt weights to tune, e.g. the deployed best.pt.
+        source (str | Path): Image file or directory of sample images, e.g. PCB images from production.
+        batch_sizes (Sequence[int]): Batch sizes used in production.
+        imgsz (int): Inference image size.
+        device (str): Device to benchmark on, e.g. 'cpu' or '0'.
+        candidates (List[str], optional): Names from CANDIDATES to try, defaults to all whose packages are installed.
+        rtol (float): Parity tolerance relative to the largest PyTorch output magnitude.
+        runs (int): Timed runs per candidate and batch size.
+        warmup (int): Untimed warmup runs per candidate and batch size.
+
+    Returns:
+        (dict): The saved profile with per-candidate 'results', per-batch winners in 'batches' and the overall 'winner'.
+    """
+    from ultralytics import YOLO
+    from ultralytics.nn.autobackend import AutoBackend
+    from ultralytics.utils.torch_utils import select_device
+
+    weights = Path(weights).resolve()
+    torch_device = select_device(device, verbose=False)
+    out_dir = weights.parent / f"{weights.stem}_autotune"
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True)
+    available = [
+        name
+        for name, (fmt, *_) in CANDIDATES.items()
+        if all(importlib.util.find_spec(r) for r in REQUIREMENTS[fmt]) and (candidates is None or name in candidates)
+    ]
+    LOGGER.info(f"{PREFIX}Tuning {weights} at imgsz={imgsz}, batch sizes {list(batch_sizes)} with {available}")
+    inputs = {b: _sample_batch(source, imgsz, b) for b in batch_sizes}
+
+    def build(name: str, batch: int):
+        """Export a candidate (once per distinct export) and load it with AutoBackend."""
+        fmt, kwargs, ov_mode, static = CANDIDATES[name]
+        key = f"{fmt}-{'static-b' + str(batch) if static else 'dynamic' if kwargs.get('dynamic') else 'b1'}"
+        if key not in exports:
+            alias = out_dir / f"{key}.pt"
+            try:
+                os.link(weights, alias)
+            except OSError:
+                shutil.copy2(weights, alias)
+            try:
+                exports[key] = YOLO(alias).export(
+                    format=fmt, imgsz=imgsz, batch=batch if static else 1, device=device, verbose=False, **kwargs
+                )
+            finally:
+                alias.unlink()
+        tuned = {"name": name, "file": exports[key], "ov_mode": ov_mode}
+        return AutoBackend(exports[key], torch_device, batch=batch, verbose=False, autotune=tuned), exports[key], ov_mode
+
+    exports, results = {}, []
+    reference = AutoBackend(str(weights), device=torch_device, batch=max(batch_sizes), fuse=True, verbose=False)
+    for b, im in inputs.items():
+        im = im.to(torch_device)
+        y0, ms = _time(reference, im, runs, warmup)
+        scale = y0.abs().max().item() or 1.0
+        row = {"name": "pytorch", "format": "pt", "file": str(weights), "ov_mode": None, "batch": b}
+        results.append(dict(row, ms=ms, ms_per_image=ms / b, max_rel_err=0.0, parity=True, error=None))
+        for name in available:
+            row = {"name": name, "format": CANDIDATES[name][0], "file": None, "ov_mode": None, "batch": b}
+            try:
+                backend, row["file"], row["ov_mode"] = build(name, b)
+                y, ms = _time(backend, im, runs, warmup)
+                err = (y - y0).abs().max().item() / scale if y.shape == y0.shape else float("inf")
+                row.update(ms=ms, ms_per_image=ms / b, max_rel_err=err, parity=err <= rtol, error=None)
+            except Exception as e:
+                row.update(ms=None, ms_per_image=None, max_rel_err=None, parity=False, error=str(e).splitlines()[0])
+            results.append(row)
+
+    def winner_of(rows):
+        """Return the valid candidate with the lowest mean latency per image over the given rows."""
+        valid, batches = {}, {r["batch"] for r in rows}
+        for name in ["pytorch", *available]:
+            if CANDIDATES.get(name, (None, None, None, False))[3] and len(batches) > 1:
+                continue  # static shapes, a different export per batch size
+            ms = [r["ms_per_image"] for r in rows if r["name"] == name and r["parity"]]
+            if len(ms) == len(batches):
+                valid[name] = float(np.mean(ms))
+        name = min(valid, key=valid.get)
+        row = next(r for r in rows if r["name"] == name)
+        return dict({k: row[k] for k in ("name", "format", "file", "ov_mode")}, ms_per_image=valid[name])
+
+    profile = {
+        "host": platform.node(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "weights": str(weights),
+        "sha256": file_hash(weights),
+        "imgsz": imgsz,
+        "device": torch_device.type,
+        "batch_sizes": list(batch_sizes),
+        "rtol": rtol,
+        "results": results,
+        "batches": {str(b): winner_of([r for r in results if r["batch"] == b])["name"] for b in batch_sizes},
+        "winner": winner_of(results),
+    }
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    f = PROFILE_DIR / f"{profile['sha256'][:16]}.json"
+    f.write_text(json.dumps(profile, indent=2))
+
+    s = [f"\n{'Backend':<22}{'Batch':>6}{'ms/img':>10}{'Rel err':>10}  Status"]
+    for r in results:
+        status = "❌ " + r["error"] if r["error"] else "✅" if r["parity"] else "❌ parity"
+        err = f"{r['max_rel_err']:.1e}" if r["max_rel_err"] is not None else "-"
+        ms = f"{r['ms_per_image']:.2f}" if r["ms_per_image"] is not None else "-"
+        s.append(f"{r['name']:<22}{r['batch']:>6}{ms:>10}{err:>10}  {status}")
+    LOGGER.info(
+        "\n".join(s) + f"\n{PREFIX}Winner on {profile['host']} is {profile['winner']['name']} "
+        f"({profile['winner']['ms_per_image']:.2f} ms/img), profile saved to {colorstr('bold', f)}"
+    )
+    return profile
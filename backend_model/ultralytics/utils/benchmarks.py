@@ -6,6 +6,8 @@ Usage:
     from ultralytics.utils.benchmarks import ProfileModels, benchmark
     ProfileModels(['yolo11n.yaml', 'yolov8s.yaml']).run()
     benchmark(model='yolo11n.pt', imgsz=160)
+    benchmark_image_cache(data='path/to/images', imgsz=640)
+    benchmark_sliced_inference(model='yolo11n.pt', source='panel.jpg', tiles=(None, 1280, 640, 320))
 
 Format                  | `format=argument`         | Model
 ---                     | ---                       | ---
@@ -211,6 +213,134 @@ def benchmark(
     return df
 
 
+def benchmark_image_cache(
+    data=ASSETS,
+    imgsz=640,
+    caches=(False, "disk", "chunked", "chunked:lz4", "chunked:zstd"),
+    n=1000,
+    passes=3,
+):
+    """
+    Benchmark dataset image caches on disk for build time, disk usage and image load time.
+
+    Images are copied to a temporary directory and loaded through YOLODataset.load_image() as during training, so
+    cache='disk' (one full-resolution *.npy file per image) is compared against the chunked caches, which store
+    resized images in a few large chunk files. Reads are served from the OS page cache after the first pass.
+
+    Args:
+        data (str | Path): Directory of images to benchmark.
+        imgsz (int): Image size for the dataset.
+        caches (tuple): Cache options to compare, False loads and decodes the original images.
+        n (int): Maximum number of images to use.
+        passes (int): Number of passes over the images to average load time over.
+
+    Returns:
+        (pandas.DataFrame): A pandas DataFrame with build time, disk size, number of files and load time per cache.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_image_cache
+        >>> benchmark_image_cache(data="datasets/coco8/images/train", imgsz=640)
+    """
+    import tempfile
+
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    from ultralytics.data import YOLODataset
+    from ultralytics.data.utils import IMG_FORMATS
+
+    files = sorted(f for f in Path(data).iterdir() if f.suffix[1:].lower() in IMG_FORMATS)[:n]
+    assert files, f"No images found in {data}"
+    y = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for cache in caches:
+            root = Path(tmp) / str(cache).replace(":", "_")
+            (root / "images").mkdir(parents=True)
+            for f in files:
+                shutil.copy(f, root / "images" / f.name)
+            kwargs = dict(img_path=str(root / "images"), data={"names": {0: "item"}, "channels": 3}, imgsz=imgsz)
+            try:
+                YOLODataset(**kwargs)  # scan labels first, build time covers caching only
+                t = time.perf_counter()
+                dataset = YOLODataset(cache=cache, **kwargs)
+                build = time.perf_counter() - t
+                assert dataset.cache or not cache, f"cache='{cache}' not built"
+                cached = [*(root / "images").glob("*.npy"), *root.glob("*.imcache/*.bin")]
+                t = time.perf_counter()
+                for _ in range(passes):
+                    for i in range(dataset.ni):
+                        dataset.load_image(i)
+                dt = (time.perf_counter() - t) / passes / dataset.ni * 1000
+                size = sum(x.stat().st_size for x in cached) / (1 << 20)
+                y.append([str(cache), "✅", round(build, 2), round(size, 1), len(cached), round(dt, 2)])
+            except Exception as e:
+                LOGGER.error(f"Image cache benchmark failure for cache='{cache}': {e}")
+                y.append([str(cache), "❌", None, None, None, None])
+
+    df = pd.DataFrame(y, columns=["Cache", "Status❔", "Build (s)", "Size (MB)", "Files", "Load time (ms/im)"])
+    LOGGER.info(f"\nImage cache benchmarks complete for {len(files)} images at imgsz={imgsz}\n{df.fillna('-')}\n")
+    return df
+
+
+def benchmark_sliced_inference(
+    model=WEIGHTS_DIR / "yolo11n.pt",
+    source=ASSETS / "bus.jpg",
+    imgsz=640,
+    tiles=(None, 1280, 960, 640, 320),
+    overlap=0.2,
+    panel_size=(3000, 4000),
+    device="cpu",
+    half=False,
+    runs=5,
+):
+    """
+    Benchmark sliced inference throughput against the number of tiles per image.
+
+    The source image is resized to `panel_size` to simulate a large panel, then predicted with every tile size. All
+    tiles of an image run through the model in one forward pass, so time grows with the tile count while small
+    objects keep more pixels.
+
+    Args:
+        model (str | Path): Path to the model file.
+        source (str | Path): Image to benchmark on.
+        imgsz (int): Inference size each tile is letterboxed to.
+        tiles (tuple): Tile sizes in pixels to compare, None predicts the whole image without slicing.
+        overlap (float): Overlap between neighbouring tiles as a fraction of the tile size.
+        panel_size (tuple, optional): Size (height, width) the source is resized to, None keeps its size.
+        device (str): Device to run the benchmark on.
+        half (bool): Use half-precision for the model if True.
+        runs (int): Number of timed predictions per tile size, after one warmup prediction.
+
+    Returns:
+        (pandas.DataFrame): A pandas DataFrame with tiles per image, detections and inference throughput per tile size.
+
+    Examples:
+        >>> from ultralytics.utils.benchmarks import benchmark_sliced_inference
+        >>> benchmark_sliced_inference(model="yolo11n.pt", source="panel.jpg", tiles=(None, 640, 320))
+    """
+    import cv2
+    import pandas as pd  # scope for faster 'import ultralytics'
+
+    model = YOLO(model) if isinstance(model, (str, Path)) else model
+    im = cv2.imread(str(source))
+    if panel_size:
+        im = cv2.resize(im, panel_size[::-1], interpolation=cv2.INTER_LINEAR)
+    y = []
+    for tile in tiles:
+        kwargs = dict(imgsz=imgsz, device=device, half=half, verbose=False, slice=[tile, overlap] if tile else None)
+        model.predict(im, **kwargs)  # warmup
+        n = len(model.predictor.slice_windows(im.shape)) if tile else 1
+        t = time.perf_counter()
+        for _ in range(runs):
+            results = model.predict(im, **kwargs)
+        dt = (time.perf_counter() - t) / runs
+        y.append([tile or "-", n, len(results[0].boxes), round(dt * 1000, 1), round(1 / dt, 2), round(n / dt, 1)])
+
+    df = pd.DataFrame(y, columns=["Tile", "Tiles/image", "Detections", "Time (ms/im)", "FPS", "Tiles/s"])
+    h, w = im.shape[:2]
+    LOGGER.info(f"\nSliced inference benchmarks complete for {w}x{h} images at imgsz={imgsz}\n{df}\n")
+    return df
+
+
 class RF100Benchmark:
     """
     Benchmark YOLO model performance across various formats for speed and accuracy.
@@ -338,6 +338,214 @@ def non_max_suppression(
     return (output, keepi) if return_idxs else output
 
 
+def batched_non_max_suppression(
+    prediction,
+    conf_thres: float = 0.25,
+    iou_thres: float = 0.45,
+    classes=None,
+    agnostic: bool = False,
+    max_det: int = 300,
+    nc: int = 0,  # number of classes (optional)
+    max_nms: int = 30000,
+    max_wh: int = 7680,
+    padded: bool = False,
+    flat: bool = False,
+    return_idxs: bool = False,
+):
+    """
+    Perform best-class non-maximum suppression on a whole batch with a single NMS call and no per-image loop.
+
+    Candidate filtering, best-class selection and the max_nms/max_det limits are computed for all images at once.
+    Boxes are offset by class along x and by image index along y, so a single `torchvision.ops.nms` call can never
+    suppress boxes across classes or images. Large candidate sets fall back to one NMS call per image slice, as in
+    `torchvision.ops.batched_nms`. Results match `non_max_suppression` with `multi_label=False`.
+
+    Args:
+        prediction (torch.Tensor): Predictions with shape (batch_size, num_classes + 4 + num_masks, num_boxes).
+        conf_thres (float): Confidence threshold for filtering detections. Valid values are between 0.0 and 1.0.
+        iou_thres (float): IoU threshold for NMS filtering. Valid values are between 0.0 and 1.0.
+        classes (List[int], optional): List of class indices to consider. If None, all classes are considered.
+        agnostic (bool): Whether to perform class-agnostic NMS.
+        max_det (int): Maximum number of detections to keep per image.
+        nc (int): Number of classes. Indices after this are considered masks.
+        max_nms (int): Maximum number of boxes per image passed to NMS.
+        max_wh (int): Maximum box width and height in pixels.
+        padded (bool): Whether to return fixed-shape padded outputs instead of a list of per-image views.
+        flat (bool): Whether to return the detections of all images as one tensor grouped by image, with per-image
+            counts, instead of a list of per-image views.
+        return_idxs (bool): Whether to return the indices of kept detections.
+
+    Returns:
+        output (List[torch.Tensor] | torch.Tensor): By default, list of per-image views with shape
+            (num_boxes, 6 + num_masks) containing (x1, y1, x2, y2, confidence, class, mask1, mask2, ...). If
+            padded=True, a zero-padded tensor of shape (batch_size, max_det, 6 + num_masks). If flat=True, a tensor of
+            shape (total_boxes, 6 + num_masks) grouped by image.
+        counts (torch.Tensor | List[int]): Number of valid detections per image, only if padded=True (a tensor with
+            shape (batch_size,)) or flat=True (a list).
+        keepi (List[torch.Tensor] | torch.Tensor): Indices of kept detections if return_idxs=True, padded with -1 if
+            padded=True and concatenated if flat=True.
+
+    Examples:
+        >>> preds = torch.rand(4, 84, 8400)
+        >>> out, counts = batched_non_max_suppression(preds, conf_thres=0.5, padded=True)
+        >>> out.shape, counts.shape
+        (torch.Size([4, 300, 6]), torch.Size([4]))
+    """
+    import torchvision  # scope for faster 'import ultralytics'
+
+    # Checks
+    assert 0 <= conf_thres <= 1, f"Invalid Confidence threshold {conf_thres}, valid values are between 0.0 and 1.0"
+    assert 0 <= iou_thres <= 1, f"Invalid IoU {iou_thres}, valid values are between 0.0 and 1.0"
+    if isinstance(prediction, (list, tuple)):  # YOLOv8 model in validation model, output = (inference_out, loss_out)
+        prediction = prediction[0]  # select only inference output
+
+    bs = prediction.shape[0]  # batch size (BCN, i.e. 1,84,6300)
+    nc = nc or (prediction.shape[1] - 4)  # number of classes
+    mi = 4 + nc  # mask start index
+    prediction = prediction.transpose(-1, -2)  # shape(1,84,6300) to shape(1,6300,84)
+
+    # Best class and candidates for the whole batch
+    conf, j = prediction[..., 4:mi].max(-1)
+    filt = conf > conf_thres
+    if classes is not None:
+        filt &= (j[..., None] == torch.tensor(classes, device=prediction.device)).any(-1)
+    bi, ai = filt.nonzero(as_tuple=True)  # image index and anchor index of each candidate
+    x = prediction[bi, ai]
+    x = torch.cat((xywh2xyxy(x[:, :4]), conf[bi, ai, None], j[bi, ai, None].to(x.dtype), x[:, mi:]), 1)
+
+    # Limit candidates per image to the max_nms most confident
+    if len(x) > max_nms:
+        i = x[:, 4].argsort(descending=True)
+        i, bi, ai, x = _rank_by_image(i, bi, ai, x, max_nms)[:4]
+
+    # NMS cost grows quadratically with the number of boxes, so like torchvision.ops.batched_nms only merge images
+    # into a single call while the candidate set is small, else run one call per contiguous image slice
+    if x[:, :4].numel() <= (20000 if x.is_cuda else 4000):
+        wh = x[:, :4].max() + 1 if len(x) else max_wh  # smallest offset that separates groups, preserves precision
+        offset = torch.stack((x[:, 5] * (0 if agnostic else wh), bi.to(x.dtype) * wh), 1).repeat(1, 2)
+        i = torchvision.ops.nms(x[:, :4] + offset, x[:, 4], iou_thres)  # sorted by decreasing score
+    else:
+        boxes = x[:, :4] + x[:, 5:6] * (0 if agnostic else max_wh)  # candidates are grouped by image here
+        starts = [0, *torch.bincount(bi, minlength=bs).cumsum(0).tolist()]
+        i = torch.cat(
+            [torchvision.ops.nms(boxes[a:b], x[a:b, 4], iou_thres)[:max_det] + a for a, b in zip(starts, starts[1:])]
+        )
+    i, bi, ai, x, rank = _rank_by_image(i, bi, ai, x, max_det)
+    counts = torch.bincount(bi, minlength=bs)
+
+    if padded:
+        output = x.new_zeros((bs, max_det, x.shape[1]))
+        output[bi, rank] = x
+        if return_idxs:
+            keepi = torch.full((bs, max_det), -1, dtype=torch.long, device=x.device)
+            keepi[bi, rank] = ai
+            return output, counts, keepi
+        return output, counts
+
+    counts = counts.tolist()
+    if flat:
+        return (x, counts, ai) if return_idxs else (x, counts)
+    output = list(x.split(counts))
+    return (output, list(ai.split(counts))) if return_idxs else output
+
+
+def _rank_by_image(i, bi, ai, x, k: int):
+    """
+    Group score-ordered candidates by image and keep the first k of each image.
+
+    Args:
+        i (torch.Tensor): Candidate indices in decreasing score order.
+        bi (torch.Tensor): Image index of every candidate.
+        ai (torch.Tensor): Anchor index of every candidate.
+        x (torch.Tensor): Candidate detections.
+        k (int): Maximum number of candidates to keep per image.
+
+    Returns:
+        (tuple): Kept (i, bi, ai, x, rank) ordered by image and decreasing score, rank being the position in the image.
+    """
+    b, order = torch.sort(bi[i], stable=True)  # stable sort keeps score order within each image
+    rank = torch.arange(len(b), device=b.device) - torch.searchsorted(b, b)
+    keep = rank < k
+    i = i[order][keep]
+    return i, bi[i], ai[i], x[i], rank[keep]
+
+
+def slice_windows(shape, tile: int, overlap: float = 0.2) -> np.ndarray:
+    """
+    Compute overlapping tile windows covering an image for sliced inference.
+
+    Tiles are tile x tile pixels, spread evenly along each axis so that neighbours overlap by at least `overlap` of
+    the tile size and the last tile ends at the image border. Axes shorter than the tile get a single window.
+
+    Args:
+        shape (tuple): Image shape (height, width).
+        tile (int): Tile size in pixels.
+        overlap (float): Minimum overlap between neighbouring tiles as a fraction of the tile size, in [0, 1).
+
+    Returns:
+        (np.ndarray): Tile windows in xyxy pixel format with shape (num_tiles, 4), row-major.
+
+    Examples:
+        >>> slice_windows((1000, 1500), tile=640, overlap=0.2)[:, :2]
+        array([[  0,   0], [430,   0], [860,   0], [  0, 360], [430, 360], [860, 360]])
+    """
+    assert 0 <= overlap < 1, f"Invalid slice overlap {overlap}, valid values are between 0.0 and 1.0"
+    stride = tile * (1 - overlap)
+    starts = []
+    for n in shape:
+        k = max(math.ceil((n - tile) / stride), 0) + 1  # number of tiles along this axis
+        starts.append(np.linspace(0, max(n - tile, 0), k).round().astype(int))
+    y, x = np.meshgrid(*starts, indexing="ij")
+    x, y = x.reshape(-1), y.reshape(-1)
+    return np.stack((x, y, np.minimum(x + tile, shape[1]), np.minimum(y + tile, shape[0])), 1)
+
+
+def merge_sliced_boxes(x, iou_thres: float = 0.5, mode: str = "nms", agnostic: bool = False, max_det: int = 300):
+    """
+    Merge detections of overlapping tiles that describe the same object.
+
+    Boxes are visited in decreasing confidence. Each one that is not yet matched claims all unmatched boxes of the same
+    class whose intersection over the smaller box area exceeds `iou_thres`. Intersection over the smaller area also
+    matches boxes cut by a tile seam with the complete box from a neighbouring tile, which IoU often misses. With
+    mode='nms' the most confident box of each group is kept, with mode='wbf' the group is fused into its
+    confidence-weighted mean box with the highest confidence.
+
+    Args:
+        x (torch.Tensor): Detections in image coordinates with shape (N, 6) as (x1, y1, x2, y2, confidence, class).
+        iou_thres (float): Intersection over smaller area threshold for matching boxes.
+        mode (str): Merge mode, 'nms' or 'wbf' (weighted box fusion).
+        agnostic (bool): Whether to match boxes across classes.
+        max_det (int): Maximum number of merged detections to keep.
+
+    Returns:
+        (torch.Tensor): Merged detections with shape (M, 6), sorted by decreasing confidence.
+    """
+    assert mode in {"nms", "wbf"}, f"Invalid slice merge mode '{mode}', valid modes are 'nms' and 'wbf'"
+    device = x.device
+    x = x.cpu()  # greedy loop over few post-NMS boxes, avoid a device sync per box
+    x = x[x[:, 4].argsort(descending=True)]
+    box, area = x[:, :4], (x[:, 2] - x[:, 0]) * (x[:, 3] - x[:, 1])
+    unmatched = torch.ones(len(x), dtype=torch.bool, device=x.device)
+    out = []
+    for i in range(len(x)):
+        if len(out) >= max_det:
+            break
+        if not unmatched[i]:
+            continue
+        wh = (torch.minimum(box[i, 2:], box[:, 2:]) - torch.maximum(box[i, :2], box[:, :2])).clamp(0)
+        match = unmatched & (wh.prod(1) / torch.minimum(area[i], area).clamp(1e-9) > iou_thres)
+        if not agnostic:
+            match &= x[:, 5] == x[i, 5]
+        match[i] = True
+        unmatched &= ~match
+        if mode == "wbf" and match.sum() > 1:
+            w = x[match, 4:5]
+            out.append(torch.cat(((box[match] * w).sum(0) / w.sum(), x[i, 4:])))
+        else:
+            out.append(x[i])
+    return (torch.stack(out) if out else x[:0]).to(device)
+
+
 def clip_boxes(boxes, shape):
     """
     Clip bounding boxes to image boundaries.
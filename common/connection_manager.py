@@ -0,0 +1,97 @@
+# 训练端（backend_model/server.py）与检测端（backend_detect/server.py）共用的 WebSocket 广播中心
+import asyncio
+import time
+
+from fastapi.websockets import WebSocket
+
+
+class ConnectionManager:
+    """
+    WebSocket 广播中心。每个客户端有独立的有界发送队列和发送协程，broadcast 只负责入队，
+    慢客户端不会阻塞其他客户端；发送失败或超时的客户端会被自动移除。
+
+    :param max_queue: 每个客户端发送队列的最大长度
+    :param overflow: 队列满时的策略，'drop_oldest' 丢弃该客户端最旧的消息，'close' 断开该客户端（1013）由其重连补发
+    :param send_timeout: 单条消息的发送超时（秒），超时视为客户端已失效
+    """
+
+    CHANNELS = ("progress", "metrics", "model")  # 训练进度、每轮指标、新模型可用
+
+    def __init__(self, max_queue=256, overflow="drop_oldest", send_timeout=10.0):
+        self.active_connections = []
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.send_timeout = send_timeout
+        self.evicted = 0
+        self._clients = {}
+
+    async def connect(self, websocket: WebSocket, channels=None):
+        """:param channels: 订阅的频道，None 表示全部频道"""
+        await websocket.accept()
+        self.active_connections.append(websocket)
+        client = {"queue": asyncio.Queue(self.max_queue), "channels": set(channels) if channels else None,
+                  "sent": 0, "dropped": 0, "latency_ms": 0.0, "max_latency_ms": 0.0}
+        client["sender"] = asyncio.create_task(self._send_loop(websocket, client))
+        self._clients[websocket] = client
+
+    def disconnect(self, websocket: WebSocket):
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+        client = self._clients.pop(websocket, None)
+        if client is not None and client["sender"] is not asyncio.current_task():
+            client["sender"].cancel()
+
+    def send(self, websocket: WebSocket, message: str):
+        client = self._clients.get(websocket)
+        if client is None:
+            return
+        queue = client["queue"]
+        if queue.full():
+            if self.overflow == "close":
+                print(f"⚠️ WebSocket 客户端发送队列已满（{self.max_queue}），断开慢客户端")
+                self.evicted += 1
+                self.disconnect(websocket)
+                asyncio.create_task(websocket.close(code=1013))
+                return
+            queue.get_nowait()
+            client["dropped"] += 1
+        queue.put_nowait((time.perf_counter(), message))
+
+    def broadcast_nowait(self, message: str, channel: str = None):
+        for websocket, client in list(self._clients.items()):
+            if channel is None or client["channels"] is None or channel in client["channels"]:
+                self.send(websocket, message)
+
+    async def broadcast(self, message: str, channel: str = None):
+        self.broadcast_nowait(message, channel)
+
+    async def _send_loop(self, websocket: WebSocket, client):
+        queue = client["queue"]
+        try:
+            while True:
+                queued_at, message = await queue.get()
+                await asyncio.wait_for(websocket.send_text(message), self.send_timeout)
+                latency_ms = (time.perf_counter() - queued_at) * 1e3  # 入队到发送完成
+                client["sent"] += 1
+                client["latency_ms"] += (latency_ms - client["latency_ms"]) / min(client["sent"], 100)
+                client["max_latency_ms"] = max(client["max_latency_ms"], latency_ms)
+        except Exception:  # 连接已断开或发送超时
+            self.evicted += 1
+            self.disconnect(websocket)
+
+    def stats(self):
+        return {
+            "clients": len(self._clients),
+            "evicted": self.evicted,
+            "max_queue": self.max_queue,
+            "overflow": self.overflow,
+            "details": [{
+                "channels": sorted(c["channels"]) if c["channels"] else "all",
+                "queue_depth": c["queue"].qsize(),
+                "sent": c["sent"],
+                "dropped": c["dropped"],
+                "latency_ms": round(c["latency_ms"], 3),
+                "max_latency_ms": round(c["max_latency_ms"], 3),
+            } for c in self._clients.values()],
+        }
+
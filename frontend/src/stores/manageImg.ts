@@ -7,7 +7,12 @@ const SERVER_PORT_DETECT = import.meta.env.VITE_SERVER_PORT_DETECT;
 export const useImageStore = defineStore('imageStore', {
   state: () => ({
     transferredFileNames: [] as string[],
-    timer: null as number | null,
+    socket: null as WebSocket | null,
+    reconnectTimer: null as number | null,
+    reconnectDelay: 1000,
+    // 已收到的最大事件序号和服务端 epoch，断线重连时据此补发
+    lastSeq: Number(localStorage.getItem('lowConfLastSeq') || 0),
+    epoch: Number(localStorage.getItem('lowConfEpoch') || 0),
     index: -1,
   }),
 
@@ -39,40 +44,64 @@ export const useImageStore = defineStore('imageStore', {
   },
 
   actions: {
-    async callTransferApi() {
-      // const SERVER_IP = import.meta.env.VITE_SERVER_IP;
-      // const SERVER_PORT = import.meta.env.VITE_SERVER_PORT;
-
-      try {
-        const response = await fetch(`http://${SERVER_IP_DETECT}:${SERVER_PORT_DETECT}/api/transfer-images`, {
-          method: 'GET'
-        });
-        const data = await response.json();
-        if (data.status === 'ok') {
-          this.transferredFileNames.push(...data.files);
-          localStorage.setItem('transferredFileNames', JSON.stringify(data.files));
-          console.log('✅ 已保存文件名列表:', data.files);
-          if (this.index == -1){
-            this.next_image()
-            console.log("index:", this.index)
-          }
-        } else {
-          console.warn('⚠️ 没有图片被转移');
-        }
-      } catch (err) {
-        console.error('❌ 调用转移 API 失败:', err);
+    onLowConf(event: { seq: number, filename: string }) {
+      if (event.seq <= this.lastSeq) return;  // 重连补发时可能重复
+      this.lastSeq = event.seq;
+      localStorage.setItem('lowConfLastSeq', String(event.seq));
+      if (!this.transferredFileNames.includes(event.filename)) {
+        this.transferredFileNames.push(event.filename);
+        localStorage.setItem('transferredFileNames', JSON.stringify(this.transferredFileNames));
+        console.log('✅ 收到低置信度图片:', event.filename);
+      }
+      if (this.index == -1) {
+        this.next_image()
+        console.log("index:", this.index)
       }
     },
 
-    startTimer() {
-      if (this.timer) return;
-      this.timer = window.setInterval(this.callTransferApi, 2000);
+    // 订阅检测服务端推送的低置信度图片，替代每 2 秒轮询 /api/transfer-images
+    startFeed() {
+      if (this.socket) return;
+      const url = `ws://${SERVER_IP_DETECT}:${SERVER_PORT_DETECT}/ws/low-conf?since=${this.lastSeq}&epoch=${this.epoch}`;
+      const socket = new WebSocket(url);
+      this.socket = socket;
+      socket.onopen = () => {
+        this.reconnectDelay = 1000;
+      };
+      socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'hello') {
+          if (message.epoch !== this.epoch) {  // 服务端重启，序号重新开始
+            this.epoch = message.epoch;
+            this.lastSeq = 0;
+            localStorage.setItem('lowConfEpoch', String(message.epoch));
+            localStorage.setItem('lowConfLastSeq', '0');
+          }
+        } else if (message.type === 'low_conf') {
+          this.onLowConf(message);
+        }
+      };
+      socket.onclose = () => {
+        if (this.socket !== socket) return;  // 主动关闭
+        this.socket = null;
+        console.warn(`⚠️ 低置信度推送连接断开，${this.reconnectDelay / 1000} 秒后重连`);
+        this.reconnectTimer = window.setTimeout(() => {
+          this.reconnectTimer = null;
+          this.startFeed();
+        }, this.reconnectDelay);
+        this.reconnectDelay = Math.min(this.reconnectDelay * 2, 30000);
+      };
     },
 
-    stopTimer() {
-      if (this.timer) {
-        clearInterval(this.timer);
-        this.timer = null;
+    stopFeed() {
+      if (this.reconnectTimer) {
+        clearTimeout(this.reconnectTimer);
+        this.reconnectTimer = null;
+      }
+      if (this.socket) {
+        const socket = this.socket;
+        this.socket = null;
+        socket.close();
       }
     },
 